@@ -1,4 +1,4 @@
-rm ~/.config/xbridge-cli/config.json  # TODO: remove once cleanup is better
+rm -f ~/.config/xbridge-cli/config.db*  # TODO: remove once cleanup is better
 xbridge-cli server create-config all
 xbridge-cli server start-all --rippled-only
 xbridge-cli server list
@@ -9,10 +9,7 @@ from xrpl.models import AccountObjects
 
 from tests.utils import SetInterval, close_ledgers
 from xbridge_cli.main import main
-from xbridge_cli.utils import get_config
-from xbridge_cli.utils.config_file import get_config_folder
-
-_CONFIG_FILE = os.path.join(get_config_folder(), "config.json")
+from xbridge_cli.utils import get_config, get_state_store
 
 
 @pytest.mark.usefixtures("bridge_build_setup")
@@ -40,8 +37,7 @@ class TestBridgeBuild:
         assert runner_result.exit_code == 0, runner_result.output
 
         # check that the bridge was added properly to the CLI config file
-        with open(_CONFIG_FILE) as f:
-            config_result = json.load(f)
+        config_result = get_state_store().get_bridges()
 
         expected_result = {
             "name": "test_bridge",
@@ -56,7 +52,7 @@ class TestBridgeBuild:
             "create_account_amounts": ["10000000", "10000000"],
         }
 
-        assert config_result["bridges"][0] == expected_result
+        assert config_result[0] == expected_result
 
         # check that the bridge was created properly on both chains
         locking_client = get_config().get_chain("locking_chain").get_client()
@@ -136,8 +132,7 @@ class TestBridgeBuild:
         assert runner_result.exit_code == 0, runner_result.output
 
         # check that the bridge was added properly to the CLI config file
-        with open(_CONFIG_FILE) as f:
-            config_result = json.load(f)
+        config_result = get_state_store().get_bridges()
 
         expected_result = {
             "name": "test_bridge",
@@ -152,7 +147,7 @@ class TestBridgeBuild:
             "create_account_amounts": ["10000000", "10000000"],
         }
 
-        assert config_result["bridges"][0] == expected_result
+        assert config_result[0] == expected_result
 
         locking_client = JsonRpcClient(locking_url)
         issuing_client = JsonRpcClient(issuing_url)
@@ -1,17 +1,16 @@
-import json
 import os
 import tempfile
 import traceback
 import unittest
 import unittest.mock
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional
+from typing import Any, List, Optional
 
 import pytest
 from click.testing import CliRunner
 
 from xbridge_cli.main import main
-from xbridge_cli.utils import get_config_folder
+from xbridge_cli.utils import get_state_store
 
 config_dir: Optional[tempfile.TemporaryDirectory] = None
 mocked_home_dir: Optional[tempfile.TemporaryDirectory] = None
@@ -57,17 +56,6 @@ def pytest_configure(config):
         config_var.start()
         mocked_vars.append(config_var)
 
-        config_file = os.path.join(mocked_home_dir.name, "config.json")
-        with open(config_file, "w") as f:
-            data: Dict[str, List[Any]] = {"chains": [], "witnesses": [], "bridges": []}
-            json.dump(data, f, indent=4)
-        config_var2 = unittest.mock.patch(
-            "xbridge_cli.utils.config_file.config_file._CONFIG_FILE",
-            config_file,
-        )
-        config_var2.start()
-        mocked_vars.append(config_var2)
-
 
 def pytest_unconfigure(config):
     """
@@ -81,11 +69,10 @@ def pytest_unconfigure(config):
 
 
 def _reset_cli_config() -> None:
-    config_file = os.path.join(get_config_folder(), "config.json")
-    os.remove(config_file)
-    with open(config_file, "w") as f:
-        data: Dict[str, List[Any]] = {"chains": [], "witnesses": [], "bridges": []}
-        json.dump(data, f, indent=4)
+    store = get_state_store()
+    store.remove_chains()
+    store.remove_witnesses()
+    store.remove_bridges()
 
 
 def _create_config_files() -> None:
@@ -0,0 +1,136 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest.mock
+
+import psutil
+import pytest
+
+from xbridge_cli.daemon import supervisor
+from xbridge_cli.exceptions import DaemonNotRunningException
+from xbridge_cli.utils import get_daemon_status, send_daemon_request
+
+_SLEEP = [sys.executable, "-c", "import time; time.sleep(60)"]
+_CRASH = [sys.executable, "-c", "import sys; sys.exit(3)"]
+
+
+def _server_data(name):
+    return {
+        "name": name,
+        "type": "witness",
+        "exe": sys.executable,
+        "config": f"/nonexistent/{name}.json",
+        "pid": 0,
+        "http_ip": "127.0.0.1",
+        "http_port": 1,
+    }
+
+
+def _wait_for(check, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def daemon_socket():
+    with tempfile.TemporaryDirectory() as folder:
+        socket_path = os.path.join(folder, "daemon.sock")
+        server = supervisor._DaemonServer(socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield socket_path, folder
+        finally:
+            status = get_daemon_status(socket_path) or []
+            send_daemon_request(
+                socket_path, "release", {"names": [s["name"] for s in status]}
+            )
+            for entry in status:
+                try:
+                    os.kill(entry["pid"], 9)
+                except ProcessLookupError:
+                    pass
+            server.shutdown()
+            server.server_close()
+
+
+class TestSupervisor:
+    def test_not_running(self):
+        with tempfile.TemporaryDirectory() as folder:
+            socket_path = os.path.join(folder, "daemon.sock")
+            assert get_daemon_status(socket_path) is None
+            with pytest.raises(DaemonNotRunningException):
+                send_daemon_request(socket_path, "ping")
+
+    def test_start_and_release(self, daemon_socket):
+        socket_path, folder = daemon_socket
+        assert send_daemon_request(socket_path, "ping") == "pong"
+
+        pid = send_daemon_request(
+            socket_path,
+            "start",
+            {
+                "server": _server_data("sleeper"),
+                "command": _SLEEP,
+                "output_file": os.path.join(folder, "sleeper.out"),
+            },
+        )
+        status = get_daemon_status(socket_path)
+        assert [(s["name"], s["pid"], s["state"]) for s in status] == [
+            ("sleeper", pid, "running")
+        ]
+
+        released = send_daemon_request(
+            socket_path, "release", {"names": ["sleeper", "unknown"]}
+        )
+        assert released == ["sleeper"]
+        assert get_daemon_status(socket_path) == []
+        os.kill(pid, 9)
+
+    def test_restart_crashed(self, daemon_socket):
+        socket_path, folder = daemon_socket
+        with unittest.mock.patch.object(supervisor, "_MIN_RESTART_DELAY", 0.1):
+            send_daemon_request(
+                socket_path,
+                "start",
+                {
+                    "server": _server_data("crasher"),
+                    "command": _CRASH,
+                    "output_file": os.path.join(folder, "crasher.out"),
+                },
+            )
+            _wait_for(lambda: get_daemon_status(socket_path)[0]["restarts"] >= 2)
+        status = get_daemon_status(socket_path)[0]
+        assert status["exit_code"] == 3
+
+    def test_unknown_method(self, daemon_socket):
+        socket_path, _ = daemon_socket
+        with pytest.raises(Exception, match="Unknown method"):
+            send_daemon_request(socket_path, "nonsense")
+
+    def test_resource_sampling_survives_errors(self):
+        stopped = threading.Event()
+        calls = []
+
+        def sample(servers):
+            calls.append(servers)
+            if len(calls) == 1:
+                raise psutil.NoSuchProcess(1234)
+            stopped.set()
+            return {}
+
+        with unittest.mock.patch.object(
+            supervisor, "_SAMPLE_INTERVAL", 0.01
+        ), unittest.mock.patch.object(
+            supervisor.ResourceSampler, "sample", side_effect=sample
+        ), unittest.mock.patch.object(
+            supervisor, "get_state_store"
+        ):
+            supervisor._record_resources(stopped)
+
+        # the failed sample doesn't stop the ones after it
+        assert len(calls) == 2
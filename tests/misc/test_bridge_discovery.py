@@ -0,0 +1,97 @@
+import threading
+import unittest.mock
+
+import pytest
+from xrpl.models import AccountInfo, AccountLines, AccountObjects, ServerState
+
+from xbridge_cli.bridge.build import _discover_chain_states
+from xbridge_cli.exceptions import XBridgeCLIException
+
+
+def _client(door_exists=True, objects_error=None, barrier=None):
+    def request(req):
+        response = unittest.mock.Mock()
+        if barrier is not None and isinstance(req, AccountInfo):
+            barrier.wait()
+        if isinstance(req, ServerState):
+            response.result = {"state": {"validated_ledger": {"reserve_base": 10}}}
+        elif isinstance(req, AccountInfo):
+            if door_exists:
+                response.result = {"account_data": {"Flags": 0, "signer_lists": []}}
+            else:
+                response.result = {"error": "actNotFound"}
+        elif isinstance(req, AccountLines):
+            response.result = {"lines": [{"account": "rIssuer", "currency": "USD"}]}
+        elif isinstance(req, AccountObjects):
+            if objects_error is not None:
+                response.result = {"error_message": objects_error}
+            else:
+                response.result = {"account_objects": []}
+        return response
+
+    client = unittest.mock.Mock()
+    client.request.side_effect = request
+    return client
+
+
+class TestBridgeDiscovery:
+    @unittest.mock.patch(
+        "xbridge_cli.bridge.build.does_account_exist",
+        side_effect=lambda account, client: account != "rMissing",
+    )
+    def test_snapshot(self, _):
+        locking, issuing = _discover_chain_states(
+            (_client(), _client(door_exists=False)),
+            ("rLockingDoor", "rIssuingDoor"),
+            ({"rLockingDoor", "rReward"}, {"rReward", "rMissing"}),
+            is_xrp_bridge=False,
+        )
+
+        assert locking.reserve_base is None
+        assert locking.existing_accounts == {"rLockingDoor", "rReward"}
+        assert locking.door_info == {"Flags": 0, "signer_lists": []}
+        assert locking.door_lines == [{"account": "rIssuer", "currency": "USD"}]
+        # a missing door has nothing set up on it
+        assert issuing.existing_accounts == {"rReward"}
+        assert issuing.door_info is None
+        assert issuing.door_lines == []
+        assert issuing.door_bridges == []
+
+    @unittest.mock.patch(
+        "xbridge_cli.bridge.build.does_account_exist", return_value=True
+    )
+    def test_xrp_bridge(self, _):
+        locking, issuing = _discover_chain_states(
+            (_client(), _client()),
+            ("rLockingDoor", "rIssuingDoor"),
+            (set(), set()),
+            is_xrp_bridge=True,
+        )
+
+        assert locking.reserve_base == issuing.reserve_base == 10
+        assert locking.door_lines == []
+
+    @unittest.mock.patch(
+        "xbridge_cli.bridge.build.does_account_exist", return_value=True
+    )
+    def test_query_error(self, _):
+        with pytest.raises(XBridgeCLIException, match="Invalid field"):
+            _discover_chain_states(
+                (_client(), _client(objects_error="Invalid field")),
+                ("rLockingDoor", "rIssuingDoor"),
+                (set(), set()),
+                is_xrp_bridge=False,
+            )
+
+    @unittest.mock.patch(
+        "xbridge_cli.bridge.build.does_account_exist", return_value=True
+    )
+    def test_chains_queried_together(self, _):
+        # only passes if both doors are queried at the same time
+        barrier = threading.Barrier(2, timeout=5)
+        _discover_chain_states(
+            (_client(barrier=barrier), _client(barrier=barrier)),
+            ("rLockingDoor", "rIssuingDoor"),
+            (set(), set()),
+            is_xrp_bridge=False,
+        )
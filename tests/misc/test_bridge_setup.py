@@ -0,0 +1,84 @@
+import concurrent.futures
+import threading
+import unittest.mock
+
+import pytest
+
+from xbridge_cli.bridge import build
+from xbridge_cli.exceptions import XBridgeCLIException
+
+_TX_NAMES = ["funding", "locking", "door_payment", "acct", "issuing"]
+
+
+class _BoundedFuture(concurrent.futures.Future):
+    # fails instead of hanging if the locking chain would wait forever
+    def result(self, timeout=10):
+        return super().result(timeout)
+
+
+def _submit(submitted, acct_error=None, locking_first=False):
+    # records the transactions in `submitted` in the order they're sent
+    txs = {name: [unittest.mock.Mock(name=name)] for name in _TX_NAMES}
+    names = {id(tx): name for name, tx in txs.items()}
+    names[id(txs["door_payment"][0])] = "door_payment"
+    locking_sent = threading.Event()
+
+    def submit_tx(tx, *args):
+        name = names[id(tx)]
+        if name == "acct":
+            if locking_first:
+                # the locking chain is already waiting for the accounts
+                locking_sent.wait(timeout=5)
+            if acct_error is not None:
+                raise acct_error
+        submitted.append(name)
+        if name == "locking":
+            locking_sent.set()
+
+    with unittest.mock.patch.object(
+        build, "submit_tx", side_effect=submit_tx
+    ), unittest.mock.patch.object(
+        build, "_get_genesis_wallet"
+    ), unittest.mock.patch.object(
+        build, "Future", _BoundedFuture
+    ):
+        build._submit_setup_txs(
+            locking_client=unittest.mock.Mock(),
+            issuing_client=unittest.mock.Mock(),
+            funding_wallet=unittest.mock.Mock(),
+            funding_txs=txs["funding"],
+            locking_door_wallet=unittest.mock.Mock(),
+            locking_txs=txs["locking"],
+            door_payment=txs["door_payment"][0],
+            acct_txs=txs["acct"],
+            issuing_door_wallet=unittest.mock.Mock(),
+            issuing_txs=txs["issuing"],
+            verbose=0,
+            verbosity=0,
+            close_ledgers=True,
+        )
+
+
+class TestBridgeSetup:
+    @pytest.mark.parametrize("locking_first", [False, True])
+    def test_door_payment_after_accounts(self, locking_first):
+        submitted = []
+        _submit(submitted, locking_first=locking_first)
+
+        assert sorted(submitted) == sorted(_TX_NAMES)
+        assert submitted.index("funding") < submitted.index("locking")
+        assert submitted.index("acct") < submitted.index("door_payment")
+
+    @pytest.mark.parametrize("locking_first", [False, True])
+    @pytest.mark.parametrize(
+        "error", [XBridgeCLIException("tecNO_DST_INSUF_XRP"), KeyboardInterrupt()]
+    )
+    def test_accounts_not_created(self, locking_first, error):
+        submitted = []
+        with pytest.raises(type(error)):
+            _submit(submitted, acct_error=error, locking_first=locking_first)
+
+        # the locking chain is still set up, but the door isn't paid for the accounts
+        assert "locking" in submitted
+        assert "door_payment" not in submitted
+        assert "issuing" not in submitted
@@ -0,0 +1,133 @@
+import unittest.mock
+
+import docker
+
+from xbridge_cli.server import docker_env
+from xbridge_cli.server.config import docker_network
+from xbridge_cli.server.docker_env import (
+    ContainerSpec,
+    ContainerWatch,
+    has_container_failed,
+    start_containers,
+)
+
+
+def _event_stream(events):
+    stream = unittest.mock.MagicMock()
+    stream.__iter__.return_value = iter(events)
+    return stream
+
+
+def _spec(name, config_dir="/configs/locking_chain"):
+    return ContainerSpec(
+        name=name,
+        image="rippleci/rippled:2.0.0-b4",
+        command=["rippled"],
+        config_dir=config_dir,
+        mount_point="/etc/opt/ripple/",
+        ports=[5005],
+        ip_address="192.168.176.2",
+    )
+
+
+def _container(status="exited", config_dir="/configs/locking_chain", health=None):
+    container = unittest.mock.Mock()
+    container.status = status
+    container.labels = {
+        docker_env._CONFIG_LABEL: config_dir,
+        docker_env._SETTINGS_LABEL: docker_env._get_settings(_spec("locking_chain")),
+    }
+    container.attrs = {
+        "Config": {"Image": "rippleci/rippled:2.0.0-b4", "Cmd": ["rippled"]},
+        "State": {"Pid": 1234} if health is None else {"Health": {"Status": health}},
+    }
+    return container
+
+
+class TestDockerEnv:
+    def test_reuse_stopped_container(self):
+        client = unittest.mock.MagicMock()
+        container = _container()
+        client.containers.get.return_value = container
+        with unittest.mock.patch("docker.from_env", return_value=client):
+            containers = start_containers([_spec("locking_chain")])
+
+        assert containers == {"locking_chain": container}
+        container.start.assert_called_once()
+        container.remove.assert_not_called()
+        client.api.create_container.assert_not_called()
+
+    def test_recreate_container_for_other_config(self):
+        client = unittest.mock.MagicMock()
+        old_container = _container(config_dir="/other/locking_chain")
+        new_container = _container()
+        client.containers.get.side_effect = [old_container, new_container]
+        client.api.create_container.return_value = {"Id": "abc"}
+        with unittest.mock.patch("docker.from_env", return_value=client):
+            containers = start_containers([_spec("locking_chain")])
+
+        assert containers == {"locking_chain": new_container}
+        old_container.remove.assert_called_once_with(force=True)
+        client.api.create_container.assert_called_once()
+
+    def test_recreate_container_for_other_network(self):
+        client = unittest.mock.MagicMock()
+        old_container = _container()
+        new_container = _container()
+        client.containers.get.side_effect = [old_container, new_container]
+        client.api.create_container.return_value = {"Id": "abc"}
+        spec = _spec("locking_chain")
+        spec.network = "xbridge-net-1"
+        spec.memory = "1g"
+        with unittest.mock.patch("docker.from_env", return_value=client):
+            start_containers([spec])
+
+        old_container.remove.assert_called_once_with(force=True)
+        assert client.api.create_host_config.call_args.kwargs["mem_limit"] == "1g"
+        assert "xbridge-net-1" in client.api.create_networking_config.call_args.args[0]
+
+    def test_pull_missing_image(self):
+        client = unittest.mock.MagicMock()
+        client.images.get.side_effect = docker.errors.ImageNotFound("missing")
+        client.containers.get.return_value = _container(status="running")
+        with unittest.mock.patch("docker.from_env", return_value=client):
+            start_containers([_spec("locking_chain"), _spec("issuing_chain")])
+
+        # checked once per image, not once per container
+        client.images.pull.assert_called_once_with(
+            "rippleci/rippled:2.0.0-b4", platform=docker_network.DOCKER_PLATFORM
+        )
+
+    def test_container_failed(self):
+        assert not has_container_failed(_container(status="running"))
+        assert has_container_failed(_container(status="exited"))
+        assert has_container_failed(_container(status="running", health="unhealthy"))
+
+    def test_watch_container_events(self):
+        client = unittest.mock.MagicMock()
+        stream = _event_stream(
+            [{"Action": "health_status: healthy"}, {"Action": "die"}]
+        )
+        client.events.return_value = stream
+        with unittest.mock.patch("docker.from_env", return_value=client):
+            watch = ContainerWatch(_container(status="running"))
+
+        # the failure comes from the event stream, not from polling the container
+        assert watch.wait_for_failure(5)
+        assert client.events.call_args.kwargs["filters"]["event"] == [
+            "die",
+            "health_status",
+        ]
+        watch.close()
+        stream.close.assert_called_once()
+        client.close.assert_called_once()
+
+    def test_watch_healthy_container(self):
+        client = unittest.mock.MagicMock()
+        client.events.return_value = _event_stream(
+            [{"Action": "health_status: healthy"}]
+        )
+        with unittest.mock.patch("docker.from_env", return_value=client):
+            watch = ContainerWatch(_container(status="running"))
+
+        assert not watch.wait_for_failure(0.05)
@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+
+class TestImports:
+    def test_help_has_no_side_effects(self):
+        with tempfile.TemporaryDirectory() as home:
+            subprocess.run(
+                [sys.executable, "-m", "xbridge_cli.main", "--help"],
+                env={**os.environ, "HOME": home},
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+            assert os.listdir(home) == []
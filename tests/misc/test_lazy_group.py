@@ -0,0 +1,28 @@
+import click
+import pytest
+
+from xbridge_cli.bridge import bridge
+from xbridge_cli.daemon import daemon
+from xbridge_cli.env import env
+from xbridge_cli.main import main
+from xbridge_cli.server import server
+
+_LAZY_SUBCOMMANDS = [
+    (group, name)
+    for group in [main, server, bridge, daemon, env]
+    for name in group.lazy_subcommands
+]
+
+
+class TestLazyGroup:
+    @pytest.mark.parametrize("group,name", _LAZY_SUBCOMMANDS)
+    def test_lazy_subcommand(self, group, name):
+        ctx = click.Context(group)
+        command = group.get_command(ctx, name)
+        assert isinstance(command, click.Command)
+        assert command.name == name
+
+        # the stored help must stay in sync with the command's docstring
+        _, help_text = group.lazy_subcommands[name]
+        stored_command = click.Command(name, help=help_text)
+        assert stored_command.get_short_help_str() == command.get_short_help_str()
@@ -0,0 +1,73 @@
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest.mock
+
+from xbridge_cli.utils import output_file
+from xbridge_cli.utils.output_file import follow_output, spawn_with_output, tail_output
+from xbridge_cli.utils.rotate_output import copy_with_rotation
+
+
+def _lines(start, stop):
+    return b"".join(b"line %d\n" % i for i in range(start, stop))
+
+
+class TestOutputFile:
+    def test_rotation(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "server.out")
+            source = io.BufferedReader(io.BytesIO(_lines(0, 1000)), buffer_size=100)
+            copy_with_rotation(source, file_name, max_bytes=1000, backups=2)
+
+            assert os.path.getsize(file_name) <= 1000
+            assert os.path.exists(f"{file_name}.1")
+            assert os.path.exists(f"{file_name}.2")
+            assert not os.path.exists(f"{file_name}.3")
+            with open(file_name, "rb") as f:
+                assert f.read().endswith(b"line 999\n")
+
+    def test_tail(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "server.out")
+            with open(file_name, "wb") as f:
+                f.write(_lines(0, 100_000))
+            with unittest.mock.patch.object(output_file, "_BLOCK_SIZE", 64):
+                assert tail_output(file_name, 3) == [
+                    b"line 99997",
+                    b"line 99998",
+                    b"line 99999",
+                ]
+            assert tail_output(file_name, 0) == []
+
+    def test_tail_across_rotation(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "server.out")
+            with open(f"{file_name}.1", "wb") as f:
+                f.write(_lines(0, 10))
+            with open(file_name, "wb") as f:
+                f.write(_lines(10, 12))
+            assert tail_output(file_name, 4) == [
+                b"line 8",
+                b"line 9",
+                b"line 10",
+                b"line 11",
+            ]
+            assert len(tail_output(file_name, 100)) == 12
+
+    def test_spawn_and_follow(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "server.out")
+            script = (
+                "import time\n"
+                "for i in range(3):\n"
+                "    print(i, flush=True)\n"
+                "    time.sleep(0.2)"
+            )
+            process = spawn_with_output([sys.executable, "-c", script], file_name)
+            output = b"".join(
+                follow_output(file_name, from_end=False, stop=time.monotonic() + 2)
+            )
+            assert process.wait() == 0
+            assert output == b"0\n1\n2\n"
@@ -0,0 +1,102 @@
+import unittest.mock
+
+import pytest
+from click.testing import CliRunner
+
+from xbridge_cli.main import main
+from xbridge_cli.server import request
+from xbridge_cli.utils import ChainConfig, WitnessConfig
+
+_CHAIN = ChainConfig(
+    name="locking_chain",
+    type="rippled",
+    pid=1,
+    exe="/bin/rippled",
+    config="/configs/locking_chain/rippled.cfg",
+    http_ip="127.0.0.1",
+    http_port=5005,
+    ws_ip="127.0.0.1",
+    ws_port=6005,
+)
+
+_WITNESS = WitnessConfig(
+    name="witness0",
+    type="witness",
+    pid=2,
+    exe="/bin/witnessd",
+    config="/configs/witness0/witness.json",
+    http_ip="127.0.0.1",
+    http_port=6010,
+)
+
+
+@pytest.fixture
+def mocked_request():
+    with unittest.mock.patch.multiple(
+        request,
+        get_config=unittest.mock.DEFAULT,
+        _send_request=unittest.mock.DEFAULT,
+        subprocess=unittest.mock.DEFAULT,
+    ) as mocks:
+        mocks["_send_request"].return_value = {"result": {}}
+        mocks["subprocess"].check_output.return_value = b"{}"
+        yield mocks
+
+
+def _request(mocks, server, args):
+    mocks["get_config"].return_value.get_server.return_value = server
+    return CliRunner().invoke(main, ["server", "request", "--name", server.name, *args])
+
+
+class TestRequest:
+    def test_key_value_params(self, mocked_request):
+        result = _request(
+            mocked_request, _CHAIN, ["account_info", "account=rAccount", "strict=true"]
+        )
+        assert result.exit_code == 0, result.output
+
+        request_json = mocked_request["_send_request"].call_args.args[2]
+        assert request_json == {
+            "method": "account_info",
+            "params": [{"account": "rAccount", "strict": True}],
+        }
+        mocked_request["subprocess"].check_output.assert_not_called()
+
+    def test_positional_params(self, mocked_request):
+        result = _request(
+            mocked_request, _CHAIN, ["account_info", "rAccount", "validated"]
+        )
+        assert result.exit_code == 0, result.output
+
+        # rippled's own command-line syntax still goes through rippled
+        assert mocked_request["subprocess"].check_output.call_args.args[0] == [
+            "/bin/rippled",
+            "--conf",
+            "/configs/locking_chain/rippled.cfg",
+            "account_info",
+            "rAccount",
+            "validated",
+        ]
+        mocked_request["_send_request"].assert_not_called()
+
+    def test_positional_params_witness(self, mocked_request):
+        result = _request(mocked_request, _WITNESS, ["server_info", "counters"])
+        assert result.exit_code != 0
+        assert "only work with rippled" in result.output
+
+    @pytest.mark.parametrize(
+        "args", [["server_info"], ["server_info", "counters"], ["account=rAccount"]]
+    )
+    def test_batch_with_command(self, mocked_request, tmp_path, args):
+        batch_file = tmp_path / "batch.jsonl"
+        batch_file.write_text('{"method": "ping"}\n')
+        result = _request(mocked_request, _CHAIN, ["--batch", str(batch_file), *args])
+
+        assert result.exit_code == 2
+        assert "can't be combined" in result.output
+        mocked_request["_send_request"].assert_not_called()
+
+    def test_no_command(self, mocked_request):
+        result = _request(mocked_request, _CHAIN, [])
+        assert result.exit_code == 2
+        assert "Must specify either a command or `--batch`" in result.output
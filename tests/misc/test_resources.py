@@ -0,0 +1,66 @@
+import os
+import tempfile
+
+import pytest
+
+from xbridge_cli.utils.config_file import ServerConfig
+from xbridge_cli.utils.resources import ResourceLog, ResourceSample, ResourceSampler
+
+
+def _sample(timestamp):
+    return ResourceSample(
+        timestamp=timestamp,
+        cpu_percent=12.5,
+        rss=1024,
+        num_fds=10,
+        read_bytes=2048,
+        write_bytes=4096,
+        num_threads=3,
+    )
+
+
+class TestResources:
+    def test_ring_buffer(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "server.resources")
+            log = ResourceLog(file_name, capacity=4)
+            assert log.read() == []
+
+            for i in range(3):
+                log.append(_sample(i))
+            assert [sample.timestamp for sample in log.read()] == [0, 1, 2]
+
+            for i in range(3, 10):
+                log.append(_sample(i))
+            # only the newest samples are kept, and the file doesn't grow
+            assert ResourceLog(file_name).read() == [_sample(i) for i in range(6, 10)]
+            assert [sample.timestamp for sample in log.read(since=8)] == [8, 9]
+            size = os.path.getsize(file_name)
+            log.append(_sample(10))
+            assert os.path.getsize(file_name) == size
+
+    def test_not_a_log(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "server.resources")
+            with open(file_name, "wb") as f:
+                f.write(b"not a resource log at all")
+            with pytest.raises(ValueError):
+                ResourceLog(file_name)
+
+    def test_sampler(self):
+        server = ServerConfig(
+            name="self",
+            type="rippled",
+            pid=os.getpid(),
+            exe="python",
+            config="",
+            http_ip="127.0.0.1",
+            http_port=1,
+        )
+        dead = ServerConfig(**{**server.__dict__, "name": "dead", "pid": 2**22 + 1})
+        docker = ServerConfig(**{**server.__dict__, "name": "docker", "exe": "docker"})
+
+        samples = ResourceSampler().sample([server, dead, docker])
+        assert list(samples) == ["self"]
+        assert samples["self"].rss > 0
+        assert samples["self"].num_threads >= 1
@@ -0,0 +1,65 @@
+import os
+import pickle
+
+import pytest
+
+from xbridge_cli.utils import RippledConfig
+
+_CONFIG = """[server]
+port_rpc_admin_local
+
+# a comment
+[port_rpc_admin_local]
+port = 5005
+ip = 127.0.0.1
+"""
+
+
+class TestRippledConfig:
+    def test_parse(self, tmp_path):
+        config_file = tmp_path / "rippled.cfg"
+        config_file.write_text(_CONFIG)
+        config = RippledConfig(file_name=str(config_file))
+
+        assert config.server.get_line() == "port_rpc_admin_local"
+        assert config.port_rpc_admin_local["port"] == "5005"
+        assert config.port_rpc_admin_local.get("ip") == "127.0.0.1"
+        assert config.port_rpc_admin_local.get("protocol") is None
+        with pytest.raises(KeyError):
+            config.port_rpc_admin_local["protocol"]
+        # the old attribute syntax still works
+        assert config.port_rpc_admin_local.port == "5005"
+
+    def test_read_only(self, tmp_path):
+        config_file = tmp_path / "rippled.cfg"
+        config_file.write_text(_CONFIG)
+        section = RippledConfig(file_name=str(config_file)).port_rpc_admin_local
+
+        with pytest.raises(AttributeError):
+            section.port = "5006"
+        with pytest.raises(TypeError):
+            section._kv_pairs["port"] = "5006"
+        assert section["port"] == "5005"
+
+    def test_pickle(self, tmp_path):
+        config_file = tmp_path / "rippled.cfg"
+        config_file.write_text(_CONFIG)
+        config = pickle.loads(pickle.dumps(RippledConfig(file_name=str(config_file))))
+
+        assert config.port_rpc_admin_local["port"] == "5005"
+        assert config.server.get_line() == "port_rpc_admin_local"
+
+    def test_parse_cache(self, tmp_path):
+        config_file = tmp_path / "rippled.cfg"
+        config_file.write_text(_CONFIG)
+        config = RippledConfig(file_name=str(config_file))
+
+        # the sections are shared until the file changes
+        cached_config = RippledConfig(file_name=str(config_file))
+        assert cached_config.port_rpc_admin_local is config.port_rpc_admin_local
+
+        config_file.write_text(_CONFIG.replace("5005", "5006"))
+        stat = os.stat(config_file)
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        new_config = RippledConfig(file_name=str(config_file))
+        assert new_config.port_rpc_admin_local["port"] == "5006"
@@ -0,0 +1,95 @@
+import unittest.mock
+
+from xbridge_cli.server.restart import _get_witness_batches, _start_again
+from xbridge_cli.utils import BridgeConfig, ChainConfig, WitnessConfig
+
+_DOORS = ("rLockingDoor", "rIssuingDoor")
+_OTHER_DOORS = ("rOtherLockingDoor", "rOtherIssuingDoor")
+
+
+def _witness(name, doors):
+    witness = unittest.mock.Mock()
+    witness.name = name
+    witness.get_config.return_value = {
+        "XChainBridge": {"LockingChainDoor": doors[0], "IssuingChainDoor": doors[1]}
+    }
+    return witness
+
+
+def _bridge(name, doors, quorum):
+    return BridgeConfig(
+        name=name,
+        chains=("http://127.0.0.1:5005", "http://127.0.0.2:5006"),
+        quorum=quorum,
+        door_accounts=doors,
+        xchain_currencies=({"currency": "XRP"}, {"currency": "XRP"}),
+        signature_reward="100",
+        create_account_amounts=(None, None),
+    )
+
+
+def _server(spec, name, exe):
+    server = unittest.mock.Mock(spec=spec)
+    server.name = name
+    server.exe = exe
+    server.config = f"/configs/{name}"
+    return server
+
+
+def _names(batches):
+    return [[witness.name for witness in batch] for batch in batches]
+
+
+class TestRollingRestart:
+    def test_batches_keep_quorum(self):
+        witnesses = [_witness(f"witness{i}", _DOORS) for i in range(5)]
+        batches = _get_witness_batches(witnesses, [_bridge("bridge", _DOORS, 3)])
+
+        assert _names(batches) == [
+            ["witness0", "witness1"],
+            ["witness2", "witness3"],
+            ["witness4"],
+        ]
+
+    def test_one_at_a_time_without_spare_witnesses(self):
+        witnesses = [_witness(f"witness{i}", _DOORS) for i in range(3)]
+        batches = _get_witness_batches(witnesses, [_bridge("bridge", _DOORS, 3)])
+
+        assert _names(batches) == [["witness0"], ["witness1"], ["witness2"]]
+
+    def test_bridges_are_independent(self):
+        witnesses = [
+            _witness("witness0", _DOORS),
+            _witness("witness1", _DOORS),
+            _witness("witness2", _OTHER_DOORS),
+            _witness("witness3", _OTHER_DOORS),
+        ]
+        bridges = [_bridge("bridge", _DOORS, 1), _bridge("other", _OTHER_DOORS, 1)]
+        batches = _get_witness_batches(witnesses, bridges)
+
+        assert _names(batches) == [["witness0", "witness2"], ["witness1", "witness3"]]
+
+    @unittest.mock.patch("xbridge_cli.server.restart._start_servers")
+    def test_start_again_in_groups(self, start_servers):
+        servers = [
+            _server(WitnessConfig, "witness0", "docker"),
+            _server(ChainConfig, "locking_chain", "docker"),
+            _server(WitnessConfig, "witness1", "docker"),
+            _server(ChainConfig, "issuing_chain", "docker"),
+        ]
+        _start_again(servers)
+
+        # all the chains at once, and then all the witnesses at once
+        assert [call.args for call in start_servers.call_args_list] == [
+            (
+                [
+                    ("locking_chain", "/configs/locking_chain"),
+                    ("issuing_chain", "/configs/issuing_chain"),
+                ],
+                "docker",
+            ),
+            (
+                [("witness0", "/configs/witness0"), ("witness1", "/configs/witness1")],
+                "docker",
+            ),
+        ]
@@ -0,0 +1,22 @@
+import unittest.mock
+
+import httpx
+import pytest
+
+from xbridge_cli.server.start import _is_server_ready
+
+
+class TestServerReady:
+    @pytest.mark.parametrize(
+        "error", [httpx.ReadTimeout("slow"), httpx.ConnectTimeout("slow")]
+    )
+    def test_timeout_is_not_ready(self, error):
+        with unittest.mock.patch("httpx.post", side_effect=error):
+            assert not _is_server_ready("http://127.0.0.1:5005", "rpc")
+
+    def test_validated_ledger(self):
+        response = unittest.mock.Mock()
+        response.json.return_value = {"result": {"info": {"validated_ledger": {}}}}
+        with unittest.mock.patch("httpx.post", return_value=response) as post:
+            assert _is_server_ready("http://127.0.0.1:5005", "validated")
+        assert post.call_args.kwargs["timeout"] is not None
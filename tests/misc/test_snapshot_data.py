@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from xbridge_cli.env.snapshot import _check_ledger_on_disk, _get_data_folders
+from xbridge_cli.exceptions import XBridgeCLIException
+
+
+def _rippled_config(config_dir, node_db_type, db_dir):
+    config_dir.mkdir(parents=True)
+    config_file = config_dir / "rippled.cfg"
+    config_file.write_text(
+        f"[node_db]\ntype={node_db_type}\npath={db_dir}/nudb\n\n"
+        f"[database_path]\n{db_dir}\n"
+    )
+    return str(config_file)
+
+
+class TestSnapshotData:
+    def test_rippled_data_inside_config_folder(self, tmp_path):
+        config_dir = tmp_path / "locking_chain"
+        config = _rippled_config(config_dir, "NuDB", config_dir / "db")
+        server = {"name": "locking_chain", "type": "rippled", "exe": "rippled"}
+
+        assert _get_data_folders({**server, "config": config}) == []
+
+    def test_rippled_data_outside_config_folder(self, tmp_path):
+        db_dir = tmp_path / "data" / "locking_chain"
+        config = _rippled_config(tmp_path / "locking_chain", "NuDB", db_dir)
+        server = {"name": "locking_chain", "type": "rippled", "exe": "rippled"}
+
+        # the node store is inside the database folder, so it's copied along with it
+        assert _get_data_folders({**server, "config": config}) == [str(db_dir)]
+
+    def test_witness_data_dir(self, tmp_path):
+        config_dir = tmp_path / "witness0"
+        config_dir.mkdir()
+        db_dir = tmp_path / "data" / "witness0" / "db"
+        (config_dir / "witness.json").write_text(json.dumps({"DBDir": str(db_dir)}))
+        server = {
+            "name": "witness0",
+            "type": "witness",
+            "exe": "witnessd",
+            "config": str(config_dir / "witness.json"),
+        }
+
+        assert _get_data_folders(server) == [str(db_dir)]
+
+    def test_memory_node_store(self, tmp_path):
+        config_dir = tmp_path / "locking_chain"
+        config = _rippled_config(config_dir, "Memory", config_dir / "db")
+
+        with pytest.raises(XBridgeCLIException, match="in memory"):
+            _check_ledger_on_disk("locking_chain", config)
+        _check_ledger_on_disk(
+            "issuing_chain",
+            _rippled_config(tmp_path / "issuing_chain", "NuDB", tmp_path / "db"),
+        )
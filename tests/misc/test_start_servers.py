@@ -0,0 +1,98 @@
+import unittest.mock
+
+import pytest
+
+from xbridge_cli.exceptions import XBridgeCLIException
+from xbridge_cli.server import start
+
+
+def _launched(name, is_docker=False):
+    data = {
+        "name": name,
+        "type": "witness",
+        "exe": "docker" if is_docker else "/bin/witnessd",
+        "config": f"/configs/{name}/witness.json",
+        "pid": 1,
+        "http_ip": "127.0.0.1",
+        "http_port": 6010,
+    }
+    return start._LaunchedServer(
+        data,
+        wait_for_exit=unittest.mock.Mock(),
+        read_output=unittest.mock.Mock(),
+        process=None if is_docker else unittest.mock.Mock(name=f"{name}_process"),
+    )
+
+
+@pytest.fixture
+def mocked_start():
+    with unittest.mock.patch.multiple(
+        start,
+        check_server_exists=unittest.mock.Mock(return_value=False),
+        _get_server_data=unittest.mock.DEFAULT,
+        get_daemon_status=unittest.mock.Mock(return_value=None),
+        _launch_servers=unittest.mock.DEFAULT,
+        _wait_for_server=unittest.mock.DEFAULT,
+        add_witness=unittest.mock.DEFAULT,
+        stop_processes=unittest.mock.DEFAULT,
+        stop_containers=unittest.mock.DEFAULT,
+    ) as mocks:
+        yield mocks
+
+
+def _start(mocks, launched, errors):
+    # `errors` maps a server's name to what its readiness check raises
+    def wait_for_server(wait_for_exit, *args):
+        for server in launched:
+            if server.wait_for_exit is wait_for_exit and server.data["name"] in errors:
+                raise errors[server.data["name"]]
+
+    mocks["_launch_servers"].return_value = launched
+    mocks["_wait_for_server"].side_effect = wait_for_server
+    start._start_servers(
+        [(server.data["name"], server.data["config"]) for server in launched],
+        "/bin/witnessd",
+    )
+
+
+class TestStartServers:
+    def test_failed_servers_are_stopped(self, mocked_start):
+        launched = [
+            _launched("witness0"),
+            _launched("witness1"),
+            _launched("witness2", is_docker=True),
+        ]
+        with pytest.raises(XBridgeCLIException, match="witness1, witness2"):
+            _start(
+                mocked_start,
+                launched,
+                {
+                    "witness1": XBridgeCLIException("did not start"),
+                    "witness2": XBridgeCLIException("did not start"),
+                },
+            )
+
+        mocked_start["add_witness"].assert_called_once_with(launched[0].data)
+        mocked_start["stop_processes"].assert_called_once_with(
+            {launched[1].process: "witness1"}
+        )
+        assert mocked_start["stop_containers"].call_args.args[0] == ["witness2"]
+
+    def test_unexpected_error(self, mocked_start):
+        launched = [_launched("witness0"), _launched("witness1"), _launched("witness2")]
+        with pytest.raises(RuntimeError, match="unexpected"):
+            _start(
+                mocked_start,
+                launched,
+                {
+                    "witness0": RuntimeError("unexpected"),
+                    "witness1": XBridgeCLIException("did not start"),
+                },
+            )
+
+        # the server that came up is still recorded, and the others are stopped
+        mocked_start["add_witness"].assert_called_once_with(launched[2].data)
+        mocked_start["stop_processes"].assert_called_once_with(
+            {launched[0].process: "witness0", launched[1].process: "witness1"}
+        )
+        mocked_start["stop_containers"].assert_not_called()
@@ -0,0 +1,89 @@
+"""
+Startup-time and import budgets for common CLI invocations.
+
+Each invocation is run in a fresh interpreter with `-X importtime`, against an
+empty home directory so that nothing needs to be running. A change that pushes an
+invocation over its budget (e.g. a heavy import added to `xbridge_cli/utils`) fails
+the test; raise the budget only if the new import is really needed at startup.
+
+The budgets are on the modules imported and their total import time, not on wall
+time, which depends too much on how loaded the machine is.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, NamedTuple, Tuple
+
+import pytest
+
+# modules that are slow to import and that only some commands need
+_HEAVY_MODULES = ["docker", "httpx", "jinja2", "psutil", "tabulate", "xrpl"]
+
+
+class _Budget(NamedTuple):
+    max_imports: int
+    max_import_seconds: float
+    forbidden: Tuple[str, ...] = ()
+
+
+_BUDGETS: Dict[Tuple[str, ...], _Budget] = {
+    ("--help",): _Budget(200, 0.5, tuple(_HEAVY_MODULES)),
+    ("server", "--help"): _Budget(200, 0.5, tuple(_HEAVY_MODULES)),
+    ("server", "list"): _Budget(900, 2.0, ("docker", "jinja2", "psutil")),
+    ("bridge", "transfer", "--help"): _Budget(900, 2.0, ("docker", "jinja2")),
+}
+
+
+class _Measurement(NamedTuple):
+    imports: List[Tuple[str, int]]  # module name, self import time in microseconds
+
+    @property
+    def import_seconds(self) -> float:
+        return sum(self_time for _, self_time in self.imports) / 1e6
+
+
+def _measure(args: Tuple[str, ...]) -> _Measurement:
+    with tempfile.TemporaryDirectory() as home:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "xbridge_cli.main", *args],
+            env={**os.environ, "HOME": home},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    assert result.returncode == 0, result.stderr
+
+    imports = []
+    for line in result.stderr.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        imports.append((name.strip(), int(self_time)))
+    return _Measurement(imports)
+
+
+def _report(args: Tuple[str, ...], measurement: _Measurement) -> str:
+    slowest = sorted(measurement.imports, key=lambda item: item[1], reverse=True)
+    lines = [
+        f"`xbridge-cli {' '.join(args)}`: {len(measurement.imports)} imports, "
+        f"{measurement.import_seconds:.2f}s in total. Slowest imports:"
+    ]
+    lines.extend(f"  {name}: {self_time}us" for name, self_time in slowest[:10])
+    return "\n".join(lines)
+
+
+class TestStartup:
+    @pytest.mark.parametrize("args", list(_BUDGETS), ids=" ".join)
+    def test_startup_budget(self, args):
+        budget = _BUDGETS[args]
+        measurement = _measure(args)
+        report = _report(args, measurement)
+
+        imported = {name.split(".")[0] for name, _ in measurement.imports}
+        for module in budget.forbidden:
+            assert module not in imported, f"{module} was imported.\n{report}"
+        assert len(measurement.imports) <= budget.max_imports, report
+        assert measurement.import_seconds <= budget.max_import_seconds, report
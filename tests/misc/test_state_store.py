@@ -0,0 +1,143 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest.mock
+
+import pytest
+
+from xbridge_cli.utils import StateStore
+from xbridge_cli.utils.config_file.config_file import _migrate_legacy_config
+
+_CHAIN = {
+    "name": "locking_chain",
+    "type": "rippled",
+    "pid": 1234,
+    "exe": "/usr/bin/rippled",
+    "config": "/tmp/locking_chain/rippled.cfg",
+    "http_ip": "0.0.0.0",
+    "http_port": 5005,
+    "ws_ip": "0.0.0.0",
+    "ws_port": 6006,
+}
+
+_BRIDGE = {
+    "name": "test_bridge",
+    "chains": ["http://0.0.0.0:5005", "http://0.0.0.0:5006"],
+    "quorum": 4,
+    "door_accounts": [
+        "rDJVtEuDKr4rj1B3qtW7R5TVWdXV2DY7Qg",
+        "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh",
+    ],
+    "xchain_currencies": [{"currency": "XRP"}, {"currency": "XRP"}],
+    "signature_reward": "100",
+    "create_account_amounts": ["10000000", "10000000"],
+}
+
+
+@pytest.fixture
+def store():
+    with tempfile.TemporaryDirectory() as tempdir:
+        state_store = StateStore(os.path.join(tempdir, "config.db"))
+        yield state_store
+        state_store.close()
+
+
+class TestStateStore:
+    def test_chain_lookup(self, store):
+        store.add_chain(_CHAIN)
+        assert store.get_chains() == [_CHAIN]
+        assert store.get_chains("locking_chain") == [_CHAIN]
+        assert store.get_chains("other", _CHAIN["config"]) == [_CHAIN]
+        assert store.get_chains("issuing_chain") == []
+
+        store.remove_chains(["locking_chain"])
+        assert store.get_chains() == []
+
+    def test_bridge_round_trip(self, store):
+        store.add_bridge(_BRIDGE)
+        assert store.get_bridges("test_bridge") == [_BRIDGE]
+
+        store.remove_bridges()
+        assert store.get_bridges() == []
+
+    def test_ports(self, store):
+        store.add_ports("locking_chain", [5005, 6005, 6006])
+        store.add_ports("witness0", [6010])
+        assert store.get_ports("witness0") == {6010: "witness0"}
+        assert len(store.get_ports()) == 4
+
+        store.remove_ports("locking_chain")
+        assert store.get_ports() == {6010: "witness0"}
+
+    def test_allocate_ports(self, store):
+        store.add_ports("env_a/witness0", [6010])
+        ports = store.allocate_ports(
+            [("env_b/witness0", 6010), ("env_b/witness1", 6011)],
+            is_free=lambda port: port != 6011,
+            search_from=20000,
+        )
+        # 6010 belongs to another environment, and 6011 is in use on the host
+        assert ports == [20000, 20001]
+
+        # an owner keeps its ports
+        assert store.allocate_ports(
+            [("env_b/witness1", 6011)], is_free=lambda port: True, search_from=20000
+        ) == [20001]
+
+    def test_allocate_subnet(self, store):
+        assert store.allocate_subnet("/configs/env_a", 2) == 0
+        assert store.allocate_subnet("/configs/env_b", 2) == 1
+        # an owner keeps its subnet
+        assert store.allocate_subnet("/configs/env_a", 2) == 0
+        with pytest.raises(ValueError):
+            store.allocate_subnet("/configs/env_c", 2)
+
+        store.remove_subnets("/configs/env_a")
+        assert store.allocate_subnet("/configs/env_c", 2) == 0
+
+    def test_transaction_rollback(self, store):
+        with pytest.raises(sqlite3.IntegrityError):
+            with store.transaction() as connection:
+                connection.execute("DELETE FROM chains")
+                connection.execute("INSERT INTO witnesses (name) VALUES ('witness0')")
+        assert store.get_witnesses() == []
+
+
+class TestLegacyMigration:
+    def _write_legacy_config(self, store, bridges):
+        config_folder = os.path.dirname(store.get_file_name())
+        with open(os.path.join(config_folder, "config.json"), "w") as f:
+            json.dump({"chains": [_CHAIN], "witnesses": [], "bridges": bridges}, f)
+        return config_folder
+
+    def test_migrate(self, store):
+        config_folder = self._write_legacy_config(store, [_BRIDGE])
+        _migrate_legacy_config(store, config_folder)
+
+        assert store.get_chains() == [_CHAIN]
+        assert store.get_bridges() == [_BRIDGE]
+        assert not os.path.exists(os.path.join(config_folder, "config.json"))
+        assert os.path.exists(os.path.join(config_folder, "config.json.bak"))
+
+    def test_failed_import_is_rolled_back(self, store):
+        bad_bridge = {key: _BRIDGE[key] for key in _BRIDGE if key != "quorum"}
+        config_folder = self._write_legacy_config(store, [bad_bridge])
+        with pytest.raises(KeyError):
+            _migrate_legacy_config(store, config_folder)
+
+        # the chain before the bad bridge isn't stored, and the file is kept
+        assert store.get_chains() == []
+        assert os.path.exists(os.path.join(config_folder, "config.json"))
+
+    def test_interrupted_migration_rerun(self, store):
+        config_folder = self._write_legacy_config(store, [_BRIDGE])
+        with unittest.mock.patch("os.replace", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                _migrate_legacy_config(store, config_folder)
+        assert os.path.exists(os.path.join(config_folder, "config.json"))
+
+        _migrate_legacy_config(store, config_folder)
+        assert store.get_chains() == [_CHAIN]
+        assert store.get_bridges() == [_BRIDGE]
+        assert not os.path.exists(os.path.join(config_folder, "config.json"))
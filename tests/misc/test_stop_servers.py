@@ -0,0 +1,72 @@
+import signal
+import unittest.mock
+
+import psutil
+import pytest
+
+from xbridge_cli.server import stop
+
+
+def _process(name):
+    return unittest.mock.Mock(spec=psutil.Process, name=name)
+
+
+def _wait_procs(exits):
+    # `exits` lists the processes that stop after each step
+    calls = []
+
+    def wait_procs(procs, timeout):
+        calls.append((list(procs), timeout))
+        gone = exits[len(calls) - 1]
+        return (
+            [proc for proc in procs if proc in gone],
+            [proc for proc in procs if proc not in gone],
+        )
+
+    return wait_procs, calls
+
+
+class TestStopProcesses:
+    def test_escalation(self):
+        quick, slow, stuck = _process("quick"), _process("slow"), _process("stuck")
+        wait_procs, calls = _wait_procs([{quick}, {slow}, {stuck}])
+        with unittest.mock.patch.object(stop.psutil, "wait_procs", wait_procs):
+            stop.stop_processes({quick: "quick", slow: "slow", stuck: "stuck"})
+
+        # each step waits only on the processes still running
+        assert calls == [
+            ([quick, slow, stuck], stop._GRACEFUL_STOP_TIME),
+            ([slow, stuck], stop._ESCALATION_TIME),
+            ([stuck], stop._ESCALATION_TIME),
+        ]
+        for process in [quick, slow, stuck]:
+            process.send_signal.assert_called_once_with(signal.SIGINT)
+        quick.terminate.assert_not_called()
+        slow.terminate.assert_called_once_with()
+        stuck.terminate.assert_called_once_with()
+        quick.kill.assert_not_called()
+        slow.kill.assert_not_called()
+        stuck.kill.assert_called_once_with()
+
+    def test_graceful_stop(self):
+        process = _process("witness0")
+        wait_procs, calls = _wait_procs([{process}])
+        with unittest.mock.patch.object(stop.psutil, "wait_procs", wait_procs):
+            stop.stop_processes({process: "witness0"})
+
+        assert len(calls) == 1
+        process.terminate.assert_not_called()
+        process.kill.assert_not_called()
+
+    @pytest.mark.parametrize("verbose", [False, True])
+    def test_process_already_gone(self, verbose, capsys):
+        # the process exits between the wait and the next signal
+        process = _process("witness0")
+        process.terminate.side_effect = psutil.NoSuchProcess(1)
+        wait_procs, calls = _wait_procs([set(), {process}])
+        with unittest.mock.patch.object(stop.psutil, "wait_procs", wait_procs):
+            stop.stop_processes({process: "witness0"}, verbose)
+
+        assert len(calls) == 2
+        process.kill.assert_not_called()
+        assert ("Needed to kill witness0" in capsys.readouterr().out) == verbose
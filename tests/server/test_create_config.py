@@ -1,6 +1,9 @@
+import json
 import os
 
 from click.testing import CliRunner
+from xrpl import CryptoAlgorithm
+from xrpl.wallet import Wallet
 
 from xbridge_cli.main import main
 
@@ -33,3 +36,229 @@ class TestBasicCreation:
 
             assert "witness.json" in os.listdir(subfolder)
             assert os.path.isfile(os.path.join(subfolder, "witness.json")) is True
+
+    def test_witness_keys(self):
+        runner = CliRunner()
+        tempdir = os.getenv("XCHAIN_CONFIG_DIR")
+        create_result = runner.invoke(main, ["server", "create-config", "all"])
+        assert create_result.exit_code == 0
+
+        with open(os.path.join(tempdir, "bridge_bootstrap.json")) as f:
+            bootstrap = json.load(f)
+        for name in [f"witness{i}" for i in range(5)]:
+            with open(os.path.join(tempdir, name, "witness.json")) as f:
+                witness = json.load(f)
+
+            # the keys are derived in other processes, so check that they match up
+            reward_wallet = Wallet.from_seed(
+                witness["LockingChain"]["TxnSubmit"]["SigningKeySeed"],
+                algorithm=CryptoAlgorithm.ED25519,
+            )
+            assert (
+                reward_wallet.classic_address
+                == witness["LockingChain"]["RewardAccount"]
+            )
+            signing_wallet = Wallet.from_seed(
+                witness["SigningKeySeed"], algorithm=CryptoAlgorithm.ED25519
+            )
+            assert signing_wallet.classic_address in json.dumps(bootstrap)
+            assert (
+                witness["XChainBridge"]["LockingChainDoor"]
+                == bootstrap["LockingChain"]["DoorAccount"]["Address"]
+            )
+
+    def test_rippled_profiles(self):
+        runner = CliRunner()
+        tempdir = os.getenv("XCHAIN_CONFIG_DIR")
+        create_result = runner.invoke(
+            main,
+            [
+                "server",
+                "create-config",
+                "all",
+                "--chain-profile",
+                "issuing_chain=benchmark",
+            ],
+        )
+        assert create_result.exit_code == 0, create_result.output
+
+        with open(os.path.join(tempdir, "locking_chain", "rippled.cfg")) as f:
+            locking_cfg = f.read()
+        with open(os.path.join(tempdir, "issuing_chain", "rippled.cfg")) as f:
+            issuing_cfg = f.read()
+        assert "type=NuDB" in locking_cfg
+        assert "[transaction_queue]" not in locking_cfg
+        assert "type=Memory" in issuing_cfg
+        assert "online_delete" not in issuing_cfg
+        assert "[transaction_queue]" in issuing_cfg
+
+        with open(os.path.join(tempdir, "environment.json")) as f:
+            profiles = json.load(f)["rippled_profiles"]
+        assert profiles["locking_chain"]["name"] == "default"
+        assert profiles["issuing_chain"]["name"] == "benchmark"
+        assert profiles["issuing_chain"]["settings"]["node_db_type"] == "Memory"
+
+    def test_witness_profile(self, tmp_path):
+        runner = CliRunner()
+        tempdir = os.getenv("XCHAIN_CONFIG_DIR")
+        data_dir = tmp_path / "data"
+        create_result = runner.invoke(
+            main,
+            [
+                "server",
+                "create-config",
+                "all",
+                "--witness-profile",
+                "benchmark",
+                "--witness-data-dir",
+                str(data_dir),
+            ],
+        )
+        assert create_result.exit_code == 0, create_result.output
+
+        for name in [f"witness{i}" for i in range(5)]:
+            with open(os.path.join(tempdir, name, "witness.json")) as f:
+                witness = json.load(f)
+            assert witness["LogLevel"] == "Warning"
+            # the DB and log are moved out of the config folder
+            witness_data_dir = os.path.join(
+                data_dir, os.path.abspath(tempdir).lstrip(os.sep), name
+            )
+            assert witness["DBDir"] == os.path.join(witness_data_dir, "db")
+            assert witness["LogFile"] == os.path.join(witness_data_dir, "witness.log")
+            assert os.path.isdir(witness["DBDir"])
+
+        with open(os.path.join(tempdir, "environment.json")) as f:
+            profiles = json.load(f)["witness_profiles"]
+        assert profiles["witness0"]["name"] == "benchmark"
+
+    def test_incremental(self):
+        runner = CliRunner()
+        tempdir = os.getenv("XCHAIN_CONFIG_DIR")
+        create_result = runner.invoke(main, ["server", "create-config", "all"])
+        assert create_result.exit_code == 0, create_result.output
+
+        db_file = os.path.join(tempdir, "witness0", "db", "xchain.db")
+        with open(db_file, "w") as f:
+            f.write("attestations")
+        with open(os.path.join(tempdir, "witness0", "witness.json")) as f:
+            witness = json.load(f)
+        bootstrap_file = os.path.join(tempdir, "bridge_bootstrap.json")
+        bootstrap_mtime = os.path.getmtime(bootstrap_file)
+
+        create_result = runner.invoke(
+            main,
+            [
+                "server",
+                "create-config",
+                "all",
+                "--incremental",
+                "--witness-profile",
+                "benchmark",
+            ],
+        )
+        assert create_result.exit_code == 0, create_result.output
+
+        # the keys and DB are kept, and only the changed files are rewritten
+        assert os.path.isfile(db_file)
+        with open(os.path.join(tempdir, "witness0", "witness.json")) as f:
+            new_witness = json.load(f)
+        assert new_witness["SigningKeySeed"] == witness["SigningKeySeed"]
+        assert new_witness["LogLevel"] == "Warning"
+        assert os.path.getmtime(bootstrap_file) == bootstrap_mtime
+
+        create_result = runner.invoke(main, ["server", "create-config", "all"])
+        assert create_result.exit_code == 0, create_result.output
+        assert not os.path.exists(db_file)
+
+    def test_docker_networks(self, tmp_path):
+        runner = CliRunner()
+        networks = []
+        for env in ["env_a", "env_b"]:
+            config_dir = tmp_path / env
+            create_result = runner.invoke(
+                main,
+                [
+                    "server",
+                    "create-config",
+                    "all",
+                    "--config-dir",
+                    str(config_dir),
+                    "--docker",
+                    "--num-witnesses",
+                    "7",
+                    "--rippled-profile",
+                    "small",
+                ],
+            )
+            assert create_result.exit_code == 0, create_result.output
+            assert os.path.isfile(config_dir / "docker-compose.yml")
+
+            with open(config_dir / "environment.json") as f:
+                network = json.load(f)["docker"]
+            networks.append(network)
+            assert network["services"]["locking_chain"]["memory"] == "1g"
+            with open(config_dir / "witness6" / "witness.json") as f:
+                witness = json.load(f)
+            assert (
+                witness["LockingChain"]["Endpoint"]["Host"]
+                == network["services"]["locking_chain"]["ip_address"]
+            )
+
+        # the environments can run side by side
+        assert networks[0]["name"] != networks[1]["name"]
+        assert networks[0]["subnet"] != networks[1]["subnet"]
+
+    def test_create_topology(self, tmp_path):
+        topology_file = tmp_path / "topology.json"
+        topology_file.write_text(
+            json.dumps(
+                {
+                    "chains": ["hub", {"name": "side0", "profile": "small"}, "side1"],
+                    "bridges": [
+                        {
+                            "name": "bridge0",
+                            "locking_chain": "hub",
+                            "issuing_chain": "side0",
+                            "witnesses": 3,
+                        },
+                        {
+                            "name": "bridge1",
+                            "locking_chain": "hub",
+                            "issuing_chain": "side1",
+                            "witnesses": 2,
+                        },
+                    ],
+                }
+            )
+        )
+        config_dir = tmp_path / "configs"
+        runner = CliRunner()
+        create_result = runner.invoke(
+            main,
+            [
+                "server",
+                "create-config",
+                "topology",
+                "--config-dir",
+                str(config_dir),
+                "--topology",
+                str(topology_file),
+            ],
+        )
+        assert create_result.exit_code == 0, create_result.output
+
+        witness_ports = []
+        for bridge, num_witnesses in [("bridge0", 3), ("bridge1", 2)]:
+            assert os.path.isfile(config_dir / f"{bridge}_bootstrap.json")
+            for i in range(num_witnesses):
+                with open(config_dir / f"{bridge}_witness{i}" / "witness.json") as f:
+                    witness_ports.append(json.load(f)["RPCEndpoint"]["Port"])
+        assert len(set(witness_ports)) == 5
+
+        for chain in ["hub", "side0", "side1"]:
+            assert os.path.isfile(config_dir / chain / "rippled.cfg")
+        with open(config_dir / "environment.json") as f:
+            profiles = json.load(f)["rippled_profiles"]
+        assert profiles["hub"]["name"] == "default"
+        assert profiles["side0"]["name"] == "small"
@@ -10,8 +10,7 @@ import psutil
 import pytest
 
 from xbridge_cli.main import main
-from xbridge_cli.server.start import _DOCKER_COMPOSE
-from xbridge_cli.utils import get_config
+from xbridge_cli.utils import get_config, get_state_store
 from xbridge_cli.utils.config_file import get_config_folder
 
 CONFIG_FOLDER = get_config_folder()
@@ -87,9 +86,8 @@ class TestServer:
         assert process_to_kill in initial_list.output
 
         if os.getenv("WITNESSD_EXE") == "docker":
-            to_run = [*_DOCKER_COMPOSE, "stop", process_to_kill]
-            subprocess.run(to_run, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             docker_client = docker.from_env()
+            docker_client.containers.get(process_to_kill).stop()
             try:
                 container = docker_client.containers.get(process_to_kill)
                 assert container.status != "running"
@@ -110,19 +108,7 @@ class TestServer:
         final_list = runner.invoke(main, ["server", "list"])
         assert process_to_kill not in final_list.output
 
-        with open(os.path.join(CONFIG_FOLDER, "config.json")) as f:
-            config_file = json.load(f)
-
-        assert (
-            len(
-                [
-                    witness
-                    for witness in config_file["witnesses"]
-                    if witness["name"] == process_to_kill
-                ]
-            )
-            == 0
-        )
+        assert len(get_state_store().get_witnesses(process_to_kill)) == 0
 
     def test_print_rippled(self, runner):
         server_list = runner.invoke(
@@ -175,3 +161,53 @@ class TestServer:
         expected = {"result": {"role": "admin", "status": "success"}}
 
         assert json.loads(result.output) == expected
+
+    def test_status(self, runner):
+        result = runner.invoke(main, ["server", "status", "--all"])
+        assert result.exit_code == 0, result.output
+
+        lines = result.output.split("\n")
+        assert lines[0] == "Chains:"
+        assert re.search(
+            r"^ issuing_chain +\| \w+ +\| +\d+", result.output, re.MULTILINE
+        )
+        assert re.search(
+            r"^ locking_chain +\| \w+ +\| +\d+", result.output, re.MULTILINE
+        )
+        assert "Witnesses:" in lines
+        for i in range(5):
+            assert re.search(rf"^ witness{i} +\| yes", result.output, re.MULTILINE)
+
+    def test_request_witness(self, runner):
+        result = runner.invoke(
+            main, ["server", "request", "--name", "witness0", "server_info"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "result" in json.loads(result.output)
+
+    def test_request_batch(self, runner, tmp_path):
+        batch_file = tmp_path / "batch.jsonl"
+        batch_file.write_text(
+            '{"method": "ping"}\n'
+            '{"method": "server_info", "params": [{}]}\n'
+            "\n"
+            '{"method": "account_info", "account": "rNotAnAccount"}\n'
+        )
+        result = runner.invoke(
+            main,
+            [
+                "server",
+                "request",
+                "--name",
+                "issuing_chain",
+                "--batch",
+                str(batch_file),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+
+        responses = [json.loads(line) for line in result.output.splitlines()]
+        assert len(responses) == 3
+        assert responses[0] == {"result": {"role": "admin", "status": "success"}}
+        assert "info" in responses[1]["result"]
+        assert responses[2]["result"]["status"] == "error"
@@ -2,21 +2,33 @@
 
 import click
 
-from xbridge_cli.bridge.build import setup_bridge
-from xbridge_cli.bridge.create_account import create_xchain_account
-from xbridge_cli.bridge.register import register_bridge
-from xbridge_cli.bridge.transfer import send_transfer
+from xbridge_cli.lazy_group import LazyGroup
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "build": (
+            "xbridge_cli.bridge.build:setup_bridge",
+            "Keep track of a bridge between a locking chain and issuing chain.",
+        ),
+        "create-account": (
+            "xbridge_cli.bridge.create_account:create_xchain_account",
+            "Create an account on the opposite chain via a cross-chain transfer.",
+        ),
+        "register": (
+            "xbridge_cli.bridge.register:register_bridge",
+            "Register an existing bridge with the CLI and validate its setup.",
+        ),
+        "transfer": (
+            "xbridge_cli.bridge.transfer:send_transfer",
+            "Set up a bridge between a locking chain and issuing chain.",
+        ),
+    },
+)
 def bridge() -> None:
     """Subcommand for all commands dealing with the bridge itself."""
     pass
 
 
-bridge.add_command(setup_bridge, name="build")
-bridge.add_command(create_xchain_account, name="create-account")
-bridge.add_command(register_bridge, name="register")
-bridge.add_command(send_transfer, name="transfer")
-
 __all__ = ["bridge"]
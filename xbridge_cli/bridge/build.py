@@ -2,8 +2,11 @@
 
 import json
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from pprint import pformat
-from typing import List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import click
 from xrpl import CryptoAlgorithm
@@ -20,6 +23,7 @@ from xrpl.models import (
     Currency,
     IssuedCurrency,
     Payment,
+    Request,
     ServerState,
     SignerEntry,
     SignerListSet,
@@ -42,10 +46,199 @@ from xbridge_cli.utils.misc import is_standalone_network
 
 _GENESIS_ACCOUNT = "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh"
 _GENESIS_SEED = "snoPBrXtMeMyMHUVTgbuqAfg1SUTb"
-_GENESIS_WALLET = Wallet.from_seed(_GENESIS_SEED, algorithm=CryptoAlgorithm.SECP256K1)
 
 LSF_DISABLE_MASTER = 0x00100000
 
+# the most read queries in flight at once while discovering the chains' state
+_MAX_DISCOVERY_WORKERS = 16
+
+
+# the key derivation is slow, so only do it if a build actually needs the wallet
+@lru_cache(maxsize=None)
+def _get_genesis_wallet() -> Wallet:
+    return Wallet.from_seed(_GENESIS_SEED, algorithm=CryptoAlgorithm.SECP256K1)
+
+
+# the on-ledger state of one chain that a build depends on, all read up front so that
+# the build is planned from one snapshot instead of a query at every step
+@dataclass(frozen=True)
+class _ChainState:
+    reserve_base: Optional[int]
+    existing_accounts: FrozenSet[str]
+    # `None` if the door account doesn't exist (yet)
+    door_info: Optional[Dict[str, Any]]
+    door_lines: List[Dict[str, Any]]
+    door_bridges: List[Dict[str, Any]]
+
+
+def _request_result(client: JsonRpcClient, request: Request) -> Dict[str, Any]:
+    return client.request(request).result
+
+
+def _get_reserve_base(client: JsonRpcClient) -> int:
+    result = _request_result(client, ServerState())
+    return int(result["state"]["validated_ledger"]["reserve_base"])
+
+
+def _get_chain_state(
+    reserve_base: "Optional[Future[int]]",
+    accounts_exist: "Dict[str, Future[bool]]",
+    door_info: "Future[Dict[str, Any]]",
+    door_lines: "Optional[Future[Dict[str, Any]]]",
+    door_objects: "Future[Dict[str, Any]]",
+) -> _ChainState:
+    info_result = door_info.result()
+    if info_result.get("error") == "actNotFound":
+        # a door that doesn't exist yet has nothing set up on it
+        return _ChainState(
+            reserve_base=reserve_base.result() if reserve_base else None,
+            existing_accounts=frozenset(
+                account for account, exists in accounts_exist.items() if exists.result()
+            ),
+            door_info=None,
+            door_lines=[],
+            door_bridges=[],
+        )
+    for result, key in [
+        (info_result, "account_data"),
+        (door_objects.result(), "account_objects"),
+    ]:
+        if key not in result:
+            raise XBridgeCLIException(result.get("error_message") or json.dumps(result))
+    return _ChainState(
+        reserve_base=reserve_base.result() if reserve_base else None,
+        existing_accounts=frozenset(
+            account for account, exists in accounts_exist.items() if exists.result()
+        ),
+        door_info=info_result["account_data"],
+        door_lines=door_lines.result()["lines"] if door_lines else [],
+        door_bridges=door_objects.result()["account_objects"],
+    )
+
+
+def _query_chain_state(
+    executor: ThreadPoolExecutor,
+    client: JsonRpcClient,
+    door: str,
+    accounts: Set[str],
+    is_xrp_bridge: bool,
+) -> Callable[[], _ChainState]:
+    # sends the chain's queries, and returns a function that waits for their results
+    return partial(
+        _get_chain_state,
+        reserve_base=(
+            executor.submit(_get_reserve_base, client) if is_xrp_bridge else None
+        ),
+        accounts_exist={
+            account: executor.submit(does_account_exist, account, client)
+            for account in accounts
+        },
+        door_info=executor.submit(
+            _request_result, client, AccountInfo(account=door, signer_lists=True)
+        ),
+        # only an IOU bridge needs a trustline
+        door_lines=(
+            None
+            if is_xrp_bridge
+            else executor.submit(_request_result, client, AccountLines(account=door))
+        ),
+        door_objects=executor.submit(
+            _request_result,
+            client,
+            AccountObjects(account=door, type=AccountObjectType.BRIDGE),
+        ),
+    )
+
+
+def _discover_chain_states(
+    clients: Tuple[JsonRpcClient, JsonRpcClient],
+    doors: Tuple[str, str],
+    accounts: Tuple[Set[str], Set[str]],
+    is_xrp_bridge: bool,
+) -> Tuple[_ChainState, _ChainState]:
+    with ThreadPoolExecutor(max_workers=_MAX_DISCOVERY_WORKERS) as executor:
+        # every read query for both chains is sent before waiting on any of them
+        pending = [
+            _query_chain_state(executor, client, door, chain_accounts, is_xrp_bridge)
+            for client, door, chain_accounts in zip(clients, doors, accounts)
+        ]
+        locking_state, issuing_state = [get_state() for get_state in pending]
+    return locking_state, issuing_state
+
+
+# the chains are set up at the same time, and the only step that depends on the
+# other chain is the door payment for the accounts created on the issuing chain
+def _submit_setup_txs(
+    *,
+    locking_client: JsonRpcClient,
+    issuing_client: JsonRpcClient,
+    funding_wallet: Optional[Wallet],
+    funding_txs: List[Transaction],
+    locking_door_wallet: Wallet,
+    locking_txs: List[Transaction],
+    door_payment: Optional[Payment],
+    acct_txs: List[Transaction],
+    issuing_door_wallet: Wallet,
+    issuing_txs: List[Transaction],
+    verbose: int,
+    verbosity: int,
+    close_ledgers: bool,
+) -> None:
+    issuing_accounts_created: "Future[None]" = Future()
+
+    def set_up_locking_chain() -> None:
+        if len(funding_txs) > 0:
+            assert funding_wallet is not None  # for type reasons
+            submit_tx(
+                funding_txs, locking_client, funding_wallet, verbose, close_ledgers
+            )
+        submit_tx(
+            locking_txs,
+            locking_client,
+            locking_door_wallet,
+            verbosity,
+            close_ledgers,
+        )
+        if door_payment is not None:
+            assert funding_wallet is not None  # for type reasons
+            # raises if the accounts couldn't be created
+            issuing_accounts_created.result()
+            submit_tx(
+                door_payment, locking_client, funding_wallet, verbosity, close_ledgers
+            )
+
+    def set_up_issuing_chain() -> None:
+        # everything before the Future is resolved is in the `try`, so the locking
+        # chain is never left waiting on it
+        try:
+            if len(acct_txs) > 0:
+                submit_tx(
+                    acct_txs,
+                    issuing_client,
+                    _get_genesis_wallet(),
+                    verbosity,
+                    close_ledgers,
+                )
+        except BaseException as e:
+            issuing_accounts_created.set_exception(e)
+            raise
+        issuing_accounts_created.set_result(None)
+        submit_tx(
+            issuing_txs,
+            issuing_client,
+            issuing_door_wallet,
+            verbosity,
+            close_ledgers,
+        )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(set_up_locking_chain),
+            executor.submit(set_up_issuing_chain),
+        ]
+        for future in futures:
+            future.result()
+
 
 @click.command(name="build")
 @click.option(
@@ -196,15 +389,28 @@ def setup_bridge(
 
     is_xrp_bridge = locking_chain_issue == XRP()
 
+    accounts_locking_check = set(
+        [locking_door]
+        + bootstrap_locking["WitnessRewardAccounts"]
+        + bootstrap_locking["WitnessSubmitAccounts"]
+    )
+    accounts_issuing_check = set(
+        bootstrap_issuing["WitnessRewardAccounts"]
+        + bootstrap_issuing["WitnessSubmitAccounts"]
+    )
+
+    # read everything the build depends on from both chains, and plan the build from
+    # that snapshot
+    locking_state, issuing_state = _discover_chain_states(
+        (locking_client, issuing_client),
+        (locking_door, issuing_door),
+        (accounts_locking_check, accounts_issuing_check),
+        is_xrp_bridge,
+    )
+
     # get min create account amount values
-    if is_xrp_bridge:
-        server_state1 = locking_client.request(ServerState())
-        min_create1 = server_state1.result["state"]["validated_ledger"]["reserve_base"]
-        server_state2 = issuing_client.request(ServerState())
-        min_create2 = server_state2.result["state"]["validated_ledger"]["reserve_base"]
-    else:
-        min_create1 = None
-        min_create2 = None
+    min_create1 = locking_state.reserve_base
+    min_create2 = issuing_state.reserve_base
     min_create1_rippled = str(min_create1) if min_create1 is not None else None
     min_create2_rippled = str(min_create2) if min_create2 is not None else None
 
@@ -229,40 +435,27 @@ def setup_bridge(
         else None
     )
 
-    accounts_locking_check = set(
-        [locking_door]
-        + bootstrap_locking["WitnessRewardAccounts"]
-        + bootstrap_locking["WitnessSubmitAccounts"]
-    )
-    accounts_issuing_check = set(
-        bootstrap_issuing["WitnessRewardAccounts"]
-        + bootstrap_issuing["WitnessSubmitAccounts"]
-    )
-
     funding_txs: List[Transaction] = []
 
     # check locking chain for accounts that should already exist
-    for account in accounts_locking_check:
-        if not does_account_exist(account, locking_client):
-            if is_xrp_bridge and fund_locking:
-                assert funding_wallet is not None  # for type reasons
-                funding_txs.append(
-                    Payment(
-                        account=funding_wallet.classic_address,
-                        destination=account,
-                        amount=str(min_create1 * 2),
-                    )
-                )
-            else:
-                raise XBridgeCLIException(
-                    f"Account {account} does not exist on the locking chain."
+    for account in accounts_locking_check - locking_state.existing_accounts:
+        if is_xrp_bridge and fund_locking:
+            assert funding_wallet is not None  # for type reasons
+            assert min_create1 is not None  # for type reasons
+            funding_txs.append(
+                Payment(
+                    account=funding_wallet.classic_address,
+                    destination=account,
+                    amount=str(min_create1 * 2),
                 )
-    if len(funding_txs) > 0:
-        assert funding_wallet is not None  # for type reasons
-        submit_tx(funding_txs, locking_client, funding_wallet, verbose, close_ledgers)
+            )
+        else:
+            raise XBridgeCLIException(
+                f"Account {account} does not exist on the locking chain."
+            )
 
     # make sure issuing door account exists
-    if not does_account_exist(issuing_door, issuing_client):
+    if issuing_state.door_info is None:
         raise XBridgeCLIException(
             f"Issuing chain door {issuing_door} does not exist on the locking chain."
         )
@@ -271,11 +464,10 @@ def setup_bridge(
         # bridge (the bridge that doesn't exist yet)
         # so we only check if accounts already exist on the issuing chain for IOU
         # bridges
-        for account in accounts_issuing_check:
-            if not does_account_exist(account, issuing_client):
-                raise XBridgeCLIException(
-                    f"Account {account} does not exist on the issuing chain."
-                )
+        for account in accounts_issuing_check - issuing_state.existing_accounts:
+            raise XBridgeCLIException(
+                f"Account {account} does not exist on the issuing chain."
+            )
 
     # set up signer entries for multisign on the door accounts
     signer_entries: List[SignerEntry] = []
@@ -306,12 +498,9 @@ def setup_bridge(
         assert isinstance(bridge_obj.locking_chain_issue, IssuedCurrency)
 
         # check if the trustline already exists
-        account_lines = locking_client.request(AccountLines(locking_door)).result[
-            "lines"
-        ]
         filtered_lines = [
             line
-            for line in account_lines
+            for line in locking_state.door_lines
             if line["account"] == bridge_obj.locking_chain_issue.issuer
             and line["currency"] == bridge_obj.locking_chain_issue.currency
         ]
@@ -328,15 +517,7 @@ def setup_bridge(
 
     # check if the bridge already exists
     locking_bridge_exists = False
-    locking_objs_result = locking_client.request(
-        AccountObjects(account=locking_door, type=AccountObjectType.BRIDGE)
-    ).result
-    if "account_objects" not in locking_objs_result:
-        obj_error = locking_objs_result.get("error_message") or json.dumps(
-            locking_objs_result
-        )
-        raise XBridgeCLIException(obj_error)
-    locking_door_objs = locking_objs_result["account_objects"]
+    locking_door_objs = locking_state.door_bridges
     if len(locking_door_objs) > 0:
         if any(
             XChainBridge.from_xrpl(obj["XChainBridge"]) == bridge_obj
@@ -363,9 +544,8 @@ def setup_bridge(
 
     # check if multisign exists
     locking_signer_list_exists = False
-    locking_account_info = locking_client.request(
-        AccountInfo(account=locking_door, signer_lists=True)
-    ).result["account_data"]
+    # the door is only funded now if it didn't exist, so it has nothing set up yet
+    locking_account_info = locking_state.door_info or {"Flags": 0, "signer_lists": []}
     locking_signer_list = locking_account_info["signer_lists"]
     if len(locking_signer_list) > 0:
         assert len(locking_signer_list) == 1
@@ -395,40 +575,31 @@ def setup_bridge(
             )
         )
 
-    # submit transactions
-    submit_tx(
-        locking_txs,
-        locking_client,
-        locking_door_wallet,
-        verbosity,
-        close_ledgers,
-    )
-
     ###################################################################################
     # set up issuing chain
 
+    acct_txs: List[Transaction] = []
+    door_payment: Optional[Payment] = None
     if is_xrp_bridge:
         # we need to create the witness reward + submission accounts
         assert funding_wallet is not None  # for typing purposes
+        assert min_create2 is not None  # for typing purposes
 
         # TODO: add param to customize amount
         amount = str(min_create2 * 2)  # submit accounts need spare funds
         total_amount = 0
 
         # create the accounts
-        acct_txs: List[Transaction] = []
         # send the funds for the accounts on the issuing chain from the genesis account
-        for account in accounts_issuing_check:
-            if not does_account_exist(account, issuing_client):
-                acct_txs.append(
-                    Payment(
-                        account=_GENESIS_ACCOUNT,
-                        destination=account,
-                        amount=amount,
-                    )
+        for account in accounts_issuing_check - issuing_state.existing_accounts:
+            acct_txs.append(
+                Payment(
+                    account=_GENESIS_ACCOUNT,
+                    destination=account,
+                    amount=amount,
                 )
-                total_amount += int(amount)
-        submit_tx(acct_txs, issuing_client, _GENESIS_WALLET, verbosity, close_ledgers)
+            )
+            total_amount += int(amount)
 
         # set up the attestations for the commit
         if total_amount > 0:
@@ -437,9 +608,6 @@ def setup_bridge(
                 destination=locking_door,
                 amount=str(total_amount),
             )
-            submit_tx(
-                door_payment, locking_client, funding_wallet, verbosity, close_ledgers
-            )
 
     issuing_txs: List[Transaction] = []
 
@@ -447,15 +615,7 @@ def setup_bridge(
 
     # check if the bridge already exists
     issuing_bridge_exists = False
-    issuing_objs_result = issuing_client.request(
-        AccountObjects(account=issuing_door, type=AccountObjectType.BRIDGE)
-    ).result
-    if "account_objects" not in issuing_objs_result:
-        obj_error = issuing_objs_result.get("error_message") or json.dumps(
-            issuing_objs_result
-        )
-        raise XBridgeCLIException(obj_error)
-    issuing_door_objs = issuing_objs_result["account_objects"]
+    issuing_door_objs = issuing_state.door_bridges
     if len(issuing_door_objs) > 0:
         if any(
             XChainBridge.from_xrpl(obj["XChainBridge"]) == bridge_obj
@@ -482,9 +642,7 @@ def setup_bridge(
 
     # check if multisign exists
     issuing_signer_list_exists = False
-    issuing_account_info = issuing_client.request(
-        AccountInfo(account=issuing_door, signer_lists=True)
-    ).result["account_data"]
+    issuing_account_info = issuing_state.door_info
     issuing_signer_list = issuing_account_info["signer_lists"]
     if len(issuing_signer_list) > 0:
         assert len(issuing_signer_list) == 1
@@ -514,13 +672,23 @@ def setup_bridge(
             )
         )
 
+    ###################################################################################
     # submit transactions
-    submit_tx(
-        issuing_txs,
-        issuing_client,
-        issuing_door_wallet,
-        verbosity,
-        close_ledgers,
+
+    _submit_setup_txs(
+        locking_client=locking_client,
+        issuing_client=issuing_client,
+        funding_wallet=funding_wallet,
+        funding_txs=funding_txs,
+        locking_door_wallet=locking_door_wallet,
+        locking_txs=locking_txs,
+        door_payment=door_payment,
+        acct_txs=acct_txs,
+        issuing_door_wallet=issuing_door_wallet,
+        issuing_txs=issuing_txs,
+        verbose=verbose,
+        verbosity=verbosity,
+        close_ledgers=close_ledgers,
     )
 
     # add bridge to CLI config
@@ -0,0 +1,27 @@
+"""Subcommand for all commands dealing with the supervisor daemon."""
+
+import click
+
+from xbridge_cli.lazy_group import LazyGroup
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "start": (
+            "xbridge_cli.daemon.start:start_daemon",
+            "Start the daemon that supervises the servers the CLI starts.",
+        ),
+        "stop": ("xbridge_cli.daemon.stop:stop_daemon", "Stop the daemon."),
+        "status": (
+            "xbridge_cli.daemon.status:daemon_status",
+            "Get the status of the servers supervised by the daemon.",
+        ),
+    },
+)
+def daemon() -> None:
+    """Subcommand for all commands dealing with the supervisor daemon."""
+    pass
+
+
+__all__ = ["daemon"]
@@ -0,0 +1,77 @@
+"""Start the supervisor daemon."""
+
+import os
+import subprocess
+import sys
+import time
+
+import click
+
+from xbridge_cli.daemon.supervisor import run_daemon
+from xbridge_cli.exceptions import DaemonNotRunningException, XBridgeCLIException
+from xbridge_cli.utils import get_config_folder, get_daemon_socket, send_daemon_request
+
+_START_UP_TIME = 10  # seconds
+_WAIT_INCREMENT = 0.05  # seconds
+
+
+def _is_running(socket_path: str) -> bool:
+    try:
+        send_daemon_request(socket_path, "ping")
+        return True
+    except DaemonNotRunningException:
+        return False
+
+
+@click.command(name="start")
+@click.option(
+    "--foreground",
+    is_flag=True,
+    help="Run the daemon in this process, instead of in the background.",
+)
+def start_daemon(foreground: bool = False) -> None:
+    """
+    Start the daemon that supervises the servers the CLI starts. While it is running,
+    servers started with `server start`/`server start-all` are restarted if they
+    crash, and `server list` doesn't need to probe them.
+    \f
+
+    Args:
+        foreground: Run the daemon in this process, instead of in the background.
+
+    Raises:
+        XBridgeCLIException: If the daemon is already running, or doesn't start up.
+    """  # noqa: D301
+    socket_path = get_daemon_socket()
+    if foreground:
+        run_daemon(socket_path)
+        return
+
+    if _is_running(socket_path):
+        raise XBridgeCLIException("The xbridge-cli daemon is already running.")
+    output_file = os.path.join(get_config_folder(), "daemon.out")
+    with open(output_file, "w") as fout:
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "xbridge_cli.main",
+                "daemon",
+                "start",
+                "--foreground",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=fout,
+            stderr=subprocess.STDOUT,
+            close_fds=True,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + _START_UP_TIME
+    while not _is_running(socket_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            with open(output_file) as f:
+                click.echo(f.read())
+            raise XBridgeCLIException("The daemon did not start up correctly.")
+        time.sleep(_WAIT_INCREMENT)
+    click.echo(f"Started the xbridge-cli daemon (PID: {process.pid}).")
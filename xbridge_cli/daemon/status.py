@@ -0,0 +1,16 @@
+"""Get the status of the servers supervised by the daemon."""
+
+import click
+from tabulate import tabulate
+
+from xbridge_cli.utils import get_daemon_socket, send_daemon_request
+
+
+@click.command(name="status")
+def daemon_status() -> None:
+    """Get the status of the servers supervised by the daemon."""
+    status = send_daemon_request(get_daemon_socket(), "status")
+    if len(status) == 0:
+        click.echo("No servers supervised.")
+        return
+    click.echo(tabulate(status, headers="keys", tablefmt="presto"))
@@ -0,0 +1,15 @@
+"""Stop the supervisor daemon."""
+
+import click
+
+from xbridge_cli.utils import get_daemon_socket, send_daemon_request
+
+
+@click.command(name="stop")
+def stop_daemon() -> None:
+    """
+    Stop the daemon. The servers it supervises are left running, but are no longer
+    restarted if they crash.
+    """
+    send_daemon_request(get_daemon_socket(), "shutdown")
+    click.echo("Stopped the xbridge-cli daemon.")
@@ -0,0 +1,318 @@
+"""The supervisor that runs the servers on behalf of the CLI."""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socketserver
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, cast
+
+import click
+import psutil
+
+from xbridge_cli.exceptions import DaemonNotRunningException, XBridgeCLIException
+from xbridge_cli.utils import (
+    ChainConfig,
+    ChainData,
+    ServerConfig,
+    WitnessConfig,
+    get_state_store,
+    send_daemon_request,
+)
+from xbridge_cli.utils.output_file import spawn_with_output
+from xbridge_cli.utils.resources import (
+    ResourceLog,
+    ResourceSampler,
+    get_resource_log_file,
+)
+from xbridge_cli.utils.types import ServerData
+
+_MIN_RESTART_DELAY = 1  # seconds
+_MAX_RESTART_DELAY = 60  # seconds
+# how long a server has to stay up for its restart backoff to be reset
+_STABLE_TIME = 60  # seconds
+_SAMPLE_INTERVAL = 1  # seconds
+
+
+@dataclass
+class _ManagedServer:
+    data: ServerData
+    command: List[str]
+    output_file: str
+    process: subprocess.Popen[bytes]
+    started_at: float = field(default_factory=time.monotonic)
+    # `running`, or `restarting` while waiting out the backoff after a crash
+    state: str = "running"
+    restarts: int = 0
+    restart_delay: float = _MIN_RESTART_DELAY
+    exit_code: Optional[int] = None
+
+
+class Supervisor:
+    """
+    Runs servers, and restarts them (with exponential backoff) if they crash.
+
+    Each process has a thread blocked on its exit, so a crash is noticed as soon as it
+    happens. The status of every server is kept in memory, so it can be queried
+    without probing the servers.
+    """
+
+    def __init__(self: Supervisor) -> None:
+        """Initialize a Supervisor."""
+        self._servers: Dict[str, _ManagedServer] = {}
+        self._lock = threading.Lock()
+
+    def start_server(
+        self: Supervisor, data: ServerData, command: List[str], output_file: str
+    ) -> int:
+        """
+        Start a server and supervise it.
+
+        Args:
+            data: The data of the server.
+            command: The command that runs the server.
+            output_file: The file the output of the server is written to.
+
+        Returns:
+            The PID of the server.
+
+        Raises:
+            XBridgeCLIException: If a server with that name is already supervised.
+        """
+        with self._lock:
+            if data["name"] in self._servers:
+                raise XBridgeCLIException(f"{data['name']} is already supervised.")
+            process = _spawn(command, output_file, False)
+            server = _ManagedServer(
+                data, command, output_file, process, restart_delay=_MIN_RESTART_DELAY
+            )
+            self._servers[data["name"]] = server
+        self._watch(server)
+        return process.pid
+
+    def release(self: Supervisor, names: List[str]) -> List[str]:
+        """
+        Stop supervising servers. The servers themselves are left running.
+
+        Args:
+            names: The names of the servers to release.
+
+        Returns:
+            The names of the servers that were being supervised.
+        """
+        with self._lock:
+            return [name for name in names if self._servers.pop(name, None)]
+
+    def get_status(self: Supervisor) -> List[Dict[str, Any]]:
+        """
+        Get the status of all the supervised servers.
+
+        Returns:
+            The status of each supervised server.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": name,
+                    "type": server.data["type"],
+                    "pid": server.process.pid,
+                    "state": server.state,
+                    "restarts": server.restarts,
+                    "uptime": (
+                        round(now - server.started_at)
+                        if server.state == "running"
+                        else 0
+                    ),
+                    "exit_code": server.exit_code,
+                }
+                for name, server in sorted(self._servers.items())
+            ]
+
+    def _watch(self: Supervisor, server: _ManagedServer) -> None:
+        thread = threading.Thread(
+            target=self._wait_for_exit, args=(server, server.process), daemon=True
+        )
+        thread.start()
+
+    def _wait_for_exit(
+        self: Supervisor, server: _ManagedServer, process: subprocess.Popen[bytes]
+    ) -> None:
+        exit_code = process.wait()
+        with self._lock:
+            if self._servers.get(server.data["name"]) is not server:
+                # the server was released, so it was stopped on purpose
+                return
+            if time.monotonic() - server.started_at >= _STABLE_TIME:
+                server.restart_delay = _MIN_RESTART_DELAY
+            server.exit_code = exit_code
+            self._schedule_restart(server)
+
+    def _schedule_restart(self: Supervisor, server: _ManagedServer) -> None:
+        # must be called with the lock held
+        server.state = "restarting"
+        delay = server.restart_delay
+        server.restart_delay = min(2 * delay, _MAX_RESTART_DELAY)
+        timer = threading.Timer(delay, self._restart, args=(server,))
+        timer.daemon = True
+        timer.start()
+
+    def _restart(self: Supervisor, server: _ManagedServer) -> None:
+        with self._lock:
+            if self._servers.get(server.data["name"]) is not server:
+                return
+            try:
+                # append, so that the output from before the crash is kept
+                server.process = _spawn(server.command, server.output_file, True)
+            except OSError:
+                self._schedule_restart(server)
+                return
+            server.started_at = time.monotonic()
+            server.state = "running"
+            server.restarts += 1
+            server.data["pid"] = server.process.pid
+        _update_pid(server.data)
+        self._watch(server)
+
+
+def _spawn(
+    command: List[str], output_file: str, append: bool
+) -> subprocess.Popen[bytes]:
+    # a new session, so that signals sent to the daemon don't reach the servers
+    return spawn_with_output(command, output_file, append, new_session=True)
+
+
+def _update_pid(data: ServerData) -> None:
+    # only update servers the CLI still knows about
+    store = get_state_store()
+    if data["type"] == "rippled":
+        if len(store.get_chains(data["name"])) > 0:
+            store.add_chain(cast(ChainData, data))
+    elif len(store.get_witnesses(data["name"])) > 0:
+        # a witness has nothing beyond the common server data
+        store.add_witness(data)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _DaemonServer
+
+    def handle(self: _RequestHandler) -> None:
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+            response = {
+                "result": self.server.dispatch(
+                    request["method"], request.get("params", {})
+                )
+            }
+        except (ValueError, KeyError, TypeError, OSError, XBridgeCLIException) as e:
+            response = {"error": str(e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self: _DaemonServer, socket_path: str) -> None:
+        super().__init__(socket_path, _RequestHandler)
+        self.supervisor = Supervisor()
+
+    def dispatch(
+        self: _DaemonServer, method: str, params: Dict[str, Any]
+    ) -> Any:  # noqa: ANN401
+        if method == "ping":
+            return "pong"
+        if method == "status":
+            return self.supervisor.get_status()
+        if method == "start":
+            return self.supervisor.start_server(
+                params["server"], params["command"], params["output_file"]
+            )
+        if method == "release":
+            return self.supervisor.release(params["names"])
+        if method == "shutdown":
+            self.stop()
+            return True
+        raise XBridgeCLIException(f"Unknown method {method}.")
+
+    def stop(self: _DaemonServer) -> None:
+        # `shutdown` blocks until `serve_forever` returns, so it can't be called from
+        # the thread running `serve_forever`
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def _open_resource_log(name: str) -> ResourceLog:
+    file_name = get_resource_log_file(name)
+    try:
+        return ResourceLog(file_name)
+    except ValueError:
+        # from an older version of the CLI, or corrupted
+        os.remove(file_name)
+        return ResourceLog(file_name)
+
+
+def _record_resources(stopped: threading.Event) -> None:
+    # sample every server the CLI knows about, whether or not it's supervised
+    sampler = ResourceSampler()
+    logs: Dict[str, ResourceLog] = {}
+    while not stopped.wait(_SAMPLE_INTERVAL):
+        try:
+            store = get_state_store()
+            servers: List[ServerConfig] = [
+                *(ChainConfig.from_dict(chain) for chain in store.get_chains()),
+                *(
+                    WitnessConfig.from_dict(witness)
+                    for witness in store.get_witnesses()
+                ),
+            ]
+            for name, sample in sampler.sample(servers).items():
+                if name not in logs:
+                    logs[name] = _open_resource_log(name)
+                logs[name].append(sample)
+        except (psutil.Error, OSError) as e:
+            # e.g. a server that exited mid-sample, which shouldn't stop the sampling
+            click.echo(f"Could not record resource usage: {e}", err=True)
+
+
+def run_daemon(socket_path: str) -> None:
+    """
+    Run the daemon in the current process, until it is asked to shut down. The
+    servers it supervises are left running when it exits.
+
+    While it runs, the resource usage of every local server is recorded once a
+    second.
+
+    Args:
+        socket_path: The location of the Unix socket to listen on.
+
+    Raises:
+        XBridgeCLIException: If a daemon is already running.
+    """
+    if os.path.exists(socket_path):
+        try:
+            send_daemon_request(socket_path, "ping")
+            raise XBridgeCLIException("The xbridge-cli daemon is already running.")
+        except DaemonNotRunningException:
+            # left over from a daemon that didn't exit cleanly
+            os.remove(socket_path)
+
+    server = _DaemonServer(socket_path)
+
+    def _handle_signal(signum: int, frame: Any) -> None:  # noqa: ANN401
+        server.stop()
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+    stopped = threading.Event()
+    threading.Thread(target=_record_resources, args=(stopped,), daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        stopped.set()
+        server.server_close()
+        os.remove(socket_path)
@@ -0,0 +1,26 @@
+"""Subcommand for all commands dealing with snapshots of the whole environment."""
+
+import click
+
+from xbridge_cli.lazy_group import LazyGroup
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "snapshot": (
+            "xbridge_cli.env.snapshot:snapshot_env",
+            "Save the databases and configs of the running servers, and the bridges.",
+        ),
+        "restore": (
+            "xbridge_cli.env.snapshot:restore_env",
+            "Restore a snapshot, and start its servers from their saved ledgers.",
+        ),
+    },
+)
+def env() -> None:
+    """Subcommand for all commands dealing with snapshots of the whole environment."""
+    pass
+
+
+__all__ = ["env"]
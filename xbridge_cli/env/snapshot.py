@@ -0,0 +1,280 @@
+"""Snapshot the whole environment, and restore it later."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, cast
+
+import click
+
+from xbridge_cli.exceptions import XBridgeCLIException
+from xbridge_cli.server.start import _start_servers
+from xbridge_cli.server.stop import _stop_servers
+from xbridge_cli.utils import (
+    ChainConfig,
+    RippledConfig,
+    ServerConfig,
+    add_bridge,
+    get_config,
+    get_config_folder,
+    get_state_store,
+    remove_server,
+)
+
+# ~/.config/xbridge-cli/snapshots/NAME/
+_SNAPSHOT_FOLDER = "snapshots"
+_SNAPSHOT_FILE = "snapshot.json"
+_SERVERS_FOLDER = "servers"
+# the databases that are outside a server's config folder are saved in
+# `servers/NAME.data/0`, `servers/NAME.data/1`, etc.
+_DATA_SUFFIX = ".data"
+# the logs are big, and not needed to bring the servers back up
+_IGNORED_FILES = shutil.ignore_patterns("*.log")
+
+
+def _get_snapshot_folder(name: str) -> str:
+    return os.path.join(get_config_folder(), _SNAPSHOT_FOLDER, name)
+
+
+def _check_ledger_on_disk(name: str, config_file: str) -> None:
+    # rippled can only be started from a saved ledger that is on disk
+    config = RippledConfig(file_name=config_file)
+    if config.node_db["type"].lower() == "memory":
+        raise XBridgeCLIException(
+            f"Server {name} keeps its ledger in memory (`[node_db] type=Memory`), so "
+            "it can't be snapshotted or restored."
+        )
+
+
+def _get_data_folders(server: Dict[str, Any]) -> List[str]:
+    # the folders outside the config folder that hold the server's databases
+    if server["exe"] == "docker":
+        # only the config folder is mounted into the container
+        return []
+    config_dir = os.path.dirname(server["config"])
+    if server["type"] == "rippled":
+        config = RippledConfig(file_name=server["config"])
+        paths = [config.node_db["path"]]
+        database_path = getattr(config, "database_path", None)
+        if database_path is not None and database_path.get_line() is not None:
+            paths.append(database_path.get_line())
+    else:
+        with open(server["config"]) as f:
+            paths = [json.load(f)["DBDir"]]
+
+    outside = {
+        path
+        for path in (os.path.abspath(os.path.join(config_dir, p)) for p in paths)
+        if os.path.commonpath([path, config_dir]) != config_dir
+    }
+    # a folder inside another one is copied along with it
+    return sorted(
+        path
+        for path in outside
+        if not any(
+            other != path and os.path.commonpath([path, other]) == other
+            for other in outside
+        )
+    )
+
+
+def _get_data_copies(
+    snapshot_folder: str, server: Dict[str, Any]
+) -> List[Dict[str, str]]:
+    # where each of the server's data folders is saved in the snapshot
+    return [
+        {
+            "path": path,
+            "snapshot": os.path.join(
+                snapshot_folder, _SERVERS_FOLDER, server["name"] + _DATA_SUFFIX, str(i)
+            ),
+        }
+        for i, path in enumerate(server.get("data_folders", []))
+    ]
+
+
+def _copy_folders(copies: List[Dict[str, str]]) -> None:
+    # the databases are copied all at once
+    def _copy(copy: Dict[str, str]) -> None:
+        shutil.rmtree(copy["destination"], ignore_errors=True)
+        shutil.copytree(copy["source"], copy["destination"], ignore=_IGNORED_FILES)
+
+    with ThreadPoolExecutor(max_workers=max(len(copies), 1)) as executor:
+        list(executor.map(_copy, copies))
+
+
+def _start_from_snapshot(servers: List[Dict[str, Any]], verbose: bool) -> None:
+    # the chains are started before the witnesses, which connect to them
+    for server_type in ["rippled", "witness"]:
+        to_start = [server for server in servers if server["type"] == server_type]
+        for exe in sorted({server["exe"] for server in to_start}):
+            _start_servers(
+                [
+                    (server["name"], server["config"])
+                    for server in to_start
+                    if server["exe"] == exe
+                ],
+                exe,
+                verbose=verbose,
+                load=True,
+            )
+
+
+@click.command(name="snapshot")
+@click.argument("name")
+@click.option(
+    "--force", is_flag=True, help="Overwrite the snapshot if it already exists."
+)
+@click.option(
+    "-v",
+    "--verbose",
+    is_flag=True,
+    help="Whether or not to print more verbose information.",
+)
+def snapshot_env(name: str, force: bool = False, verbose: bool = False) -> None:
+    """
+    Save the databases and configs of the running servers, and the bridges.
+
+    The servers are stopped while their databases are copied, and then started
+    again from their saved ledgers.
+    \f
+
+    Args:
+        name: The name of the snapshot.
+        force: Overwrite the snapshot if it already exists.
+        verbose: Whether or not to print more verbose information.
+
+    Raises:
+        XBridgeCLIException: If there are no servers running, the snapshot
+            already exists, or a rippled server keeps its ledger in memory.
+    """  # noqa: D301
+    config = get_config()
+    servers = cast(List[ServerConfig], config.chains) + cast(
+        List[ServerConfig], config.witnesses
+    )
+    if len(servers) == 0:
+        raise XBridgeCLIException("No servers running.")
+    snapshot_folder = _get_snapshot_folder(name)
+    if os.path.exists(snapshot_folder) and not force:
+        raise XBridgeCLIException(f"Snapshot {name} already exists.")
+
+    server_data: List[Dict[str, Any]] = [
+        {
+            "name": server.name,
+            "type": "rippled" if isinstance(server, ChainConfig) else "witness",
+            "exe": server.exe,
+            "config": server.config,
+        }
+        for server in servers
+    ]
+    for data in server_data:
+        if data["type"] == "rippled":
+            _check_ledger_on_disk(data["name"], data["config"])
+        data["data_folders"] = _get_data_folders(data)
+
+    # the servers are stopped so that their databases are consistent on disk
+    _stop_servers(servers, verbose)
+    for server in servers:
+        remove_server(server.name)
+    shutil.rmtree(snapshot_folder, ignore_errors=True)
+    _copy_folders(
+        [
+            {
+                "source": os.path.dirname(server["config"]),
+                "destination": os.path.join(
+                    snapshot_folder, _SERVERS_FOLDER, server["name"]
+                ),
+            }
+            for server in server_data
+        ]
+        + [
+            {"source": copy["path"], "destination": copy["snapshot"]}
+            for server in server_data
+            for copy in _get_data_copies(snapshot_folder, server)
+        ]
+    )
+    with open(os.path.join(snapshot_folder, _SNAPSHOT_FILE), "w") as f:
+        json.dump(
+            {"servers": server_data, "bridges": get_state_store().get_bridges()},
+            f,
+            indent=4,
+        )
+    click.echo(f"Saved snapshot {name} to {snapshot_folder}")
+
+    _start_from_snapshot(server_data, verbose)
+
+
+@click.command(name="restore")
+@click.argument("name")
+@click.option(
+    "-v",
+    "--verbose",
+    is_flag=True,
+    help="Whether or not to print more verbose information.",
+)
+def restore_env(name: str, verbose: bool = False) -> None:
+    """
+    Restore a snapshot, and start its servers from their saved ledgers.
+
+    Any servers that are running are stopped first. The servers' databases and
+    configs are put back where they were when the snapshot was taken.
+    \f
+
+    Args:
+        name: The name of the snapshot.
+        verbose: Whether or not to print more verbose information.
+
+    Raises:
+        XBridgeCLIException: If the snapshot doesn't exist, or a rippled server in
+            it keeps its ledger in memory.
+    """  # noqa: D301
+    snapshot_folder = _get_snapshot_folder(name)
+    snapshot_file = os.path.join(snapshot_folder, _SNAPSHOT_FILE)
+    if not os.path.exists(snapshot_file):
+        raise XBridgeCLIException(f"Snapshot {name} does not exist.")
+    with open(snapshot_file) as f:
+        snapshot = json.load(f)
+    for server in snapshot["servers"]:
+        if server["type"] == "rippled":
+            _check_ledger_on_disk(
+                server["name"],
+                os.path.join(
+                    snapshot_folder,
+                    _SERVERS_FOLDER,
+                    server["name"],
+                    os.path.basename(server["config"]),
+                ),
+            )
+
+    config = get_config()
+    running = cast(List[ServerConfig], config.witnesses) + cast(
+        List[ServerConfig], config.chains
+    )
+    if len(running) > 0:
+        _stop_servers(running, verbose)
+        remove_server(remove_all=True)
+
+    _copy_folders(
+        [
+            {
+                "source": os.path.join(
+                    snapshot_folder, _SERVERS_FOLDER, server["name"]
+                ),
+                "destination": os.path.dirname(server["config"]),
+            }
+            for server in snapshot["servers"]
+        ]
+        + [
+            {"source": copy["snapshot"], "destination": copy["path"]}
+            for server in snapshot["servers"]
+            for copy in _get_data_copies(snapshot_folder, server)
+        ]
+    )
+    for bridge in snapshot["bridges"]:
+        add_bridge(bridge)
+
+    _start_from_snapshot(snapshot["servers"], verbose)
+    click.echo(f"Restored snapshot {name}")
@@ -17,3 +17,11 @@ class AttestationTimeoutException(XBridgeCLIException):
     def __init__(self: AttestationTimeoutException) -> None:
         """Initialize AttestationTimeoutException."""
         super().__init__("Timeout on attestations.")
+
+
+class DaemonNotRunningException(XBridgeCLIException):
+    """Exception thrown if the supervisor daemon can't be reached."""
+
+    def __init__(self: DaemonNotRunningException) -> None:
+        """Initialize DaemonNotRunningException."""
+        super().__init__("The xbridge-cli daemon is not running.")
@@ -0,0 +1,105 @@
+"""A click group that only imports its subcommands when they are used."""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import click
+
+# import path (`module:attribute`) and short help text for a lazily-loaded subcommand
+LazySubcommand = Tuple[str, str]
+
+
+class LazyGroup(click.Group):
+    """
+    A click group whose subcommands are imported by name, only when they are run.
+
+    The short help for each lazy subcommand is stored alongside its import path, so
+    that `--help` can list the subcommands without importing any of them.
+    """
+
+    def __init__(
+        self: LazyGroup,
+        *args: Any,  # noqa: ANN401
+        lazy_subcommands: Optional[Mapping[str, LazySubcommand]] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """
+        Initialize a LazyGroup.
+
+        Args:
+            args: The positional arguments for `click.Group`.
+            lazy_subcommands: A mapping from each subcommand name to the import path
+                (of the form `module:attribute`) and short help of the subcommand.
+            kwargs: The keyword arguments for `click.Group`.
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands: Dict[str, LazySubcommand] = dict(lazy_subcommands or {})
+
+    def list_commands(self: LazyGroup, ctx: click.Context) -> List[str]:
+        """
+        Get the names of all the subcommands, in sorted order.
+
+        Args:
+            ctx: The click context.
+
+        Returns:
+            The names of all the subcommands.
+        """
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(
+        self: LazyGroup, ctx: click.Context, cmd_name: str
+    ) -> Optional[click.Command]:
+        """
+        Get a subcommand by name, importing its module if needed.
+
+        Args:
+            ctx: The click context.
+            cmd_name: The name of the subcommand.
+
+        Returns:
+            The subcommand, if it exists. Else, None.
+        """
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self: LazyGroup, cmd_name: str) -> click.Command:
+        import_path, _ = self.lazy_subcommands[cmd_name]
+        module_name, attribute = import_path.split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise ValueError(f"{import_path} is not a click command.")
+        return command
+
+    def format_commands(
+        self: LazyGroup, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        """
+        Write the list of subcommands into the help, without importing them.
+
+        Args:
+            ctx: The click context.
+            formatter: The formatter the help is written to.
+        """
+        names = self.list_commands(ctx)
+        if len(names) == 0:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+
+        rows = []
+        for name in names:
+            if name in self.lazy_subcommands:
+                # a bare command with the same help, so it's shortened the same way
+                _, help_text = self.lazy_subcommands[name]
+                command: Optional[click.Command] = click.Command(name, help=help_text)
+            else:
+                command = self.get_command(ctx, name)
+            if command is None or command.hidden:
+                continue
+            rows.append((name, command.get_short_help_str(limit)))
+
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
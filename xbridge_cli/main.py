@@ -2,28 +2,50 @@
 
 import click
 
-from xbridge_cli.bridge import bridge
-from xbridge_cli.misc.explorer import launch_explorer
-from xbridge_cli.misc.fund import fund_account
-from xbridge_cli.misc.trust import set_trustline
-from xbridge_cli.server import server
+from xbridge_cli.lazy_group import LazyGroup
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
 
 
-@click.group(context_settings=CONTEXT_SETTINGS)
+@click.group(
+    cls=LazyGroup,
+    context_settings=CONTEXT_SETTINGS,
+    lazy_subcommands={
+        "server": (
+            "xbridge_cli.server:server",
+            "Subcommand for all commands dealing with rippled and witness servers.",
+        ),
+        "bridge": (
+            "xbridge_cli.bridge:bridge",
+            "Subcommand for all commands dealing with the bridge itself.",
+        ),
+        "fund": (
+            "xbridge_cli.misc.fund:fund_account",
+            "Of the form `xbridge-cli fund CHAIN ACCOUNT1 [ACCOUNT2 ...].",
+        ),
+        "daemon": (
+            "xbridge_cli.daemon:daemon",
+            "Subcommand for all commands dealing with the supervisor daemon.",
+        ),
+        "env": (
+            "xbridge_cli.env:env",
+            "Subcommand for all commands dealing with snapshots of the whole "
+            "environment.",
+        ),
+        "explorer": (
+            "xbridge_cli.misc.explorer:launch_explorer",
+            "Launch an Explorer connected to your nodes.",
+        ),
+        "trust": (
+            "xbridge_cli.misc.trust:set_trustline",
+            "Of the form `xbridge-cli trust CHAIN CURRENCY ACCOUNT1 [ACCOUNT2 ...].",
+        ),
+    },
+)
 def main() -> None:
     """The XBridge Command-Line Interface. Do everything with XRPL-XRPL bridges."""
     pass
 
 
-main.add_command(server)
-main.add_command(bridge)
-
-main.add_command(fund_account)
-main.add_command(launch_explorer)
-main.add_command(set_trustline)
-
-
 if __name__ == "__main__":
     main()
@@ -2,32 +2,56 @@
 
 import click
 
-from xbridge_cli.server.config import create_server_configs
-from xbridge_cli.server.list import list_servers
-from xbridge_cli.server.print import print_server_output
-from xbridge_cli.server.request import get_server_status, request_server
-from xbridge_cli.server.restart import restart_server
-from xbridge_cli.server.start import start_all_servers, start_server
-from xbridge_cli.server.stop import stop_server
-
-
-@click.group()
+from xbridge_cli.lazy_group import LazyGroup
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "start": (
+            "xbridge_cli.server.start:start_server",
+            "Start a standalone node of rippled or a witness node.",
+        ),
+        "start-all": (
+            "xbridge_cli.server.start:start_all_servers",
+            "Start all the servers (both rippled and witnesses) that have config "
+            "files in the config directory.",
+        ),
+        "stop": ("xbridge_cli.server.stop:stop_server", "Stop a rippled node(s)."),
+        "restart": (
+            "xbridge_cli.server.restart:restart_server",
+            "Restart a rippled or witness node(s).",
+        ),
+        "create-config": (
+            "xbridge_cli.server.config:create_server_configs",
+            "Subcommand for server config file generation.",
+        ),
+        "list": (
+            "xbridge_cli.server.list:list_servers",
+            "Get a list of running rippled nodes.",
+        ),
+        "print": (
+            "xbridge_cli.server.print:print_server_output",
+            "Print the stdout/stderr output of a server.",
+        ),
+        "status": (
+            "xbridge_cli.server.status:get_server_status",
+            "Get the status of a rippled or witness node(s).",
+        ),
+        "top": (
+            "xbridge_cli.server.top:top_servers",
+            "Show the CPU, memory, file descriptor, I/O, and thread usage of the "
+            "servers.",
+        ),
+        "request": (
+            "xbridge_cli.server.request:request_server",
+            "Send a command-line request to a rippled or witness node.",
+        ),
+    },
+)
 def server() -> None:
     """Subcommand for all commands dealing with rippled and witness servers."""
     pass
 
 
-server.add_command(start_server, name="start")
-server.add_command(start_all_servers, name="start-all")
-server.add_command(stop_server, name="stop")
-server.add_command(restart_server, name="restart")
-
-server.add_command(create_server_configs, name="create-config")
-
-server.add_command(list_servers, name="list")
-server.add_command(print_server_output, name="print")
-
-server.add_command(get_server_status, name="status")
-server.add_command(request_server, name="request")
-
 __all__ = ["server"]
@@ -7,6 +7,7 @@ from xbridge_cli.server.config.config import (
     generate_bootstrap,
     generate_witness_config,
 )
+from xbridge_cli.server.config.topology import generate_topology_configs
 
 
 @click.group(name="create-config")
@@ -18,5 +19,6 @@ def create_server_configs() -> None:
 create_server_configs.add_command(generate_all_configs, name="all")
 create_server_configs.add_command(generate_bootstrap, name="bootstrap")
 create_server_configs.add_command(generate_witness_config, name="witness")
+create_server_configs.add_command(generate_topology_configs, name="topology")
 
 __all__ = ["create_server_configs"]
@@ -2,24 +2,58 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from pprint import pformat
 from sys import platform
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 import click
 from jinja2 import Environment, FileSystemLoader
 from xrpl import CryptoAlgorithm
+from xrpl.core.keypairs import generate_seed
 from xrpl.wallet import Wallet
 
 from xbridge_cli.exceptions import XBridgeCLIException
-from xbridge_cli.server.config.ports import Ports
+from xbridge_cli.server.config.docker_network import (
+    DOCKER_PLATFORM,
+    LEGACY_IP_ADDRESSES,
+    DockerNetwork,
+    get_container_spec,
+    plan_docker_network,
+)
+from xbridge_cli.server.config.ports import Ports, allocate_ports
+from xbridge_cli.server.config.profiles import (
+    DEFAULT_RIPPLED_PROFILE,
+    DEFAULT_WITNESS_PROFILE,
+    RIPPLED_PROFILES,
+    WITNESS_PROFILES,
+    RippledProfile,
+    WitnessProfile,
+    get_rippled_profile,
+    get_witness_profile,
+    parse_server_profiles,
+    record_profiles,
+)
 from xbridge_cli.utils import CryptoAlgorithmChoice, CurrencyDict
+from xbridge_cli.utils.types import ServerData
 
 _GENESIS_SEED = "snoPBrXtMeMyMHUVTgbuqAfg1SUTb"
 
+# the HTTP port of a bridge's first witness, with the rest counting up from it
+FIRST_WITNESS_PORT = 6010
+
+# where the witnesses look for the chains in the shared Docker network of configs
+# generated without an environment's network
+_LEGACY_CHAIN_HOSTS = (
+    LEGACY_IP_ADDRESSES["locking_chain"],
+    LEGACY_IP_ADDRESSES["issuing_chain"],
+)
+
 _JINJA_ENV = Environment(
     loader=FileSystemLoader(
         searchpath=os.path.join(*os.path.split(__file__)[:-1], "templates")
@@ -38,20 +72,99 @@ def _get_currency(currency_str: str) -> CurrencyDict:
     return {"currency": currency_split[0], "issuer": currency_split[1]}
 
 
-# render a Jinja template and dump it into a file
+# render a Jinja template and dump it into a file, unless the file already has
+# exactly that content (so that unchanged files keep their modification times)
 def _generate_template(
     template_name: str, template_data: Dict[str, Any], filename: str
-) -> None:
+) -> bool:
     template = _JINJA_ENV.get_template(template_name)
+    rendered = template.render(template_data)
+
+    if os.path.isfile(filename):
+        with open(filename, "rb") as f:
+            existing_hash = hashlib.sha256(f.read()).digest()
+        if existing_hash == hashlib.sha256(rendered.encode()).digest():
+            return False
 
     with open(filename, "w+") as f:
-        f.write(template.render(template_data))
+        f.write(rendered)
+    return True
+
+
+def generate_docker_compose(config_dir: str, network: DockerNetwork) -> None:
+    """
+    Render an environment's `docker-compose.yml` file, from the same container specs
+    that the CLI starts the containers with.
 
+    Args:
+        config_dir: The environment's config folder.
+        network: The environment's Docker network.
+    """
+    config_files = {"rippled": "rippled.cfg", "witness": "witness.json"}
+    specs = [
+        get_container_spec(
+            cast(
+                ServerData,
+                {
+                    "name": name,
+                    "type": service.type,
+                    "config": os.path.join(
+                        config_dir, name, config_files[service.type]
+                    ),
+                },
+            )
+        )
+        for name, service in network.services.items()
+    ]
+    _generate_template(
+        "docker-compose.jinja",
+        {"specs": specs, "network": network, "platform": DOCKER_PLATFORM},
+        os.path.join(config_dir, "docker-compose.yml"),
+    )
 
-# generate a standalone rippled.cfg file
-def _generate_standalone_config(
-    *, ports: Ports, cfg_type: str, config_dir: str, docker: bool = False
+
+# the seeds in the witness and bootstrap files from a previous run, so that an
+# incremental run keeps the same keys (missing files are ignored)
+def _load_existing_seeds(
+    config_dir: str, witness_names: List[str], bootstrap_file: str
+) -> Dict[str, Any]:
+    seeds: Dict[str, Any] = {"witnesses": {}}
+    bootstrap_path = os.path.join(config_dir, bootstrap_file)
+    if os.path.isfile(bootstrap_path):
+        with open(bootstrap_path) as f:
+            bootstrap = json.load(f)
+        seeds["locking_door"] = bootstrap["LockingChain"]["DoorAccount"]["Seed"]
+        seeds["issuing_door"] = bootstrap["IssuingChain"]["DoorAccount"]["Seed"]
+    for name in witness_names:
+        witness_path = os.path.join(config_dir, name, "witness.json")
+        if os.path.isfile(witness_path):
+            with open(witness_path) as f:
+                witness = json.load(f)
+            seeds["witnesses"][name] = (
+                witness["LockingChain"]["TxnSubmit"]["SigningKeySeed"],
+                witness["SigningKeySeed"],
+            )
+    return seeds
+
+
+def generate_standalone_config(
+    *,
+    ports: Ports,
+    cfg_type: str,
+    config_dir: str,
+    docker: bool = False,
+    profile: RippledProfile = RIPPLED_PROFILES[DEFAULT_RIPPLED_PROFILE],
 ) -> None:
+    """
+    Generate a standalone rippled.cfg file, in its own folder in the config folder.
+
+    Args:
+        ports: The chain's ports.
+        cfg_type: The name of the chain, which is also the name of its folder.
+        config_dir: The directory to use for the config files.
+        docker: Whether the config file is for a docker setup.
+        profile: The performance profile of the chain.
+    """
     abs_config_dir = os.path.abspath(config_dir)
     if docker:
         sub_dir = "/etc/opt/ripple"
@@ -69,6 +182,7 @@ def _generate_standalone_config(
     template_data = {
         "sub_dir": sub_dir,
         "ports": ports.to_dict(),
+        "profile": profile,
     }
 
     # add the rippled.cfg file
@@ -79,34 +193,179 @@ def _generate_standalone_config(
     )
 
 
-def _generate_rippled_configs(config_dir: str, docker: bool = False) -> Tuple[int, int]:
+def _generate_rippled_configs(
+    config_dir: str,
+    docker: bool = False,
+    profiles: Optional[Dict[str, str]] = None,
+) -> Tuple[Ports, Ports]:
     """
     Generate the rippled config files.
 
     Args:
         config_dir: The directory to use for the config files.
         docker: Whether the config files are for a docker setup.
+        profiles: The name of the profile to use for each chain. Chains that aren't
+            included use the default profile.
 
     Returns:
-        The locking chain and issuing chain WS ports.
+        The locking chain and issuing chain ports.
     """
-    locking_ports = Ports.generate(0)
-    _generate_standalone_config(
-        ports=locking_ports,
-        cfg_type="locking_chain",
-        config_dir=config_dir,
-        docker=docker,
+    chain_profiles = {
+        chain: (profiles or {}).get(chain, DEFAULT_RIPPLED_PROFILE)
+        for chain in ["locking_chain", "issuing_chain"]
+    }
+    # check the names before anything is written
+    for name in chain_profiles.values():
+        get_rippled_profile(name)
+
+    locking_ports = Ports.allocate(config_dir, "locking_chain", 0)
+    issuing_ports = Ports.allocate(config_dir, "issuing_chain", 1)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(
+                generate_standalone_config,
+                ports=ports,
+                cfg_type=cfg_type,
+                config_dir=config_dir,
+                docker=docker,
+                profile=get_rippled_profile(chain_profiles[cfg_type]),
+            )
+            for ports, cfg_type in [
+                (locking_ports, "locking_chain"),
+                (issuing_ports, "issuing_chain"),
+            ]
+        ]
+    for future in futures:
+        future.result()
+    record_profiles(
+        config_dir,
+        "rippled",
+        {
+            chain: (name, get_rippled_profile(name))
+            for chain, name in chain_profiles.items()
+        },
     )
 
-    issuing_ports = Ports.generate(1)
-    _generate_standalone_config(
-        ports=issuing_ports,
-        cfg_type="issuing_chain",
-        config_dir=config_dir,
-        docker=docker,
+    return locking_ports, issuing_ports
+
+
+def _derive_address(seed: str, algorithm: CryptoAlgorithm) -> str:
+    # runs in a worker process
+    return Wallet.from_seed(seed, algorithm=algorithm).classic_address
+
+
+def _derive_addresses(keys: List[Tuple[str, CryptoAlgorithm]]) -> List[str]:
+    # deriving a keypair is slow in pure Python, so it's spread over all the CPUs
+    workers = min(len(keys), os.cpu_count() or 1)
+    if workers <= 1:
+        return [_derive_address(seed, algorithm) for seed, algorithm in keys]
+    seeds, algorithms = zip(*keys)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                _derive_address,
+                seeds,
+                algorithms,
+                chunksize=max(1, len(keys) // workers),
+            )
+        )
+
+
+# render a witness's witness.json file, replacing its folder
+def _write_witness_config(
+    *,
+    config_dir: str,
+    name: str,
+    locking_chain_port: int,
+    issuing_chain_port: int,
+    witness_port: int,
+    locking_reward_seed: str,
+    locking_reward_account: str,
+    issuing_reward_seed: str,
+    issuing_reward_account: str,
+    src_door: str,
+    signing_seed: str,
+    src_currency: str,
+    dst_door: str,
+    dst_currency: str,
+    is_docker: bool,
+    chain_hosts: Optional[Tuple[str, str]] = None,
+    profile: WitnessProfile = WITNESS_PROFILES[DEFAULT_WITNESS_PROFILE],
+    incremental: bool = False,
+    verbose: bool = False,
+) -> bool:
+    abs_config_dir = os.path.abspath(config_dir)
+    if is_docker:
+        if profile.data_dir is not None:
+            raise XBridgeCLIException(
+                "A separate witness data folder isn't supported with Docker."
+            )
+        sub_dir = "/opt/witness"
+        cfg_dir = os.path.join(abs_config_dir, name)
+    else:
+        sub_dir = os.path.join(abs_config_dir, name)
+        cfg_dir = sub_dir
+    # the DB and log are in the witness's folder, unless the profile moves them (the
+    # config folder's path is kept so that environments don't share a DB)
+    if profile.data_dir is None:
+        data_dir = sub_dir
+        host_data_dir = cfg_dir
+    else:
+        data_dir = os.path.join(profile.data_dir, abs_config_dir.lstrip(os.sep), name)
+        host_data_dir = data_dir
+
+    assert (src_currency == "XRP" and dst_currency == "XRP") or (
+        src_currency != "XRP" and dst_currency != "XRP"
     )
+    src_issue = _get_currency(src_currency)
+    dst_issue = _get_currency(dst_currency)
+    if "issuer" in dst_issue:
+        assert dst_issue["issuer"] == dst_door
+
+    for dirpath in [Path(cfg_dir), Path(host_data_dir, "db")]:
+        # an incremental run keeps the DB, so the witness doesn't have to resync
+        if dirpath.is_dir() and incremental:
+            continue
+        if dirpath.exists():
+            if dirpath.is_dir():
+                shutil.rmtree(dirpath)
+            else:
+                os.remove(dirpath)
+        dirpath.mkdir(parents=True)
 
-    return locking_ports.ws_public_port, issuing_ports.ws_public_port
+    log_file = os.path.join(data_dir, "witness.log")
+
+    template_data = {
+        "locking_chain_port": locking_chain_port,
+        "issuing_chain_port": issuing_chain_port,
+        "witness_port": witness_port,
+        "db_dir": os.path.join(data_dir, "db"),
+        "seed": signing_seed,
+        "locking_reward_seed": locking_reward_seed,
+        "locking_reward_account": locking_reward_account,
+        "issuing_reward_seed": issuing_reward_seed,
+        "issuing_reward_account": issuing_reward_account,
+        "src_door": src_door,
+        "src_issue": repr(src_issue).replace("'", '"'),
+        "dst_door": dst_door,
+        "dst_issue": repr(dst_issue).replace("'", '"'),
+        "is_linux": platform == "linux" or platform == "linux2",
+        "is_docker": is_docker,
+        "locking_chain_host": (chain_hosts or _LEGACY_CHAIN_HOSTS)[0],
+        "issuing_chain_host": (chain_hosts or _LEGACY_CHAIN_HOSTS)[1],
+        "log_file": log_file,
+        "profile": profile,
+    }
+
+    if verbose:
+        click.echo(template_data)
+
+    # add the witness.json file
+    return _generate_template(
+        "witness.jinja",
+        template_data,
+        os.path.join(cfg_dir, "witness.json"),
+    )
 
 
 @click.command(name="witness")
@@ -144,6 +403,24 @@ def _generate_rippled_configs(config_dir: str, docker: bool = False) -> Tuple[in
     type=int,
     help="The port used by the issuing chain.",
 )
+@click.option(
+    "--locking-host",
+    "locking_chain_host",
+    default=_LEGACY_CHAIN_HOSTS[0],
+    help=(
+        "The address of the locking chain in the Docker network. Only used with "
+        f"`--docker`. Defaults to {_LEGACY_CHAIN_HOSTS[0]}."
+    ),
+)
+@click.option(
+    "--issuing-host",
+    "issuing_chain_host",
+    default=_LEGACY_CHAIN_HOSTS[1],
+    help=(
+        "The address of the issuing chain in the Docker network. Only used with "
+        f"`--docker`. Defaults to {_LEGACY_CHAIN_HOSTS[1]}."
+    ),
+)
 @click.option(
     "--witness-port",
     "witness_port",
@@ -218,6 +495,23 @@ def _generate_rippled_configs(config_dir: str, docker: bool = False) -> Tuple[in
     prompt=True,
     help="The reward account for the witness on the issuing chain.",
 )
+@click.option(
+    "--profile",
+    "profile",
+    type=click.Choice(sorted(WITNESS_PROFILES)),
+    default=DEFAULT_WITNESS_PROFILE,
+    show_default=True,
+    help="The performance profile of the witness config.",
+)
+@click.option(
+    "--data-dir",
+    "data_dir",
+    type=click.Path(file_okay=False),
+    help=(
+        "The folder to put the witness's DB and log in (e.g. a tmpfs), instead of "
+        "the witness's config folder."
+    ),
+)
 @click.option(
     "-v",
     "--verbose",
@@ -240,6 +534,10 @@ def generate_witness_config(
     dst_door: str = "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh",
     dst_currency: str = "XRP",
     is_docker: bool = True,
+    locking_chain_host: str = _LEGACY_CHAIN_HOSTS[0],
+    issuing_chain_host: str = _LEGACY_CHAIN_HOSTS[1],
+    profile: str = DEFAULT_WITNESS_PROFILE,
+    data_dir: Optional[str] = None,
     verbose: bool = False,
 ) -> None:
     """
@@ -263,62 +561,35 @@ def generate_witness_config(
         issuing_reward_account: The reward account for the witness on the issuing chain.
         is_docker: Whether the config files are for a docker setup.
         issuing_reward_seed: The seed for the issuing chain reward account.
+        locking_chain_host: The address of the locking chain in the Docker network.
+        issuing_chain_host: The address of the issuing chain in the Docker network.
+        profile: The performance profile of the witness config.
+        data_dir: The folder to put the witness's DB and log in.
         verbose: Whether or not to print more verbose information.
     """  # noqa: D301
-    abs_config_dir = os.path.abspath(config_dir)
-    if is_docker:
-        sub_dir = "/opt/witness"
-        cfg_dir = os.path.join(abs_config_dir, name)
-    else:
-        sub_dir = os.path.join(abs_config_dir, name)
-        cfg_dir = sub_dir
-
-    assert (src_currency == "XRP" and dst_currency == "XRP") or (
-        src_currency != "XRP" and dst_currency != "XRP"
+    witness_profile = get_witness_profile(profile, data_dir)
+    _write_witness_config(
+        config_dir=config_dir,
+        name=name,
+        locking_chain_port=locking_chain_port,
+        issuing_chain_port=issuing_chain_port,
+        witness_port=witness_port,
+        locking_reward_seed=locking_reward_seed,
+        locking_reward_account=locking_reward_account,
+        issuing_reward_seed=issuing_reward_seed,
+        issuing_reward_account=issuing_reward_account,
+        src_door=src_door,
+        signing_seed=signing_seed,
+        src_currency=src_currency,
+        dst_door=dst_door,
+        dst_currency=dst_currency,
+        is_docker=is_docker,
+        chain_hosts=(locking_chain_host, issuing_chain_host),
+        profile=witness_profile,
+        verbose=verbose,
     )
-    src_issue = _get_currency(src_currency)
-    dst_issue = _get_currency(dst_currency)
-    if "issuer" in dst_issue:
-        assert dst_issue["issuer"] == dst_door
-
-    for path in ["", "/db"]:
-        dirpath = Path(cfg_dir + path)
-        if dirpath.exists():
-            if dirpath.is_dir():
-                shutil.rmtree(dirpath)
-            else:
-                os.remove(dirpath)
-        dirpath.mkdir(parents=True)
-
-    log_file = os.path.join(sub_dir, "witness.log")
-
-    template_data = {
-        "locking_chain_port": locking_chain_port,
-        "issuing_chain_port": issuing_chain_port,
-        "witness_port": witness_port,
-        "db_dir": os.path.join(sub_dir, "db"),
-        "seed": signing_seed,
-        "locking_reward_seed": locking_reward_seed,
-        "locking_reward_account": locking_reward_account,
-        "issuing_reward_seed": issuing_reward_seed,
-        "issuing_reward_account": issuing_reward_account,
-        "src_door": src_door,
-        "src_issue": repr(src_issue).replace("'", '"'),
-        "dst_door": dst_door,
-        "dst_issue": repr(dst_issue).replace("'", '"'),
-        "is_linux": platform == "linux" or platform == "linux2",
-        "is_docker": is_docker,
-        "log_file": log_file,
-    }
-
-    if verbose:
-        click.echo(template_data)
-
-    # add the witness.json file
-    _generate_template(
-        "witness.jinja",
-        template_data,
-        os.path.join(cfg_dir, "witness.json"),
+    record_profiles(
+        os.path.abspath(config_dir), "witness", {name: (profile, witness_profile)}
     )
 
 
@@ -373,6 +644,26 @@ def generate_witness_config(
         "of the form `{{currency}}.{{issue}}`."
     ),
 )
+@click.option(
+    "--file-name",
+    "file_name",
+    default="bridge_bootstrap.json",
+    help="The name of the bootstrap file. Defaults to `bridge_bootstrap.json`.",
+)
+@click.option(
+    "--locking-port",
+    "locking_port",
+    default=5005,
+    type=int,
+    help="The JSON-RPC port of the locking chain node. Defaults to 5005.",
+)
+@click.option(
+    "--issuing-port",
+    "issuing_port",
+    default=5006,
+    type=int,
+    help="The JSON-RPC port of the issuing chain node. Defaults to 5006.",
+)
 @click.option(
     "--reward-account",
     "reward_accounts",
@@ -405,6 +696,9 @@ def generate_bootstrap(
     signing_accounts: List[str],
     locking_algorithm: Optional[str] = None,
     issuing_algorithm: Optional[str] = None,
+    locking_port: int = 5005,
+    issuing_port: int = 5006,
+    file_name: str = "bridge_bootstrap.json",
     verbose: bool = False,
 ) -> None:
     """
@@ -422,6 +716,9 @@ def generate_bootstrap(
         issuing_algorithm: The algorithm used to generate the keypair from the issuing
             door seed.
         issuing_currency: The currency on the issuing chain.
+        locking_port: The JSON-RPC port of the locking chain node.
+        issuing_port: The JSON-RPC port of the issuing chain node.
+        file_name: The name of the bootstrap file.
         reward_accounts: The witness reward accounts (which need to be created).
         signing_accounts: The accounts the witness uses to sign attestations.
         verbose: Whether or not to print more verbose information.
@@ -449,14 +746,14 @@ def generate_bootstrap(
 
     template_data = {
         "is_linux": platform == "linux" or platform == "linux2",
-        "locking_node_port": 5005,
+        "locking_node_port": locking_port,
         "locking_door_account": locking_door.classic_address,
         "locking_door_seed": locking_door.seed,
         "locking_door_algo": locking_wallet_algo.value,
         "locking_issue": repr(locking_issue).replace("'", '"'),
         "locking_reward_accounts": reward_accounts,
         "locking_submit_accounts": reward_accounts,
-        "issuing_node_port": 5006,
+        "issuing_node_port": issuing_port,
         "issuing_door_account": issuing_door.classic_address,
         "issuing_door_seed": issuing_door.seed,
         "issuing_door_algo": issuing_wallet_algo.value,
@@ -471,7 +768,166 @@ def generate_bootstrap(
     _generate_template(
         "bootstrap.jinja",
         template_data,
-        os.path.join(config_dir, "bridge_bootstrap.json"),
+        os.path.join(config_dir, file_name),
+    )
+
+
+def generate_bridge_configs(
+    ctx: click.Context,
+    *,
+    config_dir: str,
+    witness_names: List[str],
+    currency: str,
+    locking_ports: Ports,
+    issuing_ports: Ports,
+    is_docker: bool = False,
+    chain_hosts: Optional[Tuple[str, str]] = None,
+    first_witness_port: int = FIRST_WITNESS_PORT,
+    bootstrap_file: str = "bridge_bootstrap.json",
+    witness_profile: str = DEFAULT_WITNESS_PROFILE,
+    witness_data_dir: Optional[str] = None,
+    incremental: bool = False,
+    verbose: bool = False,
+) -> None:
+    """
+    Generate the witness configs and bootstrap file for a bridge between two chains
+    whose configs have already been generated.
+
+    Args:
+        ctx: The click context.
+        config_dir: The directory to use for the config files.
+        witness_names: The names of the bridge's witnesses.
+        currency: The currency that is being transferred across the bridge.
+        locking_ports: The ports of the locking chain.
+        issuing_ports: The ports of the issuing chain.
+        is_docker: Whether the config files are for a docker setup.
+        chain_hosts: The addresses of the locking and issuing chains in the Docker
+            network.
+        first_witness_port: The port to prefer for the first witness.
+        bootstrap_file: The name of the bootstrap file.
+        witness_profile: The performance profile of the witness configs.
+        witness_data_dir: The folder to put the witnesses' DBs and logs in.
+        incremental: Whether to keep the existing keys and witness DBs, and only
+            rewrite the files that change.
+        verbose: Whether or not to print more verbose information.
+    """
+    num_witnesses = len(witness_names)
+    profile = get_witness_profile(witness_profile, witness_data_dir)
+    existing_seeds = (
+        _load_existing_seeds(config_dir, witness_names, bootstrap_file)
+        if incremental
+        else {"witnesses": {}}
+    )
+    witness_ports = allocate_ports(
+        config_dir,
+        [
+            (f"{name}/rpc_port", first_witness_port + i)
+            for i, name in enumerate(witness_names)
+        ],
+    )
+
+    # only the seeds are generated here; the accounts are all derived at once below
+    locking_seed = existing_seeds.get("locking_door") or generate_seed(
+        algorithm=CryptoAlgorithm.SECP256K1
+    )
+    if currency == "XRP":
+        locking_currency = "XRP"
+        issuing_seed = _GENESIS_SEED
+        issuing_algorithm = "secp256k1"
+    else:
+        assert currency.count(".") == 1
+        locking_currency = currency
+        issuing_seed = existing_seeds.get("issuing_door", _GENESIS_SEED)
+        # the previous bridge may have been an XRP one, with the genesis account
+        if issuing_seed == _GENESIS_SEED:
+            issuing_seed = generate_seed(algorithm=CryptoAlgorithm.ED25519)
+        issuing_algorithm = "ed25519"
+
+    # the witnesses' keys are ed25519 keys derived from secp256k1-encoded seeds
+    reward_seeds = [
+        (
+            existing_seeds["witnesses"][name][0]
+            if name in existing_seeds["witnesses"]
+            else generate_seed(algorithm=CryptoAlgorithm.SECP256K1)
+        )
+        for name in witness_names
+    ]
+    signing_seeds = [
+        (
+            existing_seeds["witnesses"][name][1]
+            if name in existing_seeds["witnesses"]
+            else generate_seed(algorithm=CryptoAlgorithm.SECP256K1)
+        )
+        for name in witness_names
+    ]
+    addresses = _derive_addresses(
+        [
+            (locking_seed, CryptoAlgorithm.SECP256K1),
+            (issuing_seed, CryptoAlgorithm(issuing_algorithm)),
+            *((seed, CryptoAlgorithm.ED25519) for seed in reward_seeds),
+            *((seed, CryptoAlgorithm.ED25519) for seed in signing_seeds),
+        ]
+    )
+    locking_door, issuing_door = addresses[:2]
+    reward_accounts = addresses[2 : 2 + num_witnesses]
+    signing_accounts = addresses[2 + num_witnesses :]
+
+    if currency == "XRP":
+        issuing_currency = "XRP"
+    else:
+        currency_code, _issuer = currency.split(".")
+        issuing_currency = f"{currency_code}.{issuing_door}"
+
+    # the witness folders are written all at once
+    with ThreadPoolExecutor(max_workers=max(num_witnesses, 1)) as executor:
+        futures = [
+            executor.submit(
+                _write_witness_config,
+                config_dir=config_dir,
+                name=witness_names[i],
+                locking_chain_port=locking_ports.ws_public_port,
+                issuing_chain_port=issuing_ports.ws_public_port,
+                witness_port=witness_ports[i],
+                signing_seed=signing_seeds[i],
+                src_door=locking_door,
+                src_currency=locking_currency,
+                dst_door=issuing_door,
+                dst_currency=issuing_currency,
+                locking_reward_seed=reward_seeds[i],
+                locking_reward_account=reward_accounts[i],
+                issuing_reward_seed=reward_seeds[i],
+                issuing_reward_account=reward_accounts[i],
+                is_docker=is_docker,
+                chain_hosts=chain_hosts,
+                profile=profile,
+                incremental=incremental,
+            )
+            for i in range(num_witnesses)
+        ]
+    rewritten = sum(future.result() for future in futures)
+    if verbose:
+        click.echo(f"Rewrote {rewritten} of {num_witnesses} witness configs")
+    record_profiles(
+        config_dir,
+        "witness",
+        {name: (witness_profile, profile) for name in witness_names},
+    )
+
+    ctx.invoke(
+        generate_bootstrap,
+        config_dir=config_dir,
+        locking_seed=locking_seed,
+        locking_algorithm="secp256k1",
+        locking_currency=locking_currency,
+        issuing_seed=issuing_seed,
+        issuing_algorithm=issuing_algorithm,
+        issuing_currency=issuing_currency,
+        locking_port=locking_ports.http_admin_port,
+        issuing_port=issuing_ports.http_admin_port,
+        verbose=verbose,
+        reward_accounts=reward_accounts,
+        signing_accounts=signing_accounts,
+        file_name=bootstrap_file,
     )
 
 
@@ -506,6 +962,49 @@ def generate_bootstrap(
     is_flag=True,
     help="Whether the config files are for a docker setup.",
 )
+@click.option(
+    "--rippled-profile",
+    "rippled_profile",
+    type=click.Choice(sorted(RIPPLED_PROFILES)),
+    default=DEFAULT_RIPPLED_PROFILE,
+    show_default=True,
+    help="The performance profile of the rippled configs.",
+)
+@click.option(
+    "--chain-profile",
+    "chain_profiles",
+    multiple=True,
+    help=(
+        "The performance profile of one chain, as `CHAIN=PROFILE`, where PROFILE "
+        f"is one of {', '.join(sorted(RIPPLED_PROFILES))}. Overrides "
+        "`--rippled-profile`."
+    ),
+)
+@click.option(
+    "--witness-profile",
+    "witness_profile",
+    type=click.Choice(sorted(WITNESS_PROFILES)),
+    default=DEFAULT_WITNESS_PROFILE,
+    show_default=True,
+    help="The performance profile of all the witness configs.",
+)
+@click.option(
+    "--witness-data-dir",
+    "witness_data_dir",
+    type=click.Path(file_okay=False),
+    help=(
+        "The folder to put the witnesses' DBs and logs in (e.g. a tmpfs), instead "
+        "of the witnesses' config folders."
+    ),
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=(
+        "Keep the existing keys and witness DBs, and only rewrite the files whose "
+        "contents change. Otherwise, everything is regenerated from scratch."
+    ),
+)
 @click.option(
     "-v",
     "--verbose",
@@ -519,6 +1018,11 @@ def generate_all_configs(
     num_witnesses: int = 5,
     currency: str = "XRP",
     is_docker: bool = False,
+    rippled_profile: str = DEFAULT_RIPPLED_PROFILE,
+    chain_profiles: Tuple[str, ...] = (),
+    witness_profile: str = DEFAULT_WITNESS_PROFILE,
+    witness_data_dir: Optional[str] = None,
+    incremental: bool = False,
     verbose: bool = False,
 ) -> None:
     """
@@ -530,81 +1034,61 @@ def generate_all_configs(
         num_witnesses: The number of witnesses configs to generate.
         currency: The currency that is being transferred across the bridge.
         is_docker: Whether the config files are for a docker setup.
+        rippled_profile: The performance profile of the rippled configs.
+        chain_profiles: The performance profiles of individual chains, as
+            `CHAIN=PROFILE`.
+        witness_profile: The performance profile of the witness configs.
+        witness_data_dir: The folder to put the witnesses' DBs and logs in.
+        incremental: Whether to keep the existing keys and witness DBs, and only
+            rewrite the files that change.
         verbose: Whether or not to print more verbose information.
-
-    Raises:
-        XBridgeCLIException: If something really weird goes wrong.
     """
     # TODO: add support for external networks
     abs_config_dir = os.path.abspath(config_dir)
 
-    locking_port, issuing_port = _generate_rippled_configs(abs_config_dir, is_docker)
-    locking_door = Wallet.create(algorithm=CryptoAlgorithm.SECP256K1)
-
-    if currency == "XRP":
-        locking_currency = "XRP"
-        issuing_currency = "XRP"
-        issuing_door = Wallet.from_seed(
-            _GENESIS_SEED, algorithm=CryptoAlgorithm.SECP256K1
-        )
-        issuing_algorithm = "secp256k1"
-    else:
-        assert currency.count(".") == 1
-        currency_code, _issuer = currency.split(".")
-        locking_currency = currency
-        issuing_door = Wallet.create()
-        issuing_algorithm = "ed25519"
-        issuing_currency = f"{currency_code}.{issuing_door.classic_address}"
-
-    reward_accounts = []
-    signing_accounts = []
-    for i in range(num_witnesses):
-        original_wallet = Wallet.create(algorithm=CryptoAlgorithm.SECP256K1)
-        if original_wallet.seed is None:
-            raise XBridgeCLIException(
-                "Something weird happened, the wallet should have a seed"
-            )
-        witness_reward_wallet = Wallet.from_seed(
-            original_wallet.seed, algorithm=CryptoAlgorithm.ED25519
-        )
-        reward_accounts.append(witness_reward_wallet.classic_address)
-        wallet = Wallet.create(algorithm=CryptoAlgorithm.SECP256K1)
-        if wallet.seed is None:
-            raise XBridgeCLIException(
-                "Something weird happened, the wallet should have a seed"
-            )
-        signing_wallet = Wallet.from_seed(
-            wallet.seed, algorithm=CryptoAlgorithm.ED25519
+    profiles = {
+        "locking_chain": rippled_profile,
+        "issuing_chain": rippled_profile,
+        **parse_server_profiles(chain_profiles),
+    }
+    witness_names = [f"witness{i}" for i in range(num_witnesses)]
+    network = None
+    chain_hosts = None
+    if is_docker:
+        network = plan_docker_network(
+            abs_config_dir,
+            [
+                *(
+                    (chain, "rippled", get_rippled_profile(profiles[chain]))
+                    for chain in ["locking_chain", "issuing_chain"]
+                ),
+                *(
+                    (name, "witness", get_witness_profile(witness_profile))
+                    for name in witness_names
+                ),
+            ],
         )
-        signing_accounts.append(signing_wallet.classic_address)
-        ctx.invoke(
-            generate_witness_config,
-            config_dir=abs_config_dir,
-            name=f"witness{i}",
-            locking_chain_port=locking_port,
-            issuing_chain_port=issuing_port,
-            witness_port=6010 + i,
-            signing_seed=signing_wallet.seed,
-            src_door=locking_door.classic_address,
-            src_currency=locking_currency,
-            dst_door=issuing_door.classic_address,
-            dst_currency=issuing_currency,
-            locking_reward_seed=witness_reward_wallet.seed,
-            locking_reward_account=witness_reward_wallet.classic_address,
-            issuing_reward_seed=witness_reward_wallet.seed,
-            issuing_reward_account=witness_reward_wallet.classic_address,
-            is_docker=is_docker,
+        chain_hosts = (
+            network.services["locking_chain"].ip_address,
+            network.services["issuing_chain"].ip_address,
         )
-    ctx.invoke(
-        generate_bootstrap,
+
+    locking_ports, issuing_ports = _generate_rippled_configs(
+        abs_config_dir, is_docker, profiles
+    )
+    generate_bridge_configs(
+        ctx,
         config_dir=abs_config_dir,
-        locking_seed=locking_door.seed,
-        locking_algorithm="secp256k1",
-        locking_currency=locking_currency,
-        issuing_seed=issuing_door.seed,
-        issuing_algorithm=issuing_algorithm,
-        issuing_currency=issuing_currency,
+        witness_names=witness_names,
+        currency=currency,
+        locking_ports=locking_ports,
+        issuing_ports=issuing_ports,
+        is_docker=is_docker,
+        chain_hosts=chain_hosts,
+        witness_profile=witness_profile,
+        witness_data_dir=witness_data_dir,
+        incremental=incremental,
         verbose=verbose,
-        reward_accounts=reward_accounts,
-        signing_accounts=signing_accounts,
     )
+    if network is not None:
+        generate_docker_compose(abs_config_dir, network)
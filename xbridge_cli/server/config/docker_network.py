@@ -0,0 +1,266 @@
+"""The Docker network of an environment, and the containers of its servers."""
+
+from __future__ import annotations
+
+import ipaddress
+import json
+import os
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from xbridge_cli.exceptions import XBridgeCLIException
+from xbridge_cli.server.config.profiles import (
+    RippledProfile,
+    WitnessProfile,
+    load_environment,
+    update_environment,
+)
+from xbridge_cli.utils import RippledConfig, get_state_store
+from xbridge_cli.utils.types import ServerData
+
+RIPPLED_IMAGE = "rippleci/rippled:2.0.0-b4"
+WITNESS_IMAGE = "rippleci/xbwd"
+DOCKER_PLATFORM = "linux/amd64"
+
+# the key of the network in the environment's `environment.json` file
+_ENVIRONMENT_KEY = "docker"
+
+# each environment gets its own /22 (room for 1021 containers) out of 10.176.0.0/12
+_SUBNET_POOL = ipaddress.ip_network("10.176.0.0/12")
+_SUBNET_PREFIX = 22
+_NUM_SUBNETS = 2 ** (_SUBNET_PREFIX - _SUBNET_POOL.prefixlen)
+
+# configs generated before the networks were per-environment all share one network,
+# with the addresses that the witness configs point at
+_LEGACY_NETWORK = "bridge-net"
+_LEGACY_SUBNET = "192.168.176.0/20"
+_LEGACY_GATEWAY = "192.168.176.1"
+LEGACY_IP_ADDRESSES = {
+    "locking_chain": "192.168.176.2",
+    "issuing_chain": "192.168.176.3",
+}
+_LEGACY_WITNESS_IP_BASE = "192.168.176."
+_LEGACY_FIRST_WITNESS_IP = 4
+
+
+@dataclass
+class DockerService:
+    """A server's container in an environment's Docker network."""
+
+    type: str
+    ip_address: str
+    cpus: Optional[float] = None
+    memory: Optional[str] = None
+
+
+@dataclass
+class DockerNetwork:
+    """An environment's Docker network, and the containers of its servers."""
+
+    name: str
+    subnet: str
+    gateway: str
+    services: Dict[str, DockerService]
+
+    @classmethod
+    def from_dict(cls: Type[DockerNetwork], data: Dict[str, Any]) -> DockerNetwork:
+        """
+        Load a DockerNetwork from its dictionary form.
+
+        Args:
+            data: The dictionary form of the network.
+
+        Returns:
+            The network.
+        """
+        return cls(
+            name=data["name"],
+            subnet=data["subnet"],
+            gateway=data["gateway"],
+            services={
+                name: DockerService(**service)
+                for name, service in data["services"].items()
+            },
+        )
+
+
+@dataclass
+class ContainerSpec:
+    """Everything needed to create the container for a server."""
+
+    name: str
+    image: str
+    command: List[str]
+    config_dir: str
+    mount_point: str
+    ports: List[int]
+    ip_address: Optional[str]
+    network: str = _LEGACY_NETWORK
+    subnet: str = _LEGACY_SUBNET
+    gateway: str = _LEGACY_GATEWAY
+    cpus: Optional[float] = None
+    memory: Optional[str] = None
+
+
+def _release_stale_subnets() -> None:
+    # the subnets of environments whose config folders have been deleted
+    store = get_state_store()
+    for owner in store.get_subnets().values():
+        if not os.path.isdir(owner):
+            store.remove_subnets(owner)
+
+
+def plan_docker_network(
+    config_dir: str,
+    services: Sequence[Tuple[str, str, Union[RippledProfile, WitnessProfile]]],
+) -> DockerNetwork:
+    """
+    Allocate a subnet for an environment's Docker network, and give each of its
+    servers an address in it. The network is recorded in the environment's
+    `environment.json` file. Regenerating the configs for the same environment gets
+    the same subnet back.
+
+    Args:
+        config_dir: The environment's config folder.
+        services: The name (i.e. folder name) and type of each server, and the
+            profile with its container's resource limits. The chains should come
+            first, so that their addresses don't change with the number of witnesses.
+
+    Returns:
+        The environment's network.
+
+    Raises:
+        XBridgeCLIException: If there are no free subnets left, or too many servers
+            for one subnet.
+    """
+    abs_config_dir = os.path.abspath(config_dir)
+    os.makedirs(abs_config_dir, exist_ok=True)
+    _release_stale_subnets()
+    try:
+        index = get_state_store().allocate_subnet(abs_config_dir, _NUM_SUBNETS)
+    except ValueError as e:
+        raise XBridgeCLIException(str(e))
+    subnet = ipaddress.ip_network(
+        (
+            int(_SUBNET_POOL.network_address) + index * 2 ** (32 - _SUBNET_PREFIX),
+            _SUBNET_PREFIX,
+        )
+    )
+    gateway, *addresses = subnet.hosts()
+    if len(services) > len(addresses):
+        raise XBridgeCLIException(
+            f"Too many servers for one Docker network ({len(services)})."
+        )
+
+    network = DockerNetwork(
+        # the name is unique on the host, like the subnet
+        name=f"xbridge-net-{index}",
+        subnet=str(subnet),
+        gateway=str(gateway),
+        services={
+            name: DockerService(
+                type=server_type,
+                ip_address=str(address),
+                cpus=profile.cpus,
+                memory=profile.memory,
+            )
+            for (name, server_type, profile), address in zip(services, addresses)
+        },
+    )
+    update_environment(abs_config_dir, _ENVIRONMENT_KEY, asdict(network))
+    return network
+
+
+def load_docker_network(config_dir: str) -> Optional[DockerNetwork]:
+    """
+    Load an environment's Docker network.
+
+    Args:
+        config_dir: The environment's config folder.
+
+    Returns:
+        The environment's network, or `None` if its configs weren't generated with
+        one.
+    """
+    environment = load_environment(config_dir)
+    if _ENVIRONMENT_KEY not in environment:
+        return None
+    return DockerNetwork.from_dict(environment[_ENVIRONMENT_KEY])
+
+
+def _get_legacy_ip_address(name: str) -> Optional[str]:
+    if name in LEGACY_IP_ADDRESSES:
+        return LEGACY_IP_ADDRESSES[name]
+    if name.startswith("witness") and name[len("witness") :].isdigit():
+        witness_index = int(name[len("witness") :])
+        return f"{_LEGACY_WITNESS_IP_BASE}{_LEGACY_FIRST_WITNESS_IP + witness_index}"
+    # let Docker pick one
+    return None
+
+
+def get_container_spec(server: ServerData, load: bool = False) -> ContainerSpec:
+    """
+    Get the container spec for a server, based on its config file and its
+    environment's Docker network.
+
+    Args:
+        server: The server.
+        load: Whether rippled should start from the ledger in its database, instead
+            of a new one.
+
+    Returns:
+        The spec for the server's container.
+    """
+    config_dir = os.path.dirname(server["config"])
+    if server["type"] == "rippled":
+        config = RippledConfig(file_name=server["config"])
+        spec = ContainerSpec(
+            name=server["name"],
+            image=RIPPLED_IMAGE,
+            command=[
+                "/opt/ripple/bin/rippled",
+                "--conf",
+                "/etc/opt/ripple/rippled.cfg",
+                "-a",
+                *(["--load"] if load else []),
+            ],
+            config_dir=config_dir,
+            mount_point="/etc/opt/ripple/",
+            ports=[
+                int(config.port_rpc_admin_local["port"]),
+                int(config.port_ws_public["port"]),
+                int(config.port_ws_admin_local["port"]),
+            ],
+            ip_address=_get_legacy_ip_address(server["name"]),
+        )
+    else:
+        with open(server["config"]) as f:
+            witness_config = json.load(f)
+        spec = ContainerSpec(
+            name=server["name"],
+            image=WITNESS_IMAGE,
+            command=[
+                "/opt/xbwd/bin/xbridge_witnessd",
+                "--conf",
+                "/opt/witness/witness.json",
+            ],
+            config_dir=config_dir,
+            mount_point="/opt/witness/",
+            ports=[int(witness_config["RPCEndpoint"]["Port"])],
+            ip_address=_get_legacy_ip_address(server["name"]),
+        )
+
+    # the server folders are in the environment's config folder
+    network = load_docker_network(os.path.dirname(config_dir))
+    if network is None or os.path.basename(config_dir) not in network.services:
+        return spec
+    service = network.services[os.path.basename(config_dir)]
+    return replace(
+        spec,
+        ip_address=service.ip_address,
+        network=network.name,
+        subnet=network.subnet,
+        gateway=network.gateway,
+        cpus=service.cpus,
+        memory=service.memory,
+    )
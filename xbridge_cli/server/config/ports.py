@@ -2,7 +2,68 @@
 
 from __future__ import annotations
 
-from typing import Dict, Type
+import os
+import socket
+from typing import Dict, List, Sequence, Tuple, Type
+
+from xbridge_cli.exceptions import XBridgeCLIException
+from xbridge_cli.utils import get_state_store
+
+# where to look for ports once the default ones are taken (e.g. by another
+# environment), below the OS's ephemeral range
+_DYNAMIC_PORT_START = 20000
+
+_ROLES = ["peer_port", "http_admin_port", "ws_public_port", "ws_admin_port"]
+
+
+def _is_port_free(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("", port))
+        except OSError:
+            return False
+    return True
+
+
+def _release_stale_ports() -> None:
+    # the ports of environments whose config folders have been deleted
+    store = get_state_store()
+    for owner in set(store.get_ports().values()):
+        # the owners are of the form CONFIG_DIR/SERVER/ROLE
+        if not os.path.isdir(os.path.dirname(os.path.dirname(owner))):
+            store.remove_ports(owner)
+
+
+def allocate_ports(config_dir: str, requests: Sequence[Tuple[str, int]]) -> List[int]:
+    """
+    Allocate ports for the servers in an environment. Each port is checked against
+    the ports already handed out to other environments and against the sockets
+    open on the host, and is recorded in the CLI state. Regenerating the configs
+    for the same environment gets the same ports back.
+
+    Args:
+        config_dir: The environment's config folder.
+        requests: The name of each port (of the form `SERVER/ROLE`), and the port it
+            should get if it's free.
+
+    Returns:
+        The allocated ports, in the same order.
+
+    Raises:
+        XBridgeCLIException: If there are no free ports left.
+    """
+    abs_config_dir = os.path.abspath(config_dir)
+    # the folder marks the ports as in use until it's deleted
+    os.makedirs(abs_config_dir, exist_ok=True)
+    _release_stale_ports()
+    try:
+        return get_state_store().allocate_ports(
+            [(os.path.join(abs_config_dir, name), port) for name, port in requests],
+            _is_port_free,
+            _DYNAMIC_PORT_START,
+        )
+    except ValueError as e:
+        raise XBridgeCLIException(str(e))
 
 
 class Ports:
@@ -12,8 +73,6 @@ class Ports:
     at the same time without interfering with each other.
     """
 
-    # TODO: somehow keep track of ports in the CLI config file
-
     peer_port_base = 51235
     http_admin_port_base = 5005
     ws_public_port_base = 6005
@@ -59,6 +118,26 @@ class Ports:
             Ports.ws_public_port_base + (2 * cfg_index) + 1,
         )
 
+    @classmethod
+    def allocate(cls: Type[Ports], config_dir: str, name: str, cfg_index: int) -> Ports:
+        """
+        Allocate a Ports for a server, preferring the ports `generate` would give it.
+
+        Args:
+            config_dir: The environment's config folder.
+            name: The name of the server.
+            cfg_index: The config index of the ports to prefer.
+
+        Returns:
+            A Ports with free ports that are recorded in the CLI state.
+        """
+        preferred = cls.generate(cfg_index).to_dict()
+        return cls(
+            *allocate_ports(
+                config_dir, [(f"{name}/{role}", preferred[role]) for role in _ROLES]
+            )
+        )
+
     def to_dict(self: Ports) -> Dict[str, int]:
         """
         Convert the Ports to a dictionary.
@@ -0,0 +1,211 @@
+"""Named sets of performance settings for the generated server configs."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, Optional, Tuple, cast
+
+from xbridge_cli.exceptions import XBridgeCLIException
+
+# records the profiles each server's config was generated with, so that benchmark
+# results can be reproduced
+_ENVIRONMENT_FILE = "environment.json"
+
+
+@dataclass(frozen=True)
+class RippledProfile:
+    """The performance-related settings of a generated rippled.cfg file."""
+
+    node_size: str
+    node_db_type: str
+    cache_mb: int
+    online_delete: Optional[int]
+    ledger_history: str
+    transaction_queue: Dict[str, int] = field(default_factory=dict)
+    # the limits of the server's Docker container
+    cpus: Optional[float] = None
+    memory: Optional[str] = None
+
+
+RIPPLED_PROFILES: Dict[str, RippledProfile] = {
+    # what the CLI has always generated
+    "default": RippledProfile(
+        node_size="medium",
+        node_db_type="NuDB",
+        cache_mb=256,
+        online_delete=256,
+        ledger_history="256",
+    ),
+    # throwaway chains for load tests: everything in memory, big caches, no
+    # history, and a transaction queue that doesn't turn transactions away
+    "benchmark": RippledProfile(
+        node_size="huge",
+        node_db_type="Memory",
+        cache_mb=1024,
+        online_delete=None,
+        ledger_history="none",
+        transaction_queue={
+            "ledgers_in_queue": 100,
+            "minimum_txn_in_ledger_standalone": 5000,
+            "target_txn_in_ledger": 5000,
+            "maximum_txn_per_account": 1000,
+        },
+    ),
+    # as little memory as possible, e.g. for many chains on one host
+    "small": RippledProfile(
+        node_size="tiny",
+        node_db_type="NuDB",
+        cache_mb=32,
+        online_delete=256,
+        ledger_history="none",
+        cpus=1.0,
+        memory="1g",
+    ),
+}
+DEFAULT_RIPPLED_PROFILE = "default"
+
+
+@dataclass(frozen=True)
+class WitnessProfile:
+    """The performance-related settings of a generated witness.json file."""
+
+    log_level: str
+    # where the witnesses' DB and log go (e.g. a tmpfs), instead of their folders
+    data_dir: Optional[str] = None
+    # the limits of the witness's Docker container
+    cpus: Optional[float] = None
+    memory: Optional[str] = None
+
+
+WITNESS_PROFILES: Dict[str, WitnessProfile] = {
+    # what the CLI has always generated
+    "default": WitnessProfile(log_level="Trace"),
+    # under load, Trace logging alone can be most of a witness's I/O
+    "benchmark": WitnessProfile(log_level="Warning"),
+    # many witnesses on one host
+    "small": WitnessProfile(log_level="Warning", cpus=0.5, memory="256m"),
+}
+DEFAULT_WITNESS_PROFILE = "default"
+
+
+def parse_server_profiles(values: Tuple[str, ...]) -> Dict[str, str]:
+    """
+    Parse `SERVER=PROFILE` pairs from the command line.
+
+    Args:
+        values: The pairs.
+
+    Returns:
+        A mapping from each server name to its profile name.
+
+    Raises:
+        XBridgeCLIException: If a pair is malformed.
+    """
+    profiles = {}
+    for value in values:
+        if value.count("=") != 1:
+            raise XBridgeCLIException(
+                f"Invalid profile `{value}`: must be of the form `SERVER=PROFILE`."
+            )
+        server, profile = value.split("=")
+        profiles[server] = profile
+    return profiles
+
+
+def get_rippled_profile(name: str) -> RippledProfile:
+    """
+    Get a rippled profile by name.
+
+    Args:
+        name: The name of the profile.
+
+    Returns:
+        The profile.
+
+    Raises:
+        XBridgeCLIException: If there is no profile with that name.
+    """
+    if name not in RIPPLED_PROFILES:
+        raise XBridgeCLIException(
+            f"Unknown rippled profile `{name}`. The profiles are: "
+            f"{', '.join(RIPPLED_PROFILES)}."
+        )
+    return RIPPLED_PROFILES[name]
+
+
+def get_witness_profile(name: str, data_dir: Optional[str] = None) -> WitnessProfile:
+    """
+    Get a witness profile by name.
+
+    Args:
+        name: The name of the profile.
+        data_dir: The folder to put the witnesses' DBs and logs in, instead of the
+            profile's.
+
+    Returns:
+        The profile.
+
+    Raises:
+        XBridgeCLIException: If there is no profile with that name.
+    """
+    if name not in WITNESS_PROFILES:
+        raise XBridgeCLIException(
+            f"Unknown witness profile `{name}`. The profiles are: "
+            f"{', '.join(WITNESS_PROFILES)}."
+        )
+    profile = WITNESS_PROFILES[name]
+    if data_dir is not None:
+        profile = replace(profile, data_dir=os.path.abspath(data_dir))
+    return profile
+
+
+def load_environment(config_dir: str) -> Dict[str, Any]:
+    """
+    Load an environment's `environment.json` file.
+
+    Args:
+        config_dir: The environment's config folder.
+
+    Returns:
+        The contents of the file, or an empty dictionary if there isn't one.
+    """
+    file_name = os.path.join(config_dir, _ENVIRONMENT_FILE)
+    if not os.path.exists(file_name):
+        return {}
+    with open(file_name) as f:
+        return cast(Dict[str, Any], json.load(f))
+
+
+def update_environment(config_dir: str, key: str, value: Dict[str, Any]) -> None:
+    """
+    Set one key of an environment's `environment.json` file, keeping the rest.
+
+    Args:
+        config_dir: The environment's config folder.
+        key: The key to set.
+        value: The value to set it to. Must be JSON-serializable.
+    """
+    environment = load_environment(config_dir)
+    environment[key] = value
+    with open(os.path.join(config_dir, _ENVIRONMENT_FILE), "w") as f:
+        json.dump(environment, f, indent=4)
+
+
+def record_profiles(config_dir: str, kind: str, profiles: Dict[str, Any]) -> None:
+    """
+    Record the profiles that servers' configs were generated with, in the
+    environment's `environment.json` file.
+
+    Args:
+        config_dir: The environment's config folder.
+        kind: The kind of servers (e.g. `rippled`).
+        profiles: A mapping from each server name to the name of its profile and the
+            profile itself.
+    """
+    key = f"{kind}_profiles"
+    recorded = load_environment(config_dir).get(key, {})
+    for server, (name, profile) in profiles.items():
+        recorded[server] = {"name": name, "settings": asdict(profile)}
+    update_environment(config_dir, key, recorded)
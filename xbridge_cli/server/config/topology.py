@@ -0,0 +1,271 @@
+"""Generate the config files for several chains and bridges at once."""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import click
+
+from xbridge_cli.exceptions import XBridgeCLIException
+from xbridge_cli.server.config.config import (
+    FIRST_WITNESS_PORT,
+    generate_bridge_configs,
+    generate_docker_compose,
+    generate_standalone_config,
+)
+from xbridge_cli.server.config.docker_network import plan_docker_network
+from xbridge_cli.server.config.ports import Ports
+from xbridge_cli.server.config.profiles import (
+    DEFAULT_RIPPLED_PROFILE,
+    DEFAULT_WITNESS_PROFILE,
+    get_rippled_profile,
+    get_witness_profile,
+    record_profiles,
+)
+
+_DEFAULT_NUM_WITNESSES = 5
+
+
+def _load_topology(topology_file: str) -> Dict[str, Any]:
+    # {
+    #   "profile": "default",
+    #   "witness_profile": "default",
+    #   "chains": ["hub", {"name": "side0", "profile": "benchmark"}, ...],
+    #   "bridges": [
+    #     {"name": "bridge0", "locking_chain": "hub", "issuing_chain": "side0",
+    #      "witnesses": 5, "currency": "XRP"},
+    #     ...
+    #   ]
+    # }
+    try:
+        with open(topology_file) as f:
+            topology = json.load(f)
+        default_profile = topology.get("profile", DEFAULT_RIPPLED_PROFILE)
+        witness_profile = topology.get("witness_profile", DEFAULT_WITNESS_PROFILE)
+        # a chain is either just a name, or an object with its name and profile
+        chains = [
+            chain["name"] if isinstance(chain, dict) else chain
+            for chain in topology["chains"]
+        ]
+        profiles = {
+            name: (
+                chain.get("profile", default_profile)
+                if isinstance(chain, dict)
+                else default_profile
+            )
+            for name, chain in zip(chains, topology["chains"])
+        }
+        bridges = [
+            {
+                "name": bridge["name"],
+                "locking_chain": bridge["locking_chain"],
+                "issuing_chain": bridge["issuing_chain"],
+                "witnesses": int(bridge.get("witnesses", _DEFAULT_NUM_WITNESSES)),
+                "currency": bridge.get("currency", "XRP"),
+            }
+            for bridge in topology["bridges"]
+        ]
+    except (ValueError, KeyError, TypeError) as e:
+        raise XBridgeCLIException(f"Invalid topology file: {e}")
+
+    for profile in profiles.values():
+        get_rippled_profile(profile)
+    get_witness_profile(witness_profile)
+    names = [*chains, *(bridge["name"] for bridge in bridges)]
+    if len(set(names)) != len(names):
+        raise XBridgeCLIException("The chain and bridge names must all be different.")
+    xrp_issuing_chains = set()
+    for bridge in bridges:
+        for side in ["locking_chain", "issuing_chain"]:
+            if bridge[side] not in chains:
+                raise XBridgeCLIException(
+                    f"Bridge {bridge['name']} uses an unknown chain: {bridge[side]}"
+                )
+        if bridge["locking_chain"] == bridge["issuing_chain"]:
+            raise XBridgeCLIException(
+                f"Bridge {bridge['name']} must be between two different chains."
+            )
+        if bridge["witnesses"] < 1:
+            raise XBridgeCLIException(
+                f"Bridge {bridge['name']} needs at least one witness."
+            )
+        if bridge["currency"] == "XRP":
+            # the door of an XRP bridge on the issuing chain is the genesis account
+            if bridge["issuing_chain"] in xrp_issuing_chains:
+                raise XBridgeCLIException(
+                    f"{bridge['issuing_chain']} can only be the issuing chain of one "
+                    "XRP bridge."
+                )
+            xrp_issuing_chains.add(bridge["issuing_chain"])
+    return {
+        "chains": chains,
+        "profiles": profiles,
+        "witness_profile": witness_profile,
+        "bridges": bridges,
+    }
+
+
+@click.command(name="topology")
+@click.option(
+    "--config-dir",
+    "config_dir",
+    envvar="XCHAIN_CONFIG_DIR",
+    required=True,
+    prompt=True,
+    type=click.Path(),
+    help="The folder in which to store config files.",
+)
+@click.option(
+    "--topology",
+    "topology_file",
+    required=True,
+    prompt=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help=(
+        "A JSON file describing the chains (`chains`, a list of names, or of "
+        "objects with a `name` and a `profile`) and the bridges between them "
+        "(`bridges`, a list of objects with `name`, `locking_chain`, "
+        "`issuing_chain`, and optionally `witnesses` and `currency`). A top-level "
+        "`profile` sets the rippled profile of the chains that don't have one, and "
+        "`witness_profile` the profile of all the witnesses."
+    ),
+)
+@click.option(
+    "--docker",
+    "is_docker",
+    is_flag=True,
+    help=(
+        "Whether the config files are for a docker setup. The environment gets its "
+        "own Docker network and a `docker-compose.yml` file."
+    ),
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help=(
+        "Keep the existing keys and witness DBs, and only rewrite the files whose "
+        "contents change. Otherwise, everything is regenerated from scratch."
+    ),
+)
+@click.option(
+    "-v",
+    "--verbose",
+    is_flag=True,
+    help="Whether or not to print more verbose information.",
+)
+@click.pass_context
+def generate_topology_configs(
+    ctx: click.Context,
+    config_dir: str,
+    topology_file: str,
+    is_docker: bool = False,
+    incremental: bool = False,
+    verbose: bool = False,
+) -> None:
+    """
+    Generate the rippled, witness, and bootstrap configs for several chains and
+    bridges.
+
+    Each chain gets a folder named after it, each witness a folder named
+    `BRIDGE_witnessN`, and each bridge a `BRIDGE_bootstrap.json` file. All of the
+    servers get their own ports.
+    \f
+
+    Args:
+        ctx: The click context.
+        config_dir: The directory to use for the config files.
+        topology_file: The JSON file describing the chains and bridges.
+        is_docker: Whether the config files are for a docker setup.
+        incremental: Whether to keep the existing keys and witness DBs, and only
+            rewrite the files that change.
+        verbose: Whether or not to print more verbose information.
+    """  # noqa: D301
+    topology = _load_topology(topology_file)
+    abs_config_dir = os.path.abspath(config_dir)
+    witness_names: Dict[str, List[str]] = {
+        bridge["name"]: [
+            f"{bridge['name']}_witness{i}" for i in range(bridge["witnesses"])
+        ]
+        for bridge in topology["bridges"]
+    }
+
+    network = None
+    if is_docker:
+        network = plan_docker_network(
+            abs_config_dir,
+            [
+                *(
+                    (chain, "rippled", get_rippled_profile(topology["profiles"][chain]))
+                    for chain in topology["chains"]
+                ),
+                *(
+                    (name, "witness", get_witness_profile(topology["witness_profile"]))
+                    for bridge in topology["bridges"]
+                    for name in witness_names[bridge["name"]]
+                ),
+            ],
+        )
+
+    chain_ports: Dict[str, Ports] = {
+        chain: Ports.allocate(abs_config_dir, chain, i)
+        for i, chain in enumerate(topology["chains"])
+    }
+    with ThreadPoolExecutor(max_workers=len(chain_ports)) as executor:
+        futures = [
+            executor.submit(
+                generate_standalone_config,
+                ports=ports,
+                cfg_type=chain,
+                config_dir=abs_config_dir,
+                docker=is_docker,
+                profile=get_rippled_profile(topology["profiles"][chain]),
+            )
+            for chain, ports in chain_ports.items()
+        ]
+    for future in futures:
+        future.result()
+    record_profiles(
+        abs_config_dir,
+        "rippled",
+        {
+            chain: (name, get_rippled_profile(name))
+            for chain, name in topology["profiles"].items()
+        },
+    )
+
+    witness_count = 0
+    for bridge in topology["bridges"]:
+        bridge_witnesses = witness_names[bridge["name"]]
+        generate_bridge_configs(
+            ctx,
+            config_dir=abs_config_dir,
+            witness_names=bridge_witnesses,
+            currency=bridge["currency"],
+            locking_ports=chain_ports[bridge["locking_chain"]],
+            issuing_ports=chain_ports[bridge["issuing_chain"]],
+            is_docker=is_docker,
+            chain_hosts=(
+                (
+                    network.services[bridge["locking_chain"]].ip_address,
+                    network.services[bridge["issuing_chain"]].ip_address,
+                )
+                if network is not None
+                else None
+            ),
+            first_witness_port=FIRST_WITNESS_PORT + witness_count,
+            bootstrap_file=f"{bridge['name']}_bootstrap.json",
+            witness_profile=topology["witness_profile"],
+            incremental=incremental,
+            verbose=verbose,
+        )
+        witness_count += len(bridge_witnesses)
+        if verbose:
+            click.echo(
+                f"Generated bridge {bridge['name']} ({bridge['locking_chain']} -> "
+                f"{bridge['issuing_chain']}) with {len(bridge_witnesses)} witnesses"
+            )
+    if network is not None:
+        generate_docker_compose(abs_config_dir, network)
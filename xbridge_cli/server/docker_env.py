@@ -0,0 +1,221 @@
+"""Run the servers in Docker containers, via the Docker API."""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import click
+import docker
+from docker.models.containers import Container
+
+from xbridge_cli.exceptions import XBridgeCLIException
+from xbridge_cli.server.config.docker_network import DOCKER_PLATFORM, ContainerSpec
+
+# the config folder a container was created with, so it's only reused for that one
+_CONFIG_LABEL = "xbridge-cli.config-dir"
+# the network, address, and resource limits a container was created with, which
+# can't be changed once it exists
+_SETTINGS_LABEL = "xbridge-cli.settings"
+
+# the statuses of a container that hasn't stopped (yet)
+_RUNNING_STATUSES = {"created", "running", "restarting"}
+
+
+def _get_settings(spec: ContainerSpec) -> str:
+    return json.dumps([spec.network, spec.ip_address, spec.cpus, spec.memory])
+
+
+def _ensure_images(client: docker.DockerClient, specs: List[ContainerSpec]) -> None:
+    # pull any missing images before creating anything, so a missing image doesn't
+    # leave the environment half-started
+    for image in sorted({spec.image for spec in specs}):
+        try:
+            client.images.get(image)
+        except docker.errors.ImageNotFound:
+            click.echo(f"Pulling {image}...")
+            try:
+                client.images.pull(image, platform=DOCKER_PLATFORM)
+            except docker.errors.APIError as e:
+                raise XBridgeCLIException(f"Could not pull Docker image {image}: {e}")
+
+
+def _ensure_networks(client: docker.DockerClient, specs: List[ContainerSpec]) -> None:
+    # each environment has its own network
+    networks = {(spec.network, spec.subnet, spec.gateway) for spec in specs}
+    for name, subnet, gateway in sorted(networks):
+        if len(client.networks.list(names=[name])) > 0:
+            continue
+        ipam_pool = docker.types.IPAMPool(subnet=subnet, gateway=gateway)
+        try:
+            client.networks.create(
+                name,
+                driver="bridge",
+                ipam=docker.types.IPAMConfig(pool_configs=[ipam_pool]),
+            )
+        except docker.errors.APIError as e:
+            raise XBridgeCLIException(f"Could not create Docker network {name}: {e}")
+
+
+def _create_container(client: docker.DockerClient, spec: ContainerSpec) -> Container:
+    api = client.api
+    endpoint_config = api.create_endpoint_config(ipv4_address=spec.ip_address)
+    container_id = api.create_container(
+        spec.image,
+        command=spec.command,
+        name=spec.name,
+        ports=spec.ports,
+        volumes=[spec.mount_point],
+        labels={_CONFIG_LABEL: spec.config_dir, _SETTINGS_LABEL: _get_settings(spec)},
+        host_config=api.create_host_config(
+            binds={spec.config_dir: {"bind": spec.mount_point, "mode": "rw"}},
+            port_bindings={port: port for port in spec.ports},
+            nano_cpus=int(spec.cpus * 1e9) if spec.cpus is not None else None,
+            mem_limit=spec.memory,
+        ),
+        networking_config=api.create_networking_config({spec.network: endpoint_config}),
+        platform=DOCKER_PLATFORM,
+    )["Id"]
+    return client.containers.get(container_id)
+
+
+def _get_container(client: docker.DockerClient, spec: ContainerSpec) -> Container:
+    # reuse the container from an earlier start if it was made from the same config
+    # and settings, and runs the same command
+    try:
+        container = client.containers.get(spec.name)
+    except docker.errors.NotFound:
+        return _create_container(client, spec)
+    if (
+        container.labels.get(_CONFIG_LABEL) == spec.config_dir
+        and container.labels.get(_SETTINGS_LABEL) == _get_settings(spec)
+        and container.attrs["Config"]["Image"] == spec.image
+        and container.attrs["Config"]["Cmd"] == spec.command
+    ):
+        return container
+    container.remove(force=True)
+    return _create_container(client, spec)
+
+
+def _start_container(client: docker.DockerClient, spec: ContainerSpec) -> Container:
+    container = _get_container(client, spec)
+    if container.status != "running":
+        container.start()
+    container.reload()
+    return container
+
+
+def start_containers(specs: List[ContainerSpec]) -> Dict[str, Container]:
+    """
+    Start the containers for the servers, all at once. Containers that already exist
+    are reused.
+
+    Args:
+        specs: The specs of the containers to start.
+
+    Returns:
+        A mapping from the name of each server to its (started) container.
+    """
+    client = docker.from_env()
+    _ensure_images(client, specs)
+    _ensure_networks(client, specs)
+    with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+        containers = list(
+            executor.map(lambda spec: _start_container(client, spec), specs)
+        )
+    return {spec.name: container for spec, container in zip(specs, containers)}
+
+
+def has_container_failed(container: Container) -> bool:
+    """
+    Check whether a container has stopped, or is failing its health check.
+
+    Args:
+        container: The container to check.
+
+    Returns:
+        Whether the container has failed.
+    """
+    try:
+        container.reload()
+    except docker.errors.NotFound:
+        return True
+    health = container.attrs["State"].get("Health", {}).get("Status")
+    return container.status not in _RUNNING_STATUSES or health == "unhealthy"
+
+
+def _is_failure_event(event: Dict[str, Any]) -> bool:
+    action = event.get("Action") or event.get("status")
+    return action == "die" or action == "health_status: unhealthy"
+
+
+class ContainerWatch:
+    """
+    Watches a container's Docker events for it stopping or failing its health check,
+    so that waiting on the container doesn't need to poll it.
+    """
+
+    def __init__(self: ContainerWatch, container: Container) -> None:
+        """
+        Start watching a container.
+
+        Args:
+            container: The container to watch.
+        """
+        self._failed = threading.Event()
+        self._client = docker.from_env()
+        self._events = self._client.events(
+            filters={"container": container.id, "event": ["die", "health_status"]},
+            decode=True,
+        )
+        threading.Thread(target=self._watch, daemon=True).start()
+        # the container may have failed before the event stream was opened
+        if has_container_failed(container):
+            self._failed.set()
+
+    def _watch(self: ContainerWatch) -> None:
+        # the stream ends once it is closed
+        for event in self._events:
+            if _is_failure_event(event):
+                self._failed.set()
+                return
+
+    def wait_for_failure(self: ContainerWatch, timeout: float) -> bool:
+        """
+        Wait until the container fails, or the timeout runs out.
+
+        Args:
+            timeout: How long to wait, in seconds.
+
+        Returns:
+            Whether the container has failed.
+        """
+        return self._failed.wait(timeout)
+
+    def close(self: ContainerWatch) -> None:
+        """Stop watching the container."""
+        self._events.close()
+        self._client.close()
+
+
+def stop_containers(names: List[str], timeout: float) -> None:
+    """
+    Stop containers, all at once. The containers are kept, so they can be restarted
+    quickly.
+
+    Args:
+        names: The names of the containers to stop.
+        timeout: How long to wait for each container to stop before killing it.
+    """
+    client = docker.from_env()
+
+    def _stop(name: str) -> None:
+        try:
+            client.containers.get(name).stop(timeout=int(timeout))
+        except docker.errors.NotFound:
+            pass
+
+    with ThreadPoolExecutor(max_workers=max(len(names), 1)) as executor:
+        list(executor.map(_stop, names))
@@ -2,27 +2,71 @@
 
 import os
 import subprocess
+import sys
+from functools import partial
+from typing import Optional
 
 import click
 
 from xbridge_cli.utils import get_config, get_config_folder
+from xbridge_cli.utils.output_file import follow_output, tail_output
+
+# how much of the output file is copied to stdout at a time
+_CHUNK_SIZE = 64 * 1024
 
 
 @click.command(name="print")
 @click.option("--name", help="The name of the server.")
-def print_server_output(name: str) -> None:
+@click.option(
+    "--tail",
+    "tail",
+    type=click.IntRange(min=0),
+    help="Only print this many lines from the end of the output.",
+)
+@click.option(
+    "-f",
+    "--follow",
+    is_flag=True,
+    help="Keep printing new output as it is written, until interrupted.",
+)
+def print_server_output(
+    name: str, tail: Optional[int] = None, follow: bool = False
+) -> None:
     """
     Print the stdout/stderr output of a server.
     \f
 
     Args:
         name: Name of the server.
+        tail: Only print this many lines from the end of the output.
+        follow: Keep printing new output as it is written, until interrupted.
     """  # noqa: D301
     server_config = get_config().get_server(name)
     if server_config.is_docker():
-        subprocess.run(["docker", "logs", name])
-    else:
-        file_loc = os.path.join(get_config_folder(), f"{name}.out")
-        with open(file_loc) as f:
-            for line in f:
-                click.echo(line.strip("\n"))
+        to_run = ["docker", "logs"]
+        if tail is not None:
+            to_run.extend(["--tail", str(tail)])
+        if follow:
+            to_run.append("--follow")
+        subprocess.run([*to_run, name])
+        return
+
+    file_loc = os.path.join(get_config_folder(), f"{name}.out")
+    stdout = sys.stdout.buffer
+    if tail is not None:
+        # seeks from the end, so it doesn't matter how big the file is
+        for line in tail_output(file_loc, tail):
+            stdout.write(line + b"\n")
+    elif not follow:
+        with open(file_loc, "rb") as f:
+            for chunk in iter(partial(f.read, _CHUNK_SIZE), b""):
+                stdout.write(chunk)
+    stdout.flush()
+
+    if follow:
+        try:
+            for chunk in follow_output(file_loc, from_end=tail is not None):
+                stdout.write(chunk)
+                stdout.flush()
+        except KeyboardInterrupt:
+            pass
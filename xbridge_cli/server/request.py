@@ -1,20 +1,134 @@
-"""CLI functions involving sending RPC requests to a rippled node."""
+"""CLI functions involving sending RPC requests to a rippled or witness node."""
 
+from __future__ import annotations
+
+import json
 import subprocess
-from typing import Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, TextIO, Tuple
 
 import click
+import httpx
 
 from xbridge_cli.exceptions import XBridgeCLIException
-from xbridge_cli.utils import ChainConfig, get_config
+from xbridge_cli.utils import ChainConfig, ServerConfig, get_config
+
+_TIMEOUT = 30  # seconds
+
+
+def _is_positional(args: Tuple[str, ...]) -> bool:
+    # rippled's own command-line syntax (e.g. `account_info rACCOUNT validated`),
+    # rather than `key=value` pairs or a JSON object
+    return any(not arg.startswith("{") and "=" not in arg for arg in args)
+
+
+def _parse_params(args: Tuple[str, ...]) -> Dict[str, Any]:
+    # each argument is either a JSON object or a `key=value` pair
+    params: Dict[str, Any] = {}
+    for arg in args:
+        if arg.startswith("{"):
+            try:
+                params.update(json.loads(arg))
+                continue
+            except ValueError:
+                raise XBridgeCLIException(f"Invalid JSON parameters: {arg}")
+        if "=" not in arg:
+            raise XBridgeCLIException(
+                f"Invalid parameter `{arg}`: parameters must be `key=value` pairs or "
+                "a JSON object (positional parameters only work with rippled nodes)."
+            )
+        key, value = arg.split("=", 1)
+        try:
+            # numbers, booleans, lists, etc.
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+
+def _parse_batch_line(line: str, line_number: int) -> Dict[str, Any]:
+    # either a full JSON-RPC request (`{"method": ..., "params": [{...}]}`), or a
+    # method with its parameters inline (`{"method": ..., "account": ...}`)
+    try:
+        request = json.loads(line)
+    except ValueError:
+        raise XBridgeCLIException(f"Line {line_number} is not valid JSON.")
+    if not isinstance(request, dict) or "method" not in request:
+        raise XBridgeCLIException(f"Line {line_number} has no `method`.")
+    if "params" in request:
+        return request
+    method = request.pop("method")
+    return {"method": method, "params": [request]}
+
+
+def _read_batch(batch_file: TextIO) -> Iterator[Dict[str, Any]]:
+    for line_number, line in enumerate(batch_file, start=1):
+        if line.strip() != "":
+            yield _parse_batch_line(line, line_number)
+
+
+def _run_rippled_cli(server: ChainConfig, command: str, args: Tuple[str, ...]) -> bytes:
+    # rippled parses its positional parameters itself, per command
+    to_run: List[str]
+    if server.is_docker():
+        to_run = ["docker", "exec", server.name, "/opt/ripple/bin/rippled"]
+    else:
+        to_run = [server.rippled, "--conf", server.config]
+    to_run.extend([command, *args])
+    return subprocess.check_output(to_run, stderr=subprocess.DEVNULL)
+
+
+def _send_request(
+    client: httpx.Client, url: str, request: Dict[str, Any]
+) -> Dict[str, Any]:
+    # errors are returned in the same shape as rippled's, so a batch keeps going
+    try:
+        response = client.post(url, json=request)
+    except httpx.HTTPError as e:
+        return {"error": type(e).__name__, "error_message": str(e)}
+    try:
+        return dict(response.json())
+    except ValueError:
+        return {"error": "invalid_response", "error_message": response.text}
+
+
+def _run_batch(
+    client: httpx.Client, url: str, batch_file: TextIO, concurrency: int
+) -> None:
+    # keep up to `concurrency` requests in flight, and print the responses in order
+    # as soon as they come in
+    in_flight: Deque[Future[Dict[str, Any]]] = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for request in _read_batch(batch_file):
+            if len(in_flight) >= concurrency:
+                click.echo(json.dumps(in_flight.popleft().result()))
+            in_flight.append(executor.submit(_send_request, client, url, request))
+        while len(in_flight) > 0:
+            click.echo(json.dumps(in_flight.popleft().result()))
 
 
 @click.command(name="request")
 @click.option(
-    "--name", required=True, prompt=True, help="The name of the chain to query."
+    "--name", required=True, prompt=True, help="The name of the server to query."
 )
-@click.argument("command", required=True)
+@click.argument("command", required=False)
 @click.argument("args", nargs=-1)
+@click.option(
+    "--batch",
+    "batch_file",
+    type=click.File("r"),
+    help=(
+        "A JSON Lines file of requests (`-` for stdin) to send instead of a single "
+        "command. The responses are printed one per line, in the same order."
+    ),
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=16,
+    help="How many `--batch` requests to have in flight at once. Defaults to 16.",
+)
 @click.option(
     "-v",
     "--verbose",
@@ -22,50 +136,55 @@ from xbridge_cli.utils import ChainConfig, get_config
     help="Whether or not to print more verbose information.",
 )
 def request_server(
-    name: str, command: str, args: Tuple[str], verbose: bool = False
+    name: str,
+    command: Optional[str],
+    args: Tuple[str, ...],
+    batch_file: Optional[TextIO] = None,
+    concurrency: int = 16,
+    verbose: bool = False,
 ) -> None:
     """
     Send a command-line request to a rippled or witness node.
-    \f
 
-    Args:
-        name: The name of the server to query.
-        command: The rippled RPC command.
-        args: The arguments for the RPC command.
-        verbose: Whether or not to print more verbose information.
-    """  # noqa: D301
-    arg_string = " ".join([command, *args])
-    if verbose:
-        click.echo(f"{name}: {arg_string}")
-    config = get_config()
-    server = config.get_server(name)
-
-    if isinstance(server, ChainConfig):  # is a rippled node
-        if server.is_docker():
-            to_run = ["docker", "exec", name, "/opt/ripple/bin/rippled"]
-        else:
-            to_run = [server.rippled, "--conf", server.config]
-        to_run.extend([command, *args])
-        click.echo(subprocess.check_output(to_run, stderr=subprocess.DEVNULL))
-    else:  # is a witness node
-        click.echo("Cannot query witness nodes from the command line right now.")
-
-
-@click.command(name="status")
-@click.option("--name", help="The name of the server to query.")
-@click.option("--all", is_flag=True, help="Whether to query all of the servers.")
-def get_server_status(name: Optional[str] = None, query_all: bool = False) -> None:
-    """
-    Get the status of a rippled or witness node(s).
+    The parameters of the request are `key=value` pairs (values are parsed as JSON
+    where possible), or a JSON object. Positional parameters in rippled's own
+    command-line syntax (e.g. `account_info rACCOUNT validated`) still work for
+    rippled nodes, and are run through the rippled executable.
     \f
 
     Args:
         name: The name of the server to query.
-        query_all: Whether to stop all of the servers.
+        command: The RPC command.
+        args: The parameters for the RPC command.
+        batch_file: A JSON Lines file of requests to send instead of a single command.
+        concurrency: How many batch requests to have in flight at once.
+        verbose: Whether or not to print more verbose information.
 
     Raises:
-        XBridgeCLIException: If neither a name or `--all` is specified.
+        UsageError: If neither a command nor `--batch` is specified, or both are.
     """  # noqa: D301
-    if name is None and query_all is False:
-        raise XBridgeCLIException("Must specify a name or `--all`.")
-    click.echo(f"{name} {query_all}")
+    if batch_file is not None and (command is not None or len(args) > 0):
+        raise click.UsageError("`--batch` can't be combined with a command.")
+    if command is None and batch_file is None:
+        raise click.UsageError("Must specify either a command or `--batch`.")
+
+    server: ServerConfig = get_config().get_server(name)
+    if command is not None:
+        if verbose:
+            click.echo(f"{name}: {' '.join([command, *args])}")
+        if _is_positional(args) and isinstance(server, ChainConfig):
+            click.echo(_run_rippled_cli(server, command, args))
+            return
+    params = _parse_params(args)
+
+    url = f"http://{server.http_ip}:{server.http_port}"
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    with httpx.Client(timeout=_TIMEOUT, limits=limits) as client:
+        if batch_file is not None:
+            _run_batch(client, url, batch_file, concurrency)
+            return
+
+        request = {"method": command, "params": [params]}
+        click.echo(json.dumps(_send_request(client, url, request), indent=4))
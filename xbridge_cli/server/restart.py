@@ -2,15 +2,111 @@
 
 from __future__ import annotations
 
-import subprocess
-from typing import List, Optional, cast
+from collections import Counter
+from typing import Any, Dict, List, Optional, cast
 
 import click
 
 from xbridge_cli.exceptions import XBridgeCLIException
-from xbridge_cli.server.start import _DOCKER_COMPOSE, start_server
-from xbridge_cli.server.stop import stop_server
-from xbridge_cli.utils import ServerConfig, get_config
+from xbridge_cli.server.start import _start_servers
+from xbridge_cli.server.stop import _stop_servers, stop_server
+from xbridge_cli.utils import (
+    BridgeConfig,
+    ChainConfig,
+    ServerConfig,
+    WitnessConfig,
+    get_config,
+    remove_server,
+)
+
+
+def _serves_bridge(witness_config: Dict[str, Any], bridge: BridgeConfig) -> bool:
+    xchain_bridge = witness_config.get("XChainBridge", {})
+    return (
+        xchain_bridge.get("LockingChainDoor"),
+        xchain_bridge.get("IssuingChainDoor"),
+    ) == tuple(bridge.door_accounts)
+
+
+def _get_witness_batches(
+    witnesses: List[WitnessConfig], bridges: List[BridgeConfig]
+) -> List[List[WitnessConfig]]:
+    # split the witnesses into batches that can be restarted one after the other
+    # without any bridge dropping below its signer quorum
+    serving = {
+        witness.name: [
+            bridge.name
+            for bridge in bridges
+            if _serves_bridge(witness.get_config(), bridge)
+        ]
+        for witness in witnesses
+    }
+    # how many of each bridge's witnesses can be down at once
+    allowed_down = {}
+    for bridge in bridges:
+        count = sum(bridge.name in names for names in serving.values())
+        if count <= bridge.quorum:
+            click.echo(
+                f"Bridge {bridge.name} has {count} witness(es) running for a quorum of "
+                f"{bridge.quorum}, so it can't attest while they restart."
+            )
+        # the witnesses still restart one at a time if quorum can't be kept
+        allowed_down[bridge.name] = max(1, count - bridge.quorum)
+
+    batches = []
+    remaining = witnesses
+    while len(remaining) > 0:
+        down: Counter[str] = Counter()
+        batch = []
+        deferred = []
+        for witness in remaining:
+            if all(down[name] < allowed_down[name] for name in serving[witness.name]):
+                batch.append(witness)
+                down.update(serving[witness.name])
+            else:
+                deferred.append(witness)
+        batches.append(batch)
+        remaining = deferred
+    return batches
+
+
+def _start_again(servers: List[ServerConfig], verbose: bool = False) -> None:
+    # the chains come up before the witnesses that connect to them, and each group is
+    # started all at once (Docker servers reuse their stopped containers)
+    # `_start_servers` waits for the whole group to be ready before returning
+    chains: List[ServerConfig] = [
+        server for server in servers if isinstance(server, ChainConfig)
+    ]
+    witnesses = [server for server in servers if not isinstance(server, ChainConfig)]
+    for group in [chains, witnesses]:
+        for exe in sorted({server.exe for server in group}):
+            _start_servers(
+                [(server.name, server.config) for server in group if server.exe == exe],
+                exe,
+                verbose=verbose,
+            )
+
+
+def _restart_batch(servers: List[ServerConfig], verbose: bool = False) -> None:
+    if verbose:
+        click.echo(f"Restarting {', '.join(server.name for server in servers)}...")
+    _stop_servers(servers, verbose)
+    for server in servers:
+        remove_server(server.name)
+    _start_again(servers, verbose)
+
+
+def _rolling_restart(
+    chains: List[ChainConfig],
+    witnesses: List[WitnessConfig],
+    bridges: List[BridgeConfig],
+    verbose: bool = False,
+) -> None:
+    for batch in _get_witness_batches(witnesses, bridges):
+        _restart_batch(cast(List[ServerConfig], batch), verbose)
+    # the chains are restarted separately, so only one is ever down at a time
+    for chain in chains:
+        _restart_batch([chain], verbose)
 
 
 @click.command(name="restart")
@@ -18,6 +114,15 @@ from xbridge_cli.utils import ServerConfig, get_config
 @click.option(
     "--all", "restart_all", is_flag=True, help="Whether to stop all of the servers."
 )
+@click.option(
+    "--rolling",
+    is_flag=True,
+    help=(
+        "Restart the witnesses in batches that keep each bridge's signer quorum "
+        "online, waiting for each batch to be ready, and then the chains one at a "
+        "time."
+    ),
+)
 @click.option(
     "-v",
     "--verbose",
@@ -29,6 +134,7 @@ def restart_server(
     ctx: click.Context,
     name: Optional[str] = None,
     restart_all: bool = False,
+    rolling: bool = False,
     verbose: bool = False,
 ) -> None:
     """
@@ -39,6 +145,7 @@ def restart_server(
         ctx: The click context.
         name: The name of the server to restart.
         restart_all: Whether to restart all of the servers.
+        rolling: Whether to restart the servers in batches that keep quorum.
         verbose: Whether or not to print more verbose information.
 
     Raises:
@@ -56,19 +163,14 @@ def restart_server(
         assert name is not None
         servers = [config.get_server(name)]
 
+    if rolling:
+        _rolling_restart(
+            [server for server in servers if isinstance(server, ChainConfig)],
+            [server for server in servers if isinstance(server, WitnessConfig)],
+            config.bridges,
+            verbose,
+        )
+        return
+
     ctx.invoke(stop_server, name=name, stop_all=restart_all, verbose=verbose)
-    for server in servers:
-        if server.is_docker():
-            subprocess.run(
-                [*_DOCKER_COMPOSE, "start", server.name],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        else:
-            ctx.invoke(
-                start_server,
-                name=server.name,
-                exe=server.exe,
-                config=server.config,
-                verbose=verbose,
-            )
+    _start_again(servers, verbose)
@@ -4,16 +4,25 @@ from __future__ import annotations
 
 import json
 import os
-import subprocess
+import socket
 import time
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple, cast
 
 import click
-import docker
 import httpx
 import psutil
+from docker.models.containers import Container
 
 from xbridge_cli.exceptions import XBridgeCLIException
+from xbridge_cli.server.config.docker_network import get_container_spec
+from xbridge_cli.server.docker_env import (
+    ContainerWatch,
+    start_containers,
+    stop_containers,
+)
+from xbridge_cli.server.stop import stop_processes
 from xbridge_cli.utils import (
     ChainData,
     RippledConfig,
@@ -22,75 +31,334 @@ from xbridge_cli.utils import (
     add_witness,
     check_server_exists,
     get_config_folder,
+    get_daemon_socket,
+    get_daemon_status,
+    send_daemon_request,
 )
+from xbridge_cli.utils.output_file import spawn_with_output
+from xbridge_cli.utils.types import ServerData
 
-_DOCKER_COMPOSE_FILE = os.path.abspath(
-    os.path.join(
-        os.path.realpath(__file__),
-        "..",
-        "docker-compose.yml",
-    )
-)
+_START_UP_TIME = 30  # seconds
+_MIN_WAIT_INCREMENT = 0.01  # seconds
+_MAX_WAIT_INCREMENT = 0.2  # seconds
+_REQUEST_TIMEOUT = 2  # seconds
+# a server that didn't come up isn't given long to stop
+_FAILED_STOP_TIME = 5  # seconds
+
+# what has to be true before a server counts as started
+# `rpc`: the server answers a `server_info` request
+# `validated`: the server has a validated ledger (rippled only)
+_READINESS_CONDITIONS = ["rpc", "validated"]
+
+
+def _wait_until(
+    wait_for_exit: Callable[[float], bool], deadline: float, check: Callable[[], bool]
+) -> bool:
+    # retry `check` with backoff until it passes, the server exits, or time runs out
+    wait_increment = _MIN_WAIT_INCREMENT
+    while not check():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if wait_for_exit(min(wait_increment, remaining)):
+            return False
+        wait_increment = min(2 * wait_increment, _MAX_WAIT_INCREMENT)
+    return True
+
+
+def _is_port_open(http_ip: str, http_port: int) -> bool:
+    try:
+        with socket.create_connection((http_ip, http_port), timeout=1):
+            return True
+    except OSError:
+        return False
 
-_DOCKER_COMPOSE = ["docker-compose", "-f", _DOCKER_COMPOSE_FILE]
 
-_START_UP_TIME = 30  # seconds
-_WAIT_INCREMENT = 0.5  # seconds
+def _is_server_ready(http_url: str, wait_for: str) -> bool:
+    try:
+        response = httpx.post(
+            http_url, json={"method": "server_info"}, timeout=_REQUEST_TIMEOUT
+        )
+    except httpx.TransportError:
+        # includes timeouts, from a server that's too busy starting up to answer
+        return False
+    if wait_for == "validated":
+        try:
+            return "validated_ledger" in response.json()["result"]["info"]
+        except (ValueError, KeyError, TypeError):
+            return False
+    return True
 
 
-def _wait_for_process(
-    subprocess_process: subprocess.Popen[bytes],
-    name: str,
+def _wait_for_server(
+    wait_for_exit: Callable[[float], bool],
+    read_output: Callable[[], str],
     http_ip: str,
     http_port: int,
-    output_file: str,
-    is_docker: bool = False,
+    wait_for: str = "rpc",
 ) -> None:
     http_url = f"http://{http_ip}:{http_port}"
-    time_waited = 0.0
-    process = psutil.Process(pid=subprocess_process.pid)
-    while time_waited < _START_UP_TIME:
-        if process.status() == psutil.STATUS_ZOMBIE:
-            break
-        try:
-            request = {"method": "server_info"}
-            httpx.post(http_url, json=request)
-            if is_docker:
-                docker_client = docker.from_env()
-                container = docker_client.containers.get(name)
-                assert container.status == "running"
-            return
-        except (
-            httpx.ConnectError,
-            httpx.RemoteProtocolError,
-            httpx.ReadError,
-            httpx.WriteError,
-            docker.errors.NotFound,
-            AssertionError,
-        ):
-            time.sleep(_WAIT_INCREMENT)
-            time_waited += _WAIT_INCREMENT
-    with open(output_file) as f:
-        click.echo(f.read())
+    deadline = time.monotonic() + _START_UP_TIME
+    # the cheap check gates the `server_info` request, so it's only sent once the
+    # server can actually answer it
+    if _wait_until(
+        wait_for_exit, deadline, lambda: _is_port_open(http_ip, http_port)
+    ) and _wait_until(
+        wait_for_exit, deadline, lambda: _is_server_ready(http_url, wait_for)
+    ):
+        return
+    click.echo(read_output())
     raise XBridgeCLIException("Process did not start up correctly.")
 
 
-def _run_process(
-    to_run: List[str], out_file: str
-) -> Tuple[subprocess.Popen[bytes], str]:
-    # create output file for easier debug purposes
-    output_file = f"{get_config_folder()}/{out_file}.out"
-    if not os.path.exists(output_file):
-        # initialize file if it doesn't exist
-        with open(output_file, "w") as f:
-            f.write("")
-    fout = open(output_file, "w")
+def _get_output_file(out_file: str) -> str:
+    # output file for easier debug purposes
+    return f"{get_config_folder()}/{out_file}.out"
+
+
+def _run_process(to_run: List[str], out_file: str) -> Tuple[psutil.Process, str]:
+    output_file = _get_output_file(out_file)
+    process = spawn_with_output(to_run, output_file)
+    return psutil.Process(process.pid), output_file
+
+
+def _get_server_data(name: str, exe: str, config: str) -> ServerData:
+    # the PID is filled in once the server is launched
+    try:
+        config_object = RippledConfig(file_name=config)
+    except ValueError:
+        with open(config) as f:
+            config_json = json.load(f)
+        witness_data: WitnessData = {
+            "name": name,
+            "type": "witness",
+            "exe": exe,
+            "config": config,
+            "pid": 0,
+            "http_ip": config_json["RPCEndpoint"]["Host"],
+            "http_port": config_json["RPCEndpoint"]["Port"],
+        }
+        return witness_data
+
+    chain_data: ChainData = {
+        "name": name,
+        "type": "rippled",
+        "exe": exe,
+        "config": config,
+        "pid": 0,
+        "ws_ip": config_object.port_ws_admin_local["ip"],
+        "ws_port": int(config_object.port_ws_admin_local["port"]),
+        "http_ip": config_object.port_rpc_admin_local["ip"],
+        "http_port": int(config_object.port_rpc_admin_local["port"]),
+    }
+    return chain_data
+
+
+@dataclass
+class _LaunchedServer:
+    data: ServerData
+    # waits up to the given number of seconds, and returns whether the server exited
+    wait_for_exit: Callable[[float], bool]
+    read_output: Callable[[], str]
+    # stops whatever is watching the server, once it's no longer needed
+    close: Optional[Callable[[], None]] = None
+    # the local process, or `None` for a Docker container
+    process: Optional[psutil.Process] = None
+
+
+def _process_exit_waiter(process: psutil.Process) -> Callable[[float], bool]:
+    def _wait_for_exit(timeout: float) -> bool:
+        try:
+            # returns early (instead of sleeping) if the process dies
+            process.wait(timeout=timeout)
+            return True
+        except psutil.TimeoutExpired:
+            return False
+
+    return _wait_for_exit
+
+
+def _file_reader(output_file: str) -> Callable[[], str]:
+    def _read_output() -> str:
+        with open(output_file) as f:
+            return f.read()
+
+    return _read_output
+
+
+def _container_log_reader(container: Container) -> Callable[[], str]:
+    def _read_output() -> str:
+        return cast(bytes, container.logs()).decode(errors="replace")
+
+    return _read_output
 
-    process = subprocess.Popen(
-        to_run, stdout=fout, stderr=subprocess.STDOUT, close_fds=True
+
+def _launch_supervised(
+    server: ServerData, to_run: List[str]
+) -> Tuple[psutil.Process, str]:
+    # the daemon runs the process, so that it can restart it if it crashes
+    output_file = _get_output_file(server["name"])
+    pid = send_daemon_request(
+        get_daemon_socket(),
+        "start",
+        {"server": server, "command": to_run, "output_file": output_file},
     )
+    return psutil.Process(pid), output_file
+
+
+def _launch_servers(
+    servers: List[ServerData], supervised: bool = False, load: bool = False
+) -> List[_LaunchedServer]:
+    docker_servers = [server for server in servers if server["exe"] == "docker"]
+    launched: List[_LaunchedServer] = []
+    if len(docker_servers) > 0:
+        # containers from an earlier run are reused, and all of them are started at
+        # once
+        containers = start_containers(
+            [get_container_spec(server, load) for server in docker_servers]
+        )
+        for server in docker_servers:
+            container = containers[server["name"]]
+            server["pid"] = container.attrs["State"]["Pid"]
+            # the container's events are watched while the RPC port is polled
+            watch = ContainerWatch(container)
+            launched.append(
+                _LaunchedServer(
+                    server,
+                    watch.wait_for_failure,
+                    _container_log_reader(container),
+                    watch.close,
+                )
+            )
+
+    for server in servers:
+        if server["exe"] == "docker":
+            continue
+        if server["type"] == "rippled":
+            to_run = [server["exe"], "--conf", server["config"], "-a"]
+            if load:
+                to_run.append("--load")
+        else:
+            to_run = [server["exe"], "--conf", server["config"], "--verbose"]
+        if supervised:
+            process, output_file = _launch_supervised(server, to_run)
+        else:
+            process, output_file = _run_process(to_run, server["name"])
+        server["pid"] = process.pid
+        launched.append(
+            _LaunchedServer(
+                server,
+                _process_exit_waiter(process),
+                _file_reader(output_file),
+                process=process,
+            )
+        )
+    return launched
+
+
+def _stop_launched(failed: List[_LaunchedServer], supervised: bool) -> None:
+    # nothing tracks a server that didn't come up, so it mustn't be left running
+    processes = {
+        launched.process: launched.data["name"]
+        for launched in failed
+        if launched.process is not None
+    }
+    if supervised and len(processes) > 0:
+        # stop the daemon from restarting them
+        send_daemon_request(
+            get_daemon_socket(), "release", {"names": list(processes.values())}
+        )
+    stop_processes(processes)
+    containers = [
+        launched.data["name"] for launched in failed if launched.process is None
+    ]
+    if len(containers) > 0:
+        stop_containers(containers, _FAILED_STOP_TIME)
+
+
+def _start_servers(
+    servers: List[Tuple[str, str]],
+    exe: str,
+    wait_for: str = "rpc",
+    verbose: bool = False,
+    load: bool = False,
+) -> None:
+    # launch all the servers at once, then wait for all of them to be ready
+    # `load` starts rippled from the ledger in its database, instead of a new one
+    if len(servers) == 0:
+        return
+    if exe != "docker":
+        exe = os.path.abspath(exe)
+
+    server_data = []
+    for name, config in servers:
+        config = os.path.abspath(config)
+        if check_server_exists(name, config):
+            raise XBridgeCLIException(
+                f"Server already running with the name {name} or config {config}."
+            )
+        server_data.append(_get_server_data(name, exe, config))
 
-    return process, output_file
+    if verbose:
+        for server in server_data:
+            click.echo(f"Starting {server['type']} server {server['name']}...")
+
+    # docker restarts its own containers, so only local processes are supervised
+    supervised = get_daemon_status(get_daemon_socket()) is not None
+    launched = _launch_servers(server_data, supervised, load)
+
+    # check if the servers actually started up correctly
+    try:
+        with ThreadPoolExecutor(max_workers=len(launched)) as executor:
+            futures = [
+                executor.submit(
+                    _wait_for_server,
+                    launched_server.wait_for_exit,
+                    launched_server.read_output,
+                    launched_server.data["http_ip"],
+                    launched_server.data["http_port"],
+                    # the witness doesn't have ledgers, so it can only wait for RPC
+                    wait_for if launched_server.data["type"] == "rippled" else "rpc",
+                )
+                for launched_server in launched
+            ]
+    finally:
+        for launched_server in launched:
+            if launched_server.close is not None:
+                launched_server.close()
+
+    # the servers that came up are recorded before anything else can go wrong
+    failed: List[_LaunchedServer] = []
+    unexpected_error: Optional[BaseException] = None
+    for launched_server, future in zip(launched, futures):
+        server = launched_server.data
+        error = future.exception()
+        if error is not None:
+            if not isinstance(error, XBridgeCLIException) and unexpected_error is None:
+                unexpected_error = error
+            failed.append(launched_server)
+            continue
+
+        # add server to config file
+        if server["type"] == "rippled":
+            add_chain(cast(ChainData, server))
+        else:
+            # a witness has nothing beyond the common server data
+            add_witness(server)
+        if verbose:
+            click.echo(
+                f"started {server['type']} at `{server['exe']}` with config "
+                f"`{server['config']}`"
+            )
+            click.echo(f"PID: {server['pid']}")
+
+    if len(failed) > 0:
+        _stop_launched(failed, supervised)
+    if unexpected_error is not None:
+        raise unexpected_error
+    if len(failed) > 0:
+        names = ", ".join(launched_server.data["name"] for launched_server in failed)
+        raise XBridgeCLIException(f"Process did not start up correctly: {names}")
 
 
 @click.command(name="start")
@@ -114,6 +382,17 @@ def _run_process(
     type=click.Path(exists=True),
     help="The filepath to the exe config file.",
 )
+@click.option(
+    "--wait-for",
+    "wait_for",
+    type=click.Choice(_READINESS_CONDITIONS),
+    default="rpc",
+    help=(
+        "What to wait for before a server counts as started: an answer to an RPC "
+        "request (`rpc`), or a validated ledger (`validated`, rippled only). "
+        "Defaults to `rpc`."
+    ),
+)
 @click.option(
     "-v",
     "--verbose",
@@ -122,7 +401,12 @@ def _run_process(
 )
 @click.pass_context
 def start_server(
-    ctx: click.Context, name: str, exe: str, config: str, verbose: bool = False
+    ctx: click.Context,
+    name: str,
+    exe: str,
+    config: str,
+    wait_for: str = "rpc",
+    verbose: bool = False,
 ) -> None:
     """
     Start a standalone node of rippled or a witness node.
@@ -133,87 +417,10 @@ def start_server(
         name: The name of the chain (used for differentiation purposes).
         exe: The filepath to the executable.
         config: The filepath to the config file.
+        wait_for: What to wait for before the server counts as started.
         verbose: Whether or not to print more verbose information.
-
-    Raises:
-        XBridgeCLIException: If server is already running with that name/config.
     """  # noqa: D301
-    exe = os.path.abspath(exe)
-    config = os.path.abspath(config)
-    try:
-        config_object = RippledConfig(file_name=config)
-        is_rippled = True
-    except ValueError:
-        with open(config) as f:
-            config_json = json.load(f)
-        is_rippled = False
-    if check_server_exists(name, config):
-        raise XBridgeCLIException(
-            f"Server already running with the name {name} or config {config}."
-        )
-
-    server_type = "rippled" if is_rippled else "witness"
-    if verbose:
-        click.echo(f"Starting {server_type} server {name}...")
-
-    if exe == "docker":
-        to_run = [*_DOCKER_COMPOSE, "up", name]
-    elif is_rippled:
-        to_run = [exe, "--conf", config, "-a"]
-    else:
-        to_run = [exe, "--conf", config, "--verbose"]
-
-    process, output_file = _run_process(to_run, name)
-
-    if is_rippled:
-        # check if server actually started up correctly
-        _wait_for_process(
-            process,
-            name,
-            config_object.port_rpc_admin_local.ip,
-            int(config_object.port_rpc_admin_local.port),
-            output_file,
-            exe == "docker",
-        )
-
-        chain_data: ChainData = {
-            "name": name,
-            "type": "rippled",
-            "exe": exe,
-            "config": config,
-            "pid": process.pid,
-            "ws_ip": config_object.port_ws_admin_local.ip,
-            "ws_port": int(config_object.port_ws_admin_local.port),
-            "http_ip": config_object.port_rpc_admin_local.ip,
-            "http_port": int(config_object.port_rpc_admin_local.port),
-        }
-        # add chain to config file
-        add_chain(chain_data)
-    else:
-        # check if server actually started up correctly
-        _wait_for_process(
-            process,
-            name,
-            config_json["RPCEndpoint"]["Host"],
-            config_json["RPCEndpoint"]["Port"],
-            output_file,
-            exe == "docker",
-        )
-        witness_data: WitnessData = {
-            "name": name,
-            "type": "witness",
-            "exe": exe,
-            "config": config,
-            "pid": process.pid,
-            "http_ip": config_json["RPCEndpoint"]["Host"],
-            "http_port": config_json["RPCEndpoint"]["Port"],
-        }
-        # add witness to config file
-        add_witness(witness_data)
-
-    if verbose:
-        click.echo(f"started {server_type} at `{exe}` with config `{config}`")
-        click.echo(f"PID: {process.pid}")
+    _start_servers([(name, config)], exe, wait_for, verbose)
 
 
 @click.command(name="start-all")
@@ -246,6 +453,17 @@ def start_server(
 @click.option("--docker", is_flag=True, help="Use executables from Docker.")
 @click.option("--rippled-only", is_flag=True, help="Only start up the rippled servers.")
 @click.option("--witness-only", is_flag=True, help="Only start up the witness servers.")
+@click.option(
+    "--wait-for",
+    "wait_for",
+    type=click.Choice(_READINESS_CONDITIONS),
+    default="rpc",
+    help=(
+        "What to wait for before a server counts as started: an answer to an RPC "
+        "request (`rpc`), or a validated ledger (`validated`, rippled only). "
+        "Defaults to `rpc`."
+    ),
+)
 @click.option(
     "-v",
     "--verbose",
@@ -261,6 +479,7 @@ def start_all_servers(
     docker: bool = False,
     rippled_only: bool = False,
     witness_only: bool = False,
+    wait_for: str = "rpc",
     verbose: bool = False,
 ) -> None:
     """
@@ -277,6 +496,7 @@ def start_all_servers(
         docker: Use executables from Docker.
         rippled_only: Only start up the rippled servers.
         witness_only: Only start up the witness servers.
+        wait_for: What to wait for before a server counts as started.
         verbose: Whether or not to print more verbose information.
 
     Raises:
@@ -307,84 +527,8 @@ def start_all_servers(
                 continue
 
     # TODO: simplify this logic once the witness can start up without the chains
+    # each tier is started all at once, but the witnesses need the chains to be up
     if rippled_only or all_chains:
-        if rippled_exe == "docker":
-            name_list = [name for (name, _) in chains]
-            to_run = [*_DOCKER_COMPOSE, "up", *name_list]
-
-            process, output_file = _run_process(to_run, "docker-rippled")
-
-            for name, config in chains:
-                config_object = RippledConfig(file_name=config)
-                # check if server actually started up correctly
-                _wait_for_process(
-                    process,
-                    name,
-                    config_object.port_rpc_admin_local.ip,
-                    int(config_object.port_rpc_admin_local.port),
-                    output_file,
-                    rippled_exe == "docker",
-                )
-                chain_data: ChainData = {
-                    "name": name,
-                    "type": "rippled",
-                    "exe": "docker",
-                    "config": config,
-                    "pid": process.pid,
-                    "ws_ip": config_object.port_ws_admin_local.ip,
-                    "ws_port": int(config_object.port_ws_admin_local.port),
-                    "http_ip": config_object.port_rpc_admin_local.ip,
-                    "http_port": int(config_object.port_rpc_admin_local.port),
-                }
-                # add chain to config file
-                add_chain(chain_data)
-        else:
-            for name, config in chains:
-                ctx.invoke(
-                    start_server,
-                    name=name,
-                    exe=rippled_exe,
-                    config=config,
-                    verbose=verbose,
-                )
+        _start_servers(chains, rippled_exe, wait_for, verbose)
     if witness_only or all_chains:
-        if witnessd_exe == "docker":
-            name_list = [name for (name, _) in witnesses]
-            to_run = [*_DOCKER_COMPOSE, "up", *name_list]
-
-            process, output_file = _run_process(to_run, "docker-witness")
-
-            for name, config in witnesses:
-                with open(config) as f:
-                    config_json = json.load(f)
-
-                # check if server actually started up correctly
-                _wait_for_process(
-                    process,
-                    name,
-                    config_json["RPCEndpoint"]["Host"],
-                    config_json["RPCEndpoint"]["Port"],
-                    output_file,
-                    witnessd_exe == "docker",
-                )
-
-                witness_data: WitnessData = {
-                    "name": name,
-                    "type": "witness",
-                    "exe": "docker",
-                    "config": config,
-                    "pid": process.pid,
-                    "http_ip": config_json["RPCEndpoint"]["Host"],
-                    "http_port": config_json["RPCEndpoint"]["Port"],
-                }
-                # add witness to config file
-                add_witness(witness_data)
-        else:
-            for name, config in witnesses:
-                ctx.invoke(
-                    start_server,
-                    name=name,
-                    exe=witnessd_exe,
-                    config=config,
-                    verbose=verbose,
-                )
+        _start_servers(witnesses, witnessd_exe, wait_for, verbose)
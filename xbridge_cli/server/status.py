@@ -0,0 +1,280 @@
+"""Get the status of the running servers."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import click
+import httpx
+from tabulate import tabulate
+
+from xbridge_cli.exceptions import XBridgeCLIException
+from xbridge_cli.utils import ChainConfig, ServerConfig, WitnessConfig, get_config
+
+_TIMEOUT = 5  # seconds
+_MAX_CONNECTIONS = 64
+_ATTESTATION_TYPES = {
+    "XChainAddClaimAttestation",
+    "XChainAddAccountCreateAttestation",
+}
+# how many of a witness's most recent transactions are searched for an attestation
+_ATTESTATION_SEARCH_LIMIT = 20
+
+# the requests sent to each chain
+_CHAIN_REQUESTS: List[Tuple[str, Dict[str, Any]]] = [
+    ("server_info", {}),
+    ("fee", {}),
+    ("ledger", {"ledger_index": "validated"}),
+]
+
+# the result, the latency in seconds, and the error (if the request failed)
+_Response = Tuple[Optional[Dict[str, Any]], float, Optional[str]]
+
+
+def _send_request(
+    client: httpx.Client, server: ServerConfig, method: str, params: Dict[str, Any]
+) -> _Response:
+    url = f"http://{server.http_ip}:{server.http_port}"
+    start = time.monotonic()
+    try:
+        response = client.post(url, json={"method": method, "params": [params]})
+        latency = time.monotonic() - start
+        result = response.json()["result"]
+    except httpx.HTTPError as e:
+        return None, 0, type(e).__name__
+    except (ValueError, KeyError, TypeError):
+        return None, 0, "invalid response"
+    if not isinstance(result, dict):
+        return None, latency, "invalid response"
+    if result.get("status") == "error":
+        return result, latency, str(result.get("error"))
+    return result, latency, None
+
+
+def _get_submitting_accounts(witness: WitnessConfig) -> List[str]:
+    config = witness.get_config()
+    accounts = {
+        config[chain]["TxnSubmit"]["SubmittingAccount"]
+        for chain in ["LockingChain", "IssuingChain"]
+        if "TxnSubmit" in config.get(chain, {})
+    }
+    return sorted(accounts)
+
+
+def _get_latest_attestation(result: Optional[Dict[str, Any]]) -> Optional[int]:
+    # the ledger of the most recent attestation in an `account_tx` result
+    if result is None:
+        return None
+    for entry in result.get("transactions", []):
+        tx = entry.get("tx_json", entry.get("tx", {}))
+        if tx.get("TransactionType") in _ATTESTATION_TYPES:
+            return cast(int, entry.get("ledger_index", tx.get("ledger_index")))
+    return None
+
+
+def _format_chain_row(
+    chain: ChainConfig, responses: Dict[str, _Response]
+) -> Dict[str, Any]:
+    info_result, latency, error = responses["server_info"]
+    if info_result is None or error is not None:
+        return {"name": chain.name, "state": f"unreachable ({error})"}
+    info = info_result.get("info", {})
+    # a standalone node that hasn't closed a ledger only has a `closed_ledger`
+    ledger = info.get("validated_ledger", info.get("closed_ledger", {}))
+
+    fee_result, _, _ = responses["fee"]
+    ledger_result, _, _ = responses["ledger"]
+    return {
+        "name": chain.name,
+        "state": info.get("server_state", "-"),
+        "validated ledger": ledger.get("seq", "-"),
+        "close time": ((ledger_result or {}).get("ledger") or {}).get(
+            "close_time_human", "-"
+        ),
+        "load factor": info.get("load_factor", "-"),
+        "queue size": (fee_result or {}).get("current_queue_size", "-"),
+        "latency (ms)": round(latency * 1000, 1),
+    }
+
+
+def _format_witness_row(
+    witness: WitnessConfig,
+    info_response: _Response,
+    attestations: Dict[str, List[_Response]],
+) -> Dict[str, Any]:
+    _, latency, error = info_response
+    if error is not None:
+        return {"name": witness.name, "reachable": f"no ({error})"}
+
+    latest = []
+    for chain_name, responses in attestations.items():
+        ledgers = [
+            ledger
+            for ledger in (
+                _get_latest_attestation(result) for result, _, _ in responses
+            )
+            if ledger is not None
+        ]
+        if len(ledgers) > 0:
+            latest.append(f"{chain_name} @ {max(ledgers)}")
+    return {
+        "name": witness.name,
+        "reachable": "yes",
+        "latency (ms)": round(latency * 1000, 1),
+        "latest attestation (ledger)": ", ".join(latest) or "-",
+    }
+
+
+def _get_status(
+    client: httpx.Client,
+    executor: ThreadPoolExecutor,
+    chains: List[ChainConfig],
+    witnesses: List[WitnessConfig],
+    all_chains: List[ChainConfig],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # every request is sent at once, so this takes about one round-trip
+    chain_futures = {
+        chain.name: {
+            method: executor.submit(_send_request, client, chain, method, params)
+            for method, params in _CHAIN_REQUESTS
+        }
+        for chain in chains
+    }
+    witness_futures: Dict[
+        str, Tuple[Future[_Response], Dict[str, List[Future[_Response]]]]
+    ] = {}
+    for witness in witnesses:
+        accounts = _get_submitting_accounts(witness)
+        witness_futures[witness.name] = (
+            executor.submit(_send_request, client, witness, "server_info", {}),
+            {
+                # the witness submits its attestations to the chains itself
+                chain.name: [
+                    executor.submit(
+                        _send_request,
+                        client,
+                        chain,
+                        "account_tx",
+                        {"account": account, "limit": _ATTESTATION_SEARCH_LIMIT},
+                    )
+                    for account in accounts
+                ]
+                for chain in all_chains
+            },
+        )
+
+    chain_rows = [
+        _format_chain_row(
+            chain,
+            {
+                method: future.result()
+                for method, future in chain_futures[chain.name].items()
+            },
+        )
+        for chain in chains
+    ]
+    witness_rows = []
+    for witness in witnesses:
+        info_future, attestation_futures = witness_futures[witness.name]
+        witness_rows.append(
+            _format_witness_row(
+                witness,
+                info_future.result(),
+                {
+                    chain_name: [future.result() for future in futures]
+                    for chain_name, futures in attestation_futures.items()
+                },
+            )
+        )
+    return chain_rows, witness_rows
+
+
+def _print_status(
+    chain_rows: List[Dict[str, Any]], witness_rows: List[Dict[str, Any]]
+) -> None:
+    if len(chain_rows) > 0:
+        click.echo("Chains:")
+        click.echo(tabulate(chain_rows, headers="keys", tablefmt="presto"))
+    if len(chain_rows) > 0 and len(witness_rows) > 0:
+        click.echo("")
+    if len(witness_rows) > 0:
+        click.echo("Witnesses:")
+        click.echo(tabulate(witness_rows, headers="keys", tablefmt="presto"))
+
+
+@click.command(name="status")
+@click.option("--name", help="The name of the server to query.")
+@click.option(
+    "--all", "query_all", is_flag=True, help="Whether to query all of the servers."
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep refreshing the status until interrupted.",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.1),
+    default=2,
+    help="How often to refresh the status with `--watch`, in seconds. Defaults to 2.",
+)
+def get_server_status(
+    name: Optional[str] = None,
+    query_all: bool = False,
+    watch: bool = False,
+    interval: float = 2,
+) -> None:
+    """
+    Get the status of a rippled or witness node(s).
+    \f
+
+    Args:
+        name: The name of the server to query.
+        query_all: Whether to query all of the servers.
+        watch: Keep refreshing the status until interrupted.
+        interval: How often to refresh the status with `watch`, in seconds.
+
+    Raises:
+        XBridgeCLIException: If neither a name or `--all` is specified.
+    """  # noqa: D301
+    if name is None and query_all is False:
+        raise XBridgeCLIException("Must specify a name or `--all`.")
+
+    config = get_config()
+    if query_all:
+        chains = config.chains
+        witnesses = config.witnesses
+    else:
+        assert name is not None
+        server = config.get_server(name)
+        chains = [server] if isinstance(server, ChainConfig) else []
+        witnesses = [server] if isinstance(server, WitnessConfig) else []
+    # the witnesses' attestations are looked up on the chains
+    all_chains = config.chains if len(witnesses) > 0 else []
+
+    if len(chains) + len(witnesses) == 0:
+        click.echo("No servers running.")
+        return
+
+    # the connections are kept open between refreshes
+    limits = httpx.Limits(
+        max_connections=_MAX_CONNECTIONS, max_keepalive_connections=_MAX_CONNECTIONS
+    )
+    with httpx.Client(timeout=_TIMEOUT, limits=limits) as client, ThreadPoolExecutor(
+        max_workers=_MAX_CONNECTIONS
+    ) as executor:
+        try:
+            while True:
+                chain_rows, witness_rows = _get_status(
+                    client, executor, chains, witnesses, all_chains
+                )
+                if watch:
+                    click.clear()
+                _print_status(chain_rows, witness_rows)
+                if not watch:
+                    return
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
@@ -2,25 +2,110 @@
 
 from __future__ import annotations
 
-import os
 import signal
-import subprocess
-from typing import List, Optional, cast
+from operator import methodcaller
+from typing import Callable, Dict, List, Optional, Tuple, cast
 
 import click
+import psutil
+
+from xbridge_cli.exceptions import DaemonNotRunningException, XBridgeCLIException
+from xbridge_cli.server.docker_env import stop_containers
+from xbridge_cli.utils import (
+    ServerConfig,
+    get_config,
+    get_daemon_socket,
+    remove_server,
+    send_daemon_request,
+)
+
+_GRACEFUL_STOP_TIME = 10  # seconds
+_ESCALATION_TIME = 5  # seconds
+
+
+def _interrupt(process: psutil.Process) -> None:
+    process.send_signal(signal.SIGINT)
 
-from xbridge_cli.exceptions import XBridgeCLIException
-from xbridge_cli.server.start import _DOCKER_COMPOSE
-from xbridge_cli.utils import ChainConfig, ServerConfig, get_config, remove_server
 
+# how to ask a process to stop, and how long to wait for it before escalating
+_STOP_STEPS: List[Tuple[Callable[[psutil.Process], None], float]] = [
+    (_interrupt, _GRACEFUL_STOP_TIME),
+    (methodcaller("terminate"), _ESCALATION_TIME),
+    (methodcaller("kill"), _ESCALATION_TIME),
+]
 
-def _pid_is_alive(pid: int) -> bool:
+
+def _get_process(server: ServerConfig) -> Optional[psutil.Process]:
     try:
-        os.kill(pid, 0)
-    except OSError:
-        return False
-    else:
-        return True
+        process = psutil.Process(server.pid)
+        # make sure the PID hasn't been reused by an unrelated process
+        if server.config not in process.cmdline():
+            return None
+        return process
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def _release_servers(names: List[str]) -> None:
+    # otherwise the daemon would restart the servers as soon as they stop
+    try:
+        send_daemon_request(get_daemon_socket(), "release", {"names": names})
+    except DaemonNotRunningException:
+        pass
+
+
+def stop_processes(processes: Dict[psutil.Process, str], verbose: bool = False) -> None:
+    """
+    Stop processes, all at once. Each process is interrupted, and then terminated
+    and killed if it doesn't stop in time.
+
+    Args:
+        processes: The processes to stop, with the names of their servers.
+        verbose: Whether or not to print more verbose information.
+    """
+    # signal every process at once, then escalate on the ones that don't stop in time
+    alive = list(processes)
+    for step, (stop, timeout) in enumerate(_STOP_STEPS):
+        if len(alive) == 0:
+            break
+        if step > 0 and verbose:
+            names = ", ".join(processes[process] for process in alive)
+            click.echo(f"Needed to kill {names}")
+        for process in alive:
+            try:
+                stop(process)
+            except psutil.NoSuchProcess:
+                pass
+        _, alive = psutil.wait_procs(alive, timeout=timeout)
+
+
+def _stop_processes(servers: List[ServerConfig], verbose: bool = False) -> None:
+    processes: Dict[psutil.Process, str] = {}
+    for server in servers:
+        process = _get_process(server)
+        if process is not None:
+            processes[process] = server.name
+    stop_processes(processes, verbose)
+
+
+def _stop_servers(servers: List[ServerConfig], verbose: bool = False) -> None:
+    # stops the servers, but leaves them in the CLI state
+    docker_servers = [server.name for server in servers if server.is_docker()]
+    local_servers = [server for server in servers if not server.is_docker()]
+
+    if len(local_servers) > 0:
+        _release_servers([server.name for server in local_servers])
+    _stop_processes(local_servers, verbose)
+    if verbose:
+        for server in local_servers:
+            click.echo(f"Stopped {server.name}")
+
+    if len(docker_servers) > 0:
+        # the containers are kept, so they can be started again without recreating
+        stop_containers(docker_servers, _GRACEFUL_STOP_TIME)
+        if verbose:
+            docker_names = ", ".join([name for name in docker_servers])
+            click.echo(f"Stopped {docker_names}")
 
 
 @click.command(name="stop")
@@ -63,30 +148,5 @@ def stop_server(
         server_names = ", ".join([server.name for server in servers])
         click.echo(f"Shutting down: {server_names}")
 
-    docker_servers = []
-    fout = open(os.devnull, "w")
-    for server in servers:
-        if server.is_docker():
-            docker_servers.append(server.name)
-        else:
-            if isinstance(server, ChainConfig):
-                to_run = [server.exe, "--conf", server.config, "stop"]
-            else:
-                to_run = [server.exe, "--config", server.config, "stop"]
-
-            subprocess.call(to_run, stdout=fout, stderr=subprocess.STDOUT)
-            if _pid_is_alive(server.pid):
-                if verbose:
-                    click.echo(f"Needed to kill {server.name}")
-                os.kill(server.pid, signal.SIGINT)
-            if verbose:
-                click.echo(f"Stopped {server.name}")
-
-    if len(docker_servers) > 0:
-        to_run = [*_DOCKER_COMPOSE, "stop", *docker_servers]
-        subprocess.run(to_run, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        if verbose:
-            docker_names = ", ".join([name for name in docker_servers])
-            click.echo(f"Stopped {docker_names}")
-
+    _stop_servers(servers, verbose)
     remove_server(name, stop_all)
@@ -0,0 +1,145 @@
+"""Show (and export) the resource usage of the servers."""
+
+import csv
+import os
+import time
+from dataclasses import asdict, fields
+from typing import Any, Dict, List, Optional, cast
+
+import click
+from tabulate import tabulate
+
+from xbridge_cli.utils import ServerConfig, get_config
+from xbridge_cli.utils.resources import (
+    ResourceLog,
+    ResourceSample,
+    ResourceSampler,
+    get_recorded_servers,
+    get_resource_log_file,
+)
+
+_MEGABYTE = 1024 * 1024
+
+
+def _get_servers(name: Optional[str]) -> List[ServerConfig]:
+    config = get_config()
+    if name is not None:
+        return [config.get_server(name)]
+    return cast(List[ServerConfig], config.chains) + cast(
+        List[ServerConfig], config.witnesses
+    )
+
+
+def _format_row(server: ServerConfig, sample: ResourceSample) -> Dict[str, Any]:
+    return {
+        "name": server.name,
+        "pid": server.pid,
+        "cpu %": round(sample.cpu_percent, 1),
+        "rss (MB)": round(sample.rss / _MEGABYTE, 1),
+        "fds": sample.num_fds,
+        "read (MB)": round(sample.read_bytes / _MEGABYTE, 1),
+        "written (MB)": round(sample.write_bytes / _MEGABYTE, 1),
+        "threads": sample.num_threads,
+    }
+
+
+def _export(names: List[str], export_file: str, since: Optional[float]) -> None:
+    count = 0
+    with open(export_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", *(field.name for field in fields(ResourceSample))])
+        for name in names:
+            log_file = get_resource_log_file(name)
+            if not os.path.exists(log_file):
+                continue
+            samples = ResourceLog(log_file).read(since)
+            for sample in samples:
+                writer.writerow([name, *asdict(sample).values()])
+            count += len(samples)
+    if count == 0:
+        click.echo(
+            "No resource usage recorded. It is recorded while the daemon is running "
+            "(`xbridge-cli daemon start`)."
+        )
+    else:
+        click.echo(f"Exported {count} samples to {export_file}.")
+
+
+@click.command(name="top")
+@click.option("--name", help="Only show this server. Defaults to all the servers.")
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.1),
+    default=1,
+    help="How often to refresh, in seconds. Defaults to 1.",
+)
+@click.option(
+    "-n",
+    "--iterations",
+    type=click.IntRange(min=1),
+    help="Stop after this many refreshes. Defaults to running until interrupted.",
+)
+@click.option(
+    "--export",
+    "export_file",
+    type=click.Path(dir_okay=False, writable=True),
+    help=(
+        "Instead of showing the live view, write the resource usage recorded by the "
+        "daemon to this CSV file, with UNIX timestamps."
+    ),
+)
+@click.option(
+    "--since",
+    type=float,
+    help="Only export the samples recorded in the last this many seconds.",
+)
+def top_servers(
+    name: Optional[str] = None,
+    interval: float = 1,
+    iterations: Optional[int] = None,
+    export_file: Optional[str] = None,
+    since: Optional[float] = None,
+) -> None:
+    """
+    Show the CPU, memory, file descriptor, I/O, and thread usage of the servers.
+    \f
+
+    Args:
+        name: Only show this server.
+        interval: How often to refresh, in seconds.
+        iterations: Stop after this many refreshes.
+        export_file: Write the resource usage recorded by the daemon to this file.
+        since: Only export the samples recorded in the last this many seconds.
+    """  # noqa: D301
+    if export_file is not None:
+        # includes servers that have stopped since, e.g. at the end of a load test
+        names = [name] if name is not None else get_recorded_servers()
+        _export(names, export_file, None if since is None else time.time() - since)
+        return
+
+    servers = _get_servers(name)
+
+    local_servers = [server for server in servers if not server.is_docker()]
+    if len(local_servers) == 0:
+        click.echo("No local servers running.")
+        return
+
+    sampler = ResourceSampler()
+    # the CPU % is measured between samples, so the first one is only a baseline
+    sampler.sample(local_servers)
+    count = 0
+    try:
+        while iterations is None or count < iterations:
+            time.sleep(interval)
+            samples = sampler.sample(local_servers)
+            rows = [
+                _format_row(server, samples[server.name])
+                for server in local_servers
+                if server.name in samples
+            ]
+            if iterations != 1:
+                click.clear()
+            click.echo(tabulate(rows, headers="keys", tablefmt="presto"))
+            count += 1
+    except KeyboardInterrupt:
+        pass
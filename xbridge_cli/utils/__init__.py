@@ -5,8 +5,11 @@ from xbridge_cli.utils.config_file import (
     BridgeConfig,
     ChainConfig,
     ServerConfig,
+    StateStore,
     WitnessConfig,
     get_config_folder,
+    get_daemon_socket,
+    get_state_store,
 )
 from xbridge_cli.utils.config_utils import (
     add_bridge,
@@ -22,6 +25,7 @@ from xbridge_cli.utils.config_utils import (
     remove_server,
     remove_witness,
 )
+from xbridge_cli.utils.daemon_client import get_daemon_status, send_daemon_request
 from xbridge_cli.utils.misc import CryptoAlgorithmChoice
 from xbridge_cli.utils.rippled_config import RippledConfig
 from xbridge_cli.utils.transaction import submit_tx
@@ -42,6 +46,8 @@ __all__ = [
     "remove_server",
     "remove_witness",
     "submit_tx",
+    "get_daemon_status",
+    "send_daemon_request",
     "BridgeData",
     "ChainData",
     "CurrencyDict",
@@ -51,6 +57,9 @@ __all__ = [
     "ChainConfig",
     "WitnessConfig",
     "ServerConfig",
+    "StateStore",
     "get_config_folder",
+    "get_daemon_socket",
+    "get_state_store",
     "CryptoAlgorithmChoice",
 ]
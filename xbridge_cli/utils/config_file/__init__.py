@@ -2,8 +2,16 @@
 
 from xbridge_cli.utils.config_file.bridge_config import BridgeConfig
 from xbridge_cli.utils.config_file.chain_config import ChainConfig
-from xbridge_cli.utils.config_file.config_file import ConfigFile, get_config_folder
+from xbridge_cli.utils.config_file.config_file import (
+    ConfigFile,
+    get_config_folder,
+    get_daemon_socket,
+    get_running_chains,
+    get_running_witnesses,
+    get_state_store,
+)
 from xbridge_cli.utils.config_file.server_config import ServerConfig
+from xbridge_cli.utils.config_file.state_store import StateStore
 from xbridge_cli.utils.config_file.witness_config import WitnessConfig
 
 __all__ = [
@@ -12,5 +20,10 @@ __all__ = [
     "WitnessConfig",
     "ServerConfig",
     "ConfigFile",
+    "StateStore",
     "get_config_folder",
+    "get_daemon_socket",
+    "get_running_chains",
+    "get_running_witnesses",
+    "get_state_store",
 ]
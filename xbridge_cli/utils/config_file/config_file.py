@@ -6,7 +6,7 @@ import json
 import os
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Sequence, Set, Type, TypeVar
 
 import httpx
 
@@ -14,40 +14,100 @@ from xbridge_cli.exceptions import XBridgeCLIException
 from xbridge_cli.utils.config_file.bridge_config import BridgeConfig
 from xbridge_cli.utils.config_file.chain_config import ChainConfig
 from xbridge_cli.utils.config_file.server_config import ServerConfig
+from xbridge_cli.utils.config_file.state_store import StateStore
 from xbridge_cli.utils.config_file.witness_config import WitnessConfig
+from xbridge_cli.utils.daemon_client import get_daemon_status
 from xbridge_cli.utils.types import ServerData
 
 _HOME = str(Path.home())
 
 CONFIG_FOLDER = os.path.join(_HOME, ".config", "xbridge-cli")
 
-# ~/.config/xbridge-cli/config.json
-_CONFIG_FILE = os.path.join(CONFIG_FOLDER, "config.json")
+# ~/.config/xbridge-cli/config.db
+_STATE_FILE_NAME = "config.db"
 
-# Initialize config file
-Path(CONFIG_FOLDER).mkdir(parents=True, exist_ok=True)
-if not os.path.exists(_CONFIG_FILE):
-    with open(_CONFIG_FILE, "w") as f:
-        data: Dict[str, Any] = {"chains": [], "witnesses": [], "bridges": []}
-        json.dump(data, f, indent=4)
+# the JSON file the CLI state used to be stored in
+_LEGACY_CONFIG_FILE_NAME = "config.json"
 
-# TODO: consider having separate JSONs for each node type
-# (e.g. chains.json, witnesses.json, bridges.json)
+# ~/.config/xbridge-cli/daemon.sock
+_DAEMON_SOCKET_NAME = "daemon.sock"
+
+_STORES: Dict[str, StateStore] = {}
+
+T = TypeVar("T", bound=ServerData)
 
 
 def get_config_folder() -> str:
     """
-    Get the folder in which all of the CLI config data is located.
+    Get the folder in which all of the CLI config data is located, creating it if it
+    doesn't exist yet.
 
     Returns:
         The full name of the config folder.
     """
+    Path(CONFIG_FOLDER).mkdir(parents=True, exist_ok=True)
     return CONFIG_FOLDER
 
 
-def _get_running_processes(servers: List[ServerData]) -> List[ServerData]:
+def get_daemon_socket() -> str:
+    """
+    Get the location of the Unix socket the supervisor daemon listens on.
+
+    Returns:
+        The full name of the daemon's socket.
+    """
+    return os.path.join(get_config_folder(), _DAEMON_SOCKET_NAME)
+
+
+def _migrate_legacy_config(store: StateStore, config_folder: str) -> None:
+    legacy_file = os.path.join(config_folder, _LEGACY_CONFIG_FILE_NAME)
+    if not os.path.exists(legacy_file):
+        return
+    with open(legacy_file) as f:
+        data = json.load(f)
+    # the file is only moved out of the way once everything in it is stored, and
+    # storing it again replaces the rows, so an interrupted import can be rerun
+    store.add_all(
+        data.get("chains", []), data.get("witnesses", []), data.get("bridges", [])
+    )
+    os.replace(legacy_file, f"{legacy_file}.bak")
+
+
+def get_state_store() -> StateStore:
+    """
+    Get the store that holds the CLI's state, creating it if it doesn't exist yet.
+
+    Returns:
+        The StateStore for the current config folder.
+    """
+    config_folder = get_config_folder()
+    state_file = os.path.join(config_folder, _STATE_FILE_NAME)
+    store = _STORES.get(state_file)
+    if store is None:
+        store = StateStore(state_file)
+        _migrate_legacy_config(store, config_folder)
+        _STORES[state_file] = store
+    return store
+
+
+def _get_managed_names() -> Set[str]:
+    status = get_daemon_status(get_daemon_socket())
+    if status is None:
+        return set()
+    return {server["name"] for server in status}
+
+
+def _get_running_processes(servers: Sequence[T]) -> List[T]:
+    if len(servers) == 0:
+        return []
+    # the daemon already knows whether the servers it supervises are up (and
+    # restarts them if they aren't), so only the others need to be probed
+    managed_names = _get_managed_names()
     return_list = []
     for server in servers:
+        if server["name"] in managed_names:
+            return_list.append(server)
+            continue
         http_url = f"http://{server['http_ip']}:{server['http_port']}"
         try:
             request = {"method": "server_info"}
@@ -64,38 +124,124 @@ def _get_running_processes(servers: List[ServerData]) -> List[ServerData]:
     return return_list
 
 
+def _get_stopped_names(servers: Sequence[T], running: Sequence[T]) -> List[str]:
+    running_names = {server["name"] for server in running}
+    return [server["name"] for server in servers if server["name"] not in running_names]
+
+
+def get_running_chains(
+    name: Optional[str] = None, config: Optional[str] = None
+) -> List[ChainConfig]:
+    """
+    Get the chains that are still running, removing any that have stopped from the
+    store. If a name or config is provided, only the chains matching either of them
+    are checked.
+
+    Args:
+        name: The name of the chain to look up. Optional.
+        config: The config file of the chain to look up. Optional.
+
+    Returns:
+        The matching chains that are still running.
+    """
+    store = get_state_store()
+    chains = store.get_chains(name, config)
+    running = _get_running_processes(chains)
+    if len(running) < len(chains):
+        store.remove_chains(_get_stopped_names(chains, running))
+    return [ChainConfig.from_dict(chain) for chain in running]
+
+
+def get_running_witnesses(
+    name: Optional[str] = None, config: Optional[str] = None
+) -> List[WitnessConfig]:
+    """
+    Get the witnesses that are still running, removing any that have stopped from the
+    store. If a name or config is provided, only the witnesses matching either of them
+    are checked.
+
+    Args:
+        name: The name of the witness to look up. Optional.
+        config: The config file of the witness to look up. Optional.
+
+    Returns:
+        The matching witnesses that are still running.
+    """
+    store = get_state_store()
+    witnesses = store.get_witnesses(name, config)
+    running = _get_running_processes(witnesses)
+    if len(running) < len(witnesses):
+        store.remove_witnesses(_get_stopped_names(witnesses, running))
+    return [WitnessConfig.from_dict(witness) for witness in running]
+
+
 class ConfigFile:
-    """Helper class for working with the config file."""
+    """
+    Helper class for working with the CLI state.
 
-    def __init__(self: ConfigFile, data: Dict[str, Any]) -> None:
+    The full lists of chains, witnesses, and bridges are only loaded if they are
+    accessed; the `get_*` methods look up a single item in the store directly.
+    """
+
+    def __init__(self: ConfigFile, store: StateStore) -> None:
         """
         Initialize a ConfigFile object.
 
         Args:
-            data: The dictionary with the config data.
-        """
-        self.chains = [
-            ChainConfig.from_dict(chain)
-            for chain in _get_running_processes(data["chains"])
-        ]
-        self.witnesses = [
-            WitnessConfig.from_dict(witness)
-            for witness in _get_running_processes(data["witnesses"])
-        ]
-        self.bridges = [BridgeConfig.from_dict(bridge) for bridge in data["bridges"]]
-        self.write_to_file()
+            store: The store with the CLI state.
+        """
+        self._store = store
+        self._chains: Optional[List[ChainConfig]] = None
+        self._witnesses: Optional[List[WitnessConfig]] = None
+        self._bridges: Optional[List[BridgeConfig]] = None
 
     @classmethod
-    def from_file(cls: Type[ConfigFile]) -> ConfigFile:
+    def from_store(cls: Type[ConfigFile]) -> ConfigFile:
         """
-        Initialize a ConfigFile object from a JSON file.
+        Initialize a ConfigFile object from the CLI state store.
 
         Returns:
             The ConfigFile object.
         """
-        with open(_CONFIG_FILE) as f:
-            data = json.load(f)
-            return cls(data)
+        return cls(get_state_store())
+
+    @property
+    def chains(self: ConfigFile) -> List[ChainConfig]:
+        """
+        Get all of the running chains.
+
+        Returns:
+            The ChainConfig objects for all of the running chains.
+        """
+        if self._chains is None:
+            self._chains = get_running_chains()
+        return self._chains
+
+    @property
+    def witnesses(self: ConfigFile) -> List[WitnessConfig]:
+        """
+        Get all of the running witnesses.
+
+        Returns:
+            The WitnessConfig objects for all of the running witnesses.
+        """
+        if self._witnesses is None:
+            self._witnesses = get_running_witnesses()
+        return self._witnesses
+
+    @property
+    def bridges(self: ConfigFile) -> List[BridgeConfig]:
+        """
+        Get all of the bridges.
+
+        Returns:
+            The BridgeConfig objects for all of the bridges.
+        """
+        if self._bridges is None:
+            self._bridges = [
+                BridgeConfig.from_dict(bridge) for bridge in self._store.get_bridges()
+            ]
+        return self._bridges
 
     def get_chain(self: ConfigFile, name: str) -> ChainConfig:
         """
@@ -110,7 +256,7 @@ class ConfigFile:
         Raises:
             XBridgeCLIException: if there is no chain with that name.
         """
-        for chain in self.chains:
+        for chain in get_running_chains(name):
             if chain.name == name:
                 return chain
         raise XBridgeCLIException(f"No chain with name {name}.")
@@ -128,7 +274,7 @@ class ConfigFile:
         Raises:
             XBridgeCLIException: if there is no witness with that name.
         """
-        for witness in self.witnesses:
+        for witness in get_running_witnesses(name):
             if witness.name == name:
                 return witness
         raise XBridgeCLIException(f"No witness with name {name}.")
@@ -146,10 +292,10 @@ class ConfigFile:
         Raises:
             XBridgeCLIException: if there is no server with that name.
         """
-        for chain in self.chains:
+        for chain in get_running_chains(name):
             if chain.name == name:
                 return chain
-        for witness in self.witnesses:
+        for witness in get_running_witnesses(name):
             if witness.name == name:
                 return witness
         raise XBridgeCLIException(f"No server with name {name}.")
@@ -167,9 +313,8 @@ class ConfigFile:
         Raises:
             XBridgeCLIException: if there is no bridge with that name.
         """
-        for bridge in self.bridges:
-            if bridge.name == name:
-                return bridge
+        for bridge in self._store.get_bridges(name):
+            return BridgeConfig.from_dict(bridge)
         raise XBridgeCLIException(f"No bridge with name {name}.")
 
     def to_dict(self: ConfigFile) -> Dict[str, List[Dict[str, Any]]]:
@@ -184,8 +329,3 @@ class ConfigFile:
             "witnesses": [asdict(witness) for witness in self.witnesses],
             "bridges": [asdict(bridge) for bridge in self.bridges],
         }
-
-    def write_to_file(self: ConfigFile) -> None:
-        """Write the ConfigFile data to file."""
-        with open(_CONFIG_FILE, "w") as f:
-            json.dump(self.to_dict(), f, indent=4)
@@ -0,0 +1,519 @@
+"""SQLite-backed store for the chains, witnesses, bridges, and ports the CLI tracks."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from xbridge_cli.utils.types import BridgeData, ChainData, WitnessData
+
+_BUSY_TIMEOUT = 30  # seconds
+_MAX_PORT = 65535
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chains (
+    name TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    exe TEXT NOT NULL,
+    config TEXT NOT NULL,
+    http_ip TEXT NOT NULL,
+    http_port INTEGER NOT NULL,
+    ws_ip TEXT NOT NULL,
+    ws_port INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chains_config ON chains (config);
+
+CREATE TABLE IF NOT EXISTS witnesses (
+    name TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    exe TEXT NOT NULL,
+    config TEXT NOT NULL,
+    http_ip TEXT NOT NULL,
+    http_port INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS witnesses_config ON witnesses (config);
+
+CREATE TABLE IF NOT EXISTS bridges (
+    name TEXT PRIMARY KEY,
+    chains TEXT NOT NULL,
+    quorum INTEGER NOT NULL,
+    door_accounts TEXT NOT NULL,
+    xchain_currencies TEXT NOT NULL,
+    signature_reward TEXT NOT NULL,
+    create_account_amounts TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ports (
+    port INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ports_owner ON ports (owner);
+
+CREATE TABLE IF NOT EXISTS subnets (
+    subnet INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL UNIQUE
+);
+"""
+
+_CHAIN_COLUMNS = (
+    "name",
+    "type",
+    "pid",
+    "exe",
+    "config",
+    "http_ip",
+    "http_port",
+    "ws_ip",
+    "ws_port",
+)
+_WITNESS_COLUMNS = _CHAIN_COLUMNS[:-2]
+_BRIDGE_COLUMNS = (
+    "name",
+    "chains",
+    "quorum",
+    "door_accounts",
+    "xchain_currencies",
+    "signature_reward",
+    "create_account_amounts",
+)
+# bridge columns that hold tuples, stored as JSON text
+_BRIDGE_JSON_COLUMNS = (
+    "chains",
+    "door_accounts",
+    "xchain_currencies",
+    "create_account_amounts",
+)
+
+
+def _insert(
+    connection: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    data: Dict[str, Any],
+) -> None:
+    column_list = ", ".join(columns)
+    placeholders = ", ".join("?" for _ in columns)
+    connection.execute(
+        f"INSERT OR REPLACE INTO {table} ({column_list}) VALUES ({placeholders})",
+        [data[column] for column in columns],
+    )
+
+
+def _bridge_row(bridge_data: BridgeData) -> Dict[str, Any]:
+    data: Dict[str, Any] = dict(bridge_data)
+    for column in _BRIDGE_JSON_COLUMNS:
+        data[column] = json.dumps(data[column])
+    return data
+
+
+class StateStore:
+    """
+    Transactional store for the CLI's state.
+
+    Each kind of item lives in its own table, keyed by name (and indexed by config
+    path for servers), so lookups and updates only touch the rows involved.
+    """
+
+    def __init__(self: StateStore, file_name: str) -> None:
+        """
+        Open (and initialize, if needed) the store.
+
+        Args:
+            file_name: The location of the SQLite database file.
+        """
+        self._file_name = file_name
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(
+            file_name,
+            timeout=_BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def get_file_name(self: StateStore) -> str:
+        """
+        Get the location of the database file.
+
+        Returns:
+            The database file name/location.
+        """
+        return self._file_name
+
+    @contextmanager
+    def transaction(self: StateStore) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block of statements atomically.
+
+        Yields:
+            The connection to run the statements on.
+
+        Raises:
+            BaseException: Re-raises whatever aborted the transaction, after rolling
+                it back.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def close(self: StateStore) -> None:
+        """Close the connection to the database."""
+        with self._lock:
+            self._connection.close()
+
+    def _select_servers(
+        self: StateStore,
+        table: str,
+        name: Optional[str],
+        config: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            if name is None and config is None:
+                rows = self._connection.execute(
+                    f"SELECT * FROM {table} ORDER BY name"
+                ).fetchall()
+            else:
+                rows = self._connection.execute(
+                    f"SELECT * FROM {table} WHERE name = ? OR config = ? ORDER BY name",
+                    (name, config),
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _delete(self: StateStore, table: str, names: Optional[Iterable[str]]) -> None:
+        with self.transaction() as connection:
+            if names is None:
+                connection.execute(f"DELETE FROM {table}")
+            else:
+                connection.executemany(
+                    f"DELETE FROM {table} WHERE name = ?",
+                    [(name,) for name in names],
+                )
+
+    def get_chains(
+        self: StateStore, name: Optional[str] = None, config: Optional[str] = None
+    ) -> List[ChainData]:
+        """
+        Get the stored chains. If a name or config is provided, only the chains
+        matching either of them are returned.
+
+        Args:
+            name: The name of the chain to look up. Optional.
+            config: The config file of the chain to look up. Optional.
+
+        Returns:
+            The matching chains.
+        """
+        return cast(List[ChainData], self._select_servers("chains", name, config))
+
+    def get_witnesses(
+        self: StateStore, name: Optional[str] = None, config: Optional[str] = None
+    ) -> List[WitnessData]:
+        """
+        Get the stored witnesses. If a name or config is provided, only the witnesses
+        matching either of them are returned.
+
+        Args:
+            name: The name of the witness to look up. Optional.
+            config: The config file of the witness to look up. Optional.
+
+        Returns:
+            The matching witnesses.
+        """
+        return cast(List[WitnessData], self._select_servers("witnesses", name, config))
+
+    def get_bridges(self: StateStore, name: Optional[str] = None) -> List[BridgeData]:
+        """
+        Get the stored bridges. If a name is provided, only that bridge is returned.
+
+        Args:
+            name: The name of the bridge to look up. Optional.
+
+        Returns:
+            The matching bridges.
+        """
+        with self._lock:
+            if name is None:
+                rows = self._connection.execute(
+                    "SELECT * FROM bridges ORDER BY rowid"
+                ).fetchall()
+            else:
+                rows = self._connection.execute(
+                    "SELECT * FROM bridges WHERE name = ?", (name,)
+                ).fetchall()
+        bridges = []
+        for row in rows:
+            bridge = dict(row)
+            for column in _BRIDGE_JSON_COLUMNS:
+                bridge[column] = json.loads(bridge[column])
+            bridges.append(cast(BridgeData, bridge))
+        return bridges
+
+    def add_chain(self: StateStore, chain_data: ChainData) -> None:
+        """
+        Add a chain, replacing any chain already stored with the same name.
+
+        Args:
+            chain_data: The data of the chain to add.
+        """
+        with self.transaction() as connection:
+            _insert(
+                connection,
+                "chains",
+                _CHAIN_COLUMNS,
+                cast(Dict[str, Any], chain_data),
+            )
+
+    def add_witness(self: StateStore, witness_data: WitnessData) -> None:
+        """
+        Add a witness, replacing any witness already stored with the same name.
+
+        Args:
+            witness_data: The data of the witness to add.
+        """
+        with self.transaction() as connection:
+            _insert(
+                connection,
+                "witnesses",
+                _WITNESS_COLUMNS,
+                cast(Dict[str, Any], witness_data),
+            )
+
+    def add_bridge(self: StateStore, bridge_data: BridgeData) -> None:
+        """
+        Add a bridge, replacing any bridge already stored with the same name.
+
+        Args:
+            bridge_data: The data of the bridge to add.
+        """
+        with self.transaction() as connection:
+            _insert(connection, "bridges", _BRIDGE_COLUMNS, _bridge_row(bridge_data))
+
+    def add_all(
+        self: StateStore,
+        chains: Iterable[ChainData],
+        witnesses: Iterable[WitnessData],
+        bridges: Iterable[BridgeData],
+    ) -> None:
+        """
+        Add several chains, witnesses, and bridges in one transaction, so either all
+        of them are stored or none are. Any item already stored with the same name is
+        replaced.
+
+        Args:
+            chains: The data of the chains to add.
+            witnesses: The data of the witnesses to add.
+            bridges: The data of the bridges to add.
+        """
+        with self.transaction() as connection:
+            for chain_data in chains:
+                _insert(
+                    connection,
+                    "chains",
+                    _CHAIN_COLUMNS,
+                    cast(Dict[str, Any], chain_data),
+                )
+            for witness_data in witnesses:
+                _insert(
+                    connection,
+                    "witnesses",
+                    _WITNESS_COLUMNS,
+                    cast(Dict[str, Any], witness_data),
+                )
+            for bridge_data in bridges:
+                _insert(
+                    connection, "bridges", _BRIDGE_COLUMNS, _bridge_row(bridge_data)
+                )
+
+    def remove_chains(self: StateStore, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Remove chains from the store.
+
+        Args:
+            names: The names of the chains to remove. If `None`, removes all chains.
+        """
+        self._delete("chains", names)
+
+    def remove_witnesses(
+        self: StateStore, names: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        Remove witnesses from the store.
+
+        Args:
+            names: The names of the witnesses to remove. If `None`, removes all
+                witnesses.
+        """
+        self._delete("witnesses", names)
+
+    def remove_bridges(self: StateStore, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Remove bridges from the store.
+
+        Args:
+            names: The names of the bridges to remove. If `None`, removes all bridges.
+        """
+        self._delete("bridges", names)
+
+    def get_ports(self: StateStore, owner: Optional[str] = None) -> Dict[int, str]:
+        """
+        Get the allocated ports.
+
+        Args:
+            owner: Only return the ports allocated to this owner. Optional.
+
+        Returns:
+            A mapping from each allocated port to its owner.
+        """
+        with self._lock:
+            if owner is None:
+                rows = self._connection.execute("SELECT * FROM ports").fetchall()
+            else:
+                rows = self._connection.execute(
+                    "SELECT * FROM ports WHERE owner = ?", (owner,)
+                ).fetchall()
+        return {row["port"]: row["owner"] for row in rows}
+
+    def add_ports(self: StateStore, owner: str, ports: Iterable[int]) -> None:
+        """
+        Record ports as allocated to an owner.
+
+        Args:
+            owner: The name of whatever is using the ports.
+            ports: The ports to allocate.
+        """
+        with self.transaction() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO ports (port, owner) VALUES (?, ?)",
+                [(port, owner) for port in ports],
+            )
+
+    def allocate_ports(
+        self: StateStore,
+        requests: Sequence[Tuple[str, int]],
+        is_free: Callable[[int], bool],
+        search_from: int,
+    ) -> List[int]:
+        """
+        Atomically allocate a port to each owner, so that concurrent CLI processes
+        never hand out the same port. An owner that already has a port keeps it.
+
+        Args:
+            requests: Each owner, and the port it would prefer.
+            is_free: Whether a port is free on the host.
+            search_from: Where to start looking for a port if the preferred one is
+                taken.
+
+        Returns:
+            The port allocated to each owner, in the same order.
+
+        Raises:
+            ValueError: If there are no free ports left.
+        """
+        with self.transaction() as connection:
+            rows = connection.execute("SELECT * FROM ports").fetchall()
+            allocated = {row["port"]: row["owner"] for row in rows}
+            by_owner = {owner: port for port, owner in allocated.items()}
+            ports = []
+            for owner, preferred in requests:
+                port = by_owner.get(owner)
+                if port is None:
+                    candidates = [preferred, *range(search_from, _MAX_PORT + 1)]
+                    port = next(
+                        (
+                            candidate
+                            for candidate in candidates
+                            if candidate not in allocated and is_free(candidate)
+                        ),
+                        None,
+                    )
+                    if port is None:
+                        raise ValueError("No free ports left.")
+                    allocated[port] = owner
+                    connection.execute(
+                        "INSERT INTO ports (port, owner) VALUES (?, ?)", (port, owner)
+                    )
+                ports.append(port)
+        return ports
+
+    def remove_ports(self: StateStore, owner: str) -> None:
+        """
+        Release all the ports allocated to an owner.
+
+        Args:
+            owner: The name of whatever is using the ports.
+        """
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM ports WHERE owner = ?", (owner,))
+
+    def get_subnets(self: StateStore) -> Dict[int, str]:
+        """
+        Get the allocated subnets.
+
+        Returns:
+            A mapping from the index of each allocated subnet to its owner.
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT * FROM subnets").fetchall()
+        return {row["subnet"]: row["owner"] for row in rows}
+
+    def allocate_subnet(self: StateStore, owner: str, count: int) -> int:
+        """
+        Atomically allocate a subnet to an owner. An owner that already has a subnet
+        keeps it.
+
+        Args:
+            owner: The name of whatever is using the subnet.
+            count: How many subnets there are to choose from.
+
+        Returns:
+            The index of the allocated subnet.
+
+        Raises:
+            ValueError: If there are no free subnets left.
+        """
+        with self.transaction() as connection:
+            rows = connection.execute("SELECT * FROM subnets").fetchall()
+            allocated = {row["subnet"]: row["owner"] for row in rows}
+            for subnet, subnet_owner in allocated.items():
+                if subnet_owner == owner:
+                    return int(subnet)
+            subnet = next((i for i in range(count) if i not in allocated), None)
+            if subnet is None:
+                raise ValueError("No free subnets left.")
+            connection.execute(
+                "INSERT INTO subnets (subnet, owner) VALUES (?, ?)", (subnet, owner)
+            )
+        return int(subnet)
+
+    def remove_subnets(self: StateStore, owner: str) -> None:
+        """
+        Release the subnet allocated to an owner.
+
+        Args:
+            owner: The name of whatever is using the subnet.
+        """
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM subnets WHERE owner = ?", (owner,))
@@ -1,13 +1,13 @@
 """Utils for working with the config file."""
 
-from typing import Any, Dict, Optional, cast
+from typing import Optional
 
 from xbridge_cli.exceptions import XBridgeCLIException
 from xbridge_cli.utils.config_file import (
-    BridgeConfig,
-    ChainConfig,
     ConfigFile,
-    WitnessConfig,
+    get_running_chains,
+    get_running_witnesses,
+    get_state_store,
 )
 from xbridge_cli.utils.types import BridgeData, ChainData, WitnessData
 
@@ -19,7 +19,7 @@ def get_config() -> ConfigFile:
     Returns:
         The config file, as a ConfigFile object.
     """
-    return ConfigFile.from_file()
+    return ConfigFile.from_store()
 
 
 def check_chain_exists(chain_name: str, chain_config: Optional[str] = None) -> bool:
@@ -33,13 +33,7 @@ def check_chain_exists(chain_name: str, chain_config: Optional[str] = None) -> b
     Returns:
         Whether there is already a chain running with that name or config.
     """
-    conf = get_config()
-    for chain in conf.chains:
-        if chain.name == chain_name:
-            return True
-        if chain.config == chain_config:
-            return True
-    return False
+    return len(get_running_chains(chain_name, chain_config)) > 0
 
 
 def check_witness_exists(
@@ -55,13 +49,7 @@ def check_witness_exists(
     Returns:
         Whether there is already a witness running with that name or config.
     """
-    conf = get_config()
-    for witness in conf.witnesses:
-        if witness.name == witness_name:
-            return True
-        if witness.config == witness_config:
-            return True
-    return False
+    return len(get_running_witnesses(witness_name, witness_config)) > 0
 
 
 def check_bridge_exists(bridge_name: str) -> bool:
@@ -74,11 +62,7 @@ def check_bridge_exists(bridge_name: str) -> bool:
     Returns:
         Whether there is already a bridge running with that name or config.
     """
-    conf = get_config()
-    for bridge in conf.bridges:
-        if bridge.name == bridge_name:
-            return True
-    return False
+    return len(get_state_store().get_bridges(bridge_name)) > 0
 
 
 def check_server_exists(name: str, config: Optional[str] = None) -> bool:
@@ -102,9 +86,7 @@ def add_chain(chain_data: ChainData) -> None:
     Args:
         chain_data: The data of the chain to add.
     """
-    conf = get_config()
-    conf.chains.append(ChainConfig.from_dict(cast(Dict[str, Any], chain_data)))
-    conf.write_to_file()
+    get_state_store().add_chain(chain_data)
 
 
 def remove_chain(name: Optional[str] = None, remove_all: bool = False) -> None:
@@ -122,12 +104,12 @@ def remove_chain(name: Optional[str] = None, remove_all: bool = False) -> None:
         raise XBridgeCLIException(
             "Cannot remove chain if name is `None` and remove_all is `False`."
         )
-    conf = get_config()
+    store = get_state_store()
     if remove_all:
-        conf.chains = []
+        store.remove_chains()
     else:
-        conf.chains = [chain for chain in conf.chains if chain.name != name]
-    conf.write_to_file()
+        assert name is not None
+        store.remove_chains([name])
 
 
 def add_witness(witness_data: WitnessData) -> None:
@@ -137,9 +119,7 @@ def add_witness(witness_data: WitnessData) -> None:
     Args:
         witness_data: The data of the witness to add.
     """
-    conf = get_config()
-    conf.witnesses.append(WitnessConfig.from_dict(cast(Dict[str, Any], witness_data)))
-    conf.write_to_file()
+    get_state_store().add_witness(witness_data)
 
 
 def remove_witness(name: Optional[str] = None, remove_all: bool = False) -> None:
@@ -157,12 +137,12 @@ def remove_witness(name: Optional[str] = None, remove_all: bool = False) -> None
         raise XBridgeCLIException(
             "Cannot remove witness if name is `None` and remove_all is `False`."
         )
-    conf = get_config()
+    store = get_state_store()
     if remove_all:
-        conf.witnesses = []
+        store.remove_witnesses()
     else:
-        conf.witnesses = [witness for witness in conf.witnesses if witness.name != name]
-    conf.write_to_file()
+        assert name is not None
+        store.remove_witnesses([name])
 
 
 def remove_server(name: Optional[str] = None, remove_all: bool = False) -> None:
@@ -180,20 +160,16 @@ def remove_server(name: Optional[str] = None, remove_all: bool = False) -> None:
         raise XBridgeCLIException(
             "Cannot remove server if name is `None` and remove_all is `False`."
         )
-    conf = get_config()
+    store = get_state_store()
     if remove_all:
-        conf.chains = []
-        conf.witnesses = []
+        store.remove_chains()
+        store.remove_witnesses()
     else:
         assert name is not None
-        try:
-            conf.get_witness(name)
-            conf.witnesses = [
-                witness for witness in conf.witnesses if witness.name != name
-            ]
-        except Exception:
-            conf.chains = [chain for chain in conf.chains if chain.name != name]
-    conf.write_to_file()
+        if len(store.get_witnesses(name)) > 0:
+            store.remove_witnesses([name])
+        else:
+            store.remove_chains([name])
 
 
 def add_bridge(bridge_data: BridgeData) -> None:
@@ -203,9 +179,7 @@ def add_bridge(bridge_data: BridgeData) -> None:
     Args:
         bridge_data: The data of the bridge to add.
     """
-    conf = get_config()
-    conf.bridges.append(BridgeConfig.from_dict(cast(Dict[str, Any], bridge_data)))
-    conf.write_to_file()
+    get_state_store().add_bridge(bridge_data)
 
 
 def remove_bridge(name: Optional[str] = None, remove_all: bool = False) -> None:
@@ -223,9 +197,9 @@ def remove_bridge(name: Optional[str] = None, remove_all: bool = False) -> None:
         raise XBridgeCLIException(
             "Cannot remove bridge if name is `None` and remove_all is `False`."
         )
-    conf = get_config()
+    store = get_state_store()
     if remove_all:
-        conf.bridges = []
+        store.remove_bridges()
     else:
-        conf.bridges = [bridge for bridge in conf.bridges if bridge.name != name]
-    conf.write_to_file()
+        assert name is not None
+        store.remove_bridges([name])
@@ -0,0 +1,65 @@
+"""Helpers for talking to the supervisor daemon over its Unix socket."""
+
+import json
+import socket
+from typing import Any, Dict, List, Optional, cast
+
+from xbridge_cli.exceptions import DaemonNotRunningException, XBridgeCLIException
+
+_TIMEOUT = 10  # seconds
+
+
+def send_daemon_request(
+    socket_path: str, method: str, params: Optional[Dict[str, Any]] = None
+) -> Any:  # noqa: ANN401
+    """
+    Send a request to the daemon and wait for its response.
+
+    Requests and responses are each a single line of JSON.
+
+    Args:
+        socket_path: The location of the daemon's Unix socket.
+        method: The name of the request.
+        params: The parameters for the request. Optional.
+
+    Returns:
+        The result of the request.
+
+    Raises:
+        DaemonNotRunningException: If the daemon can't be reached.
+        XBridgeCLIException: If the daemon returns an error.
+    """
+    request = json.dumps({"method": method, "params": params or {}})
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_TIMEOUT)
+            sock.connect(socket_path)
+            sock.sendall(request.encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except (OSError, AttributeError):
+        # AttributeError: Unix sockets aren't supported on this platform
+        raise DaemonNotRunningException()
+    if not line:
+        raise DaemonNotRunningException()
+
+    response = json.loads(line)
+    if "error" in response:
+        raise XBridgeCLIException(f"Daemon error: {response['error']}")
+    return response["result"]
+
+
+def get_daemon_status(socket_path: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get the status of the servers managed by the daemon.
+
+    Args:
+        socket_path: The location of the daemon's Unix socket.
+
+    Returns:
+        The status of each managed server, or None if the daemon isn't running.
+    """
+    try:
+        return cast(List[Dict[str, Any]], send_daemon_request(socket_path, "status"))
+    except DaemonNotRunningException:
+        return None
@@ -0,0 +1,164 @@
+"""Helpers for the files the output of each server is written to."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from typing import BinaryIO, Iterator, List, Optional
+
+# the output file is rotated once it reaches this size
+MAX_OUTPUT_BYTES = 50 * 1024 * 1024
+# how many rotated output files (`NAME.out.1`, `NAME.out.2`, ...) are kept
+OUTPUT_BACKUPS = 3
+
+_ROTATOR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "rotate_output.py")
+
+_BLOCK_SIZE = 64 * 1024  # bytes
+_FOLLOW_INTERVAL = 0.2  # seconds
+
+
+def spawn_with_output(
+    command: List[str],
+    output_file: str,
+    append: bool = False,
+    new_session: bool = False,
+) -> subprocess.Popen[bytes]:
+    """
+    Start a process, with its stdout/stderr written to a size-rotated output file.
+
+    The output is piped through a small rotator process, which outlives the CLI and
+    exits once the process closes its output.
+
+    Args:
+        command: The command to run.
+        output_file: The file to write the output to.
+        append: Whether to keep the current contents of the output file.
+        new_session: Whether to run the process in a new session, so that it
+            doesn't receive signals sent to the caller's process group.
+
+    Returns:
+        The process.
+    """
+    # created up front, so that it can be read as soon as this returns
+    with open(output_file, "a" if append else "w"):
+        pass
+
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        close_fds=True,
+        start_new_session=new_session,
+    )
+    assert process.stdout is not None
+    try:
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-I",
+                _ROTATOR,
+                output_file,
+                str(MAX_OUTPUT_BYTES),
+                str(OUTPUT_BACKUPS),
+            ],
+            stdin=process.stdout,
+            # so that it doesn't hold the caller's output open after the caller exits
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=new_session,
+        )
+    finally:
+        # only the rotator reads the output
+        process.stdout.close()
+    return process
+
+
+def _get_output_files(output_file: str) -> List[str]:
+    # newest first
+    files = [output_file]
+    for index in range(1, OUTPUT_BACKUPS + 1):
+        backup = f"{output_file}.{index}"
+        if not os.path.exists(backup):
+            break
+        files.append(backup)
+    return files
+
+
+def _read_last_lines(f: BinaryIO, count: int, data: bytes) -> bytes:
+    # read blocks backwards from the end, until there are enough lines
+    position = f.seek(0, os.SEEK_END)
+    while position > 0 and data.count(b"\n") <= count:
+        size = min(_BLOCK_SIZE, position)
+        position -= size
+        f.seek(position)
+        data = f.read(size) + data
+    return data
+
+
+def tail_output(output_file: str, count: int) -> List[bytes]:
+    """
+    Get the last lines of a server's output, without reading the whole file.
+
+    Args:
+        output_file: The output file of the server.
+        count: The number of lines to get.
+
+    Returns:
+        The last `count` lines (or fewer, if there aren't that many).
+    """
+    data = b""
+    for file_name in _get_output_files(output_file):
+        try:
+            with open(file_name, "rb") as f:
+                data = _read_last_lines(f, count, data)
+        except FileNotFoundError:
+            continue
+        if data.count(b"\n") > count:
+            break
+    lines = data.splitlines()
+    return lines[-count:] if count > 0 else []
+
+
+def follow_output(
+    output_file: str, from_end: bool = True, stop: Optional[float] = None
+) -> Iterator[bytes]:
+    """
+    Yield new output as it is written, following the output file across rotations.
+
+    Args:
+        output_file: The output file of the server.
+        from_end: Whether to skip the output that's already in the file.
+        stop: Stop following once this `time.monotonic()` deadline is reached.
+            Optional. Defaults to following forever.
+
+    Yields:
+        Chunks of new output.
+    """
+    f = open(output_file, "rb")
+    try:
+        if from_end:
+            f.seek(0, os.SEEK_END)
+        while stop is None or time.monotonic() < stop:
+            chunk = f.read(_BLOCK_SIZE)
+            if chunk:
+                yield chunk
+                continue
+            try:
+                rotated = os.stat(output_file).st_ino != os.fstat(f.fileno()).st_ino
+            except FileNotFoundError:
+                # in the middle of being rotated
+                rotated = False
+            if rotated:
+                # finish the old file before moving on to the new one
+                rest = f.read()
+                f.close()
+                f = open(output_file, "rb")
+                if rest:
+                    yield rest
+                continue
+            time.sleep(_FOLLOW_INTERVAL)
+    finally:
+        f.close()
@@ -0,0 +1,216 @@
+"""Sample and record the resource usage of the servers."""
+
+from __future__ import annotations
+
+import os
+import struct
+import time
+from dataclasses import astuple, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, cast
+
+import psutil
+
+from xbridge_cli.utils.config_file import ServerConfig, get_config_folder
+
+# ~/.config/xbridge-cli/NAME.resources
+_RESOURCE_LOG_SUFFIX = ".resources"
+
+# 1 hour of samples at the daemon's sampling interval
+DEFAULT_CAPACITY = 3600
+
+_MAGIC = b"XBRS"
+_VERSION = 1
+# magic, version, record size, capacity, number of records ever written
+_HEADER = struct.Struct("<4sHHIQ")
+# timestamp, CPU %, RSS, open fds, read bytes, written bytes, threads
+_RECORD = struct.Struct("<dfQIQQI")
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """One sample of the resource usage of a server."""
+
+    timestamp: float
+    cpu_percent: float
+    rss: int
+    num_fds: int
+    read_bytes: int
+    write_bytes: int
+    num_threads: int
+
+
+def get_resource_log_file(name: str) -> str:
+    """
+    Get the location of the file the resource usage of a server is recorded in.
+
+    Args:
+        name: The name of the server.
+
+    Returns:
+        The full name of the server's resource log.
+    """
+    return os.path.join(get_config_folder(), f"{name}{_RESOURCE_LOG_SUFFIX}")
+
+
+def get_recorded_servers() -> List[str]:
+    """
+    Get the names of all the servers that have had their resource usage recorded.
+
+    Returns:
+        The names of the servers, in sorted order.
+    """
+    return sorted(
+        file_name[: -len(_RESOURCE_LOG_SUFFIX)]
+        for file_name in os.listdir(get_config_folder())
+        if file_name.endswith(_RESOURCE_LOG_SUFFIX)
+    )
+
+
+class ResourceLog:
+    """
+    A fixed-size ring buffer of resource samples, stored in a binary file.
+
+    The file has a small header followed by `capacity` fixed-size records, so each
+    sample is written in place and the file never grows.
+    """
+
+    def __init__(
+        self: ResourceLog, file_name: str, capacity: int = DEFAULT_CAPACITY
+    ) -> None:
+        """
+        Open (and create, if needed) a resource log.
+
+        Args:
+            file_name: The location of the log file.
+            capacity: How many samples to keep, if the log is being created. An
+                existing log keeps its own capacity.
+
+        Raises:
+            ValueError: If the file isn't a resource log.
+        """
+        self._file_name = file_name
+        if not os.path.exists(file_name):
+            with open(file_name, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, capacity, 0))
+                f.truncate(_HEADER.size + capacity * _RECORD.size)
+        magic, version, record_size, self._capacity, _ = self._read_header()
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+            raise ValueError(f"{file_name} is not a resource log.")
+
+    def _read_header(self: ResourceLog) -> Tuple[bytes, int, int, int, int]:
+        with open(self._file_name, "rb") as f:
+            return cast(
+                Tuple[bytes, int, int, int, int], _HEADER.unpack(f.read(_HEADER.size))
+            )
+
+    def append(self: ResourceLog, sample: ResourceSample) -> None:
+        """
+        Add a sample, overwriting the oldest one if the log is full.
+
+        Args:
+            sample: The sample to add.
+        """
+        with open(self._file_name, "r+b") as f:
+            count = _HEADER.unpack(f.read(_HEADER.size))[4]
+            f.seek(_HEADER.size + (count % self._capacity) * _RECORD.size)
+            f.write(_RECORD.pack(*astuple(sample)))
+            # the record is written before the count, so readers never see a slot
+            # that hasn't been filled in
+            f.seek(0)
+            f.write(
+                _HEADER.pack(_MAGIC, _VERSION, _RECORD.size, self._capacity, count + 1)
+            )
+
+    def read(self: ResourceLog, since: Optional[float] = None) -> List[ResourceSample]:
+        """
+        Get the samples in the log, oldest first.
+
+        Args:
+            since: Only get the samples taken at or after this UNIX timestamp.
+                Optional.
+
+        Returns:
+            The samples.
+        """
+        with open(self._file_name, "rb") as f:
+            count = _HEADER.unpack(f.read(_HEADER.size))[4]
+            data = f.read(self._capacity * _RECORD.size)
+        if count <= self._capacity:
+            slots = range(count)
+        else:
+            start = count % self._capacity
+            slots = range(start, start + self._capacity)
+        samples = []
+        for slot in slots:
+            offset = (slot % self._capacity) * _RECORD.size
+            sample = ResourceSample(*_RECORD.unpack_from(data, offset))
+            if since is None or sample.timestamp >= since:
+                samples.append(sample)
+        return samples
+
+
+class ResourceSampler:
+    """
+    Samples the resource usage of local servers.
+
+    The processes are kept between samples, since the CPU % of a process is measured
+    since the last time it was sampled.
+    """
+
+    def __init__(self: ResourceSampler) -> None:
+        """Initialize a ResourceSampler."""
+        self._processes: Dict[Tuple[str, int], psutil.Process] = {}
+
+    def sample(
+        self: ResourceSampler, servers: Iterable[ServerConfig]
+    ) -> Dict[str, ResourceSample]:
+        """
+        Sample the resource usage of servers. Docker servers, and servers that are no
+        longer running, are skipped.
+
+        Args:
+            servers: The servers to sample.
+
+        Returns:
+            A mapping from the name of each sampled server to its sample.
+        """
+        processes = {}
+        samples = {}
+        for server in servers:
+            if server.is_docker():
+                continue
+            key = (server.name, server.pid)
+            process = self._processes.get(key)
+            try:
+                if process is None:
+                    process = psutil.Process(server.pid)
+                samples[server.name] = _sample_process(process)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            processes[key] = process
+        self._processes = processes
+        return samples
+
+
+def _sample_process(process: psutil.Process) -> ResourceSample:
+    with process.oneshot():
+        try:
+            io_counters = process.io_counters()
+            read_bytes, write_bytes = io_counters.read_bytes, io_counters.write_bytes
+        except (AttributeError, psutil.AccessDenied):
+            # not available on all platforms
+            read_bytes, write_bytes = 0, 0
+        try:
+            num_fds = process.num_fds()
+        except AttributeError:
+            # Windows
+            num_fds = process.num_handles()
+        return ResourceSample(
+            timestamp=time.time(),
+            cpu_percent=process.cpu_percent(),
+            rss=process.memory_info().rss,
+            num_fds=num_fds,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+            num_threads=process.num_threads(),
+        )
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Type
+import os
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type
 
 
 class _Section:
@@ -13,8 +15,16 @@ class _Section:
     [section_name]
     section_key_1=value_1
     section_key_2=value_2
+
+    Sections are immutable, so a parsed file can be shared by every RippledConfig
+    for it. Values are read with `section.get(key)` or `section[key]`.
     """
 
+    __slots__ = ("_name", "_lines", "_kv_pairs")
+    _name: str
+    _lines: Tuple[str, ...]
+    _kv_pairs: Mapping[str, str]
+
     @classmethod
     def section_header(cls: Type[_Section], line: str) -> Optional[str]:
         """
@@ -30,59 +40,135 @@ class _Section:
             return line[1:-1]
         return None
 
-    def __init__(self: _Section, name: str) -> None:
+    def __init__(self: _Section, name: str, lines: List[str]) -> None:
         """
         Initialize a section of the config file.
 
         Args:
             name: The name of the section.
+            lines: The lines of the section, after the header.
         """
-        self._set_init(True)
-        self._name = name
         # lines contains all non key-value pairs
-        self._lines: List[str] = []
-        self._kv_pairs: Dict[str, str] = {}
-        self._set_init(False)
+        section_lines = []
+        kv_pairs = {}
+        for line in lines:
+            s = line.split("=")
+            if len(s) == 2:
+                kv_pairs[s[0].strip()] = s[1].strip()
+            else:
+                section_lines.append(line)
+        self.__setstate__((name, tuple(section_lines), kv_pairs))
 
     def get_name(self: _Section) -> str:
         return self._name
 
-    def add_line(self: _Section, line: str) -> None:
-        s = line.split("=")
-        if len(s) == 2:
-            self._kv_pairs[s[0].strip()] = s[1].strip()
-        else:
-            self._lines.append(line)
-
     def get_lines(self: _Section) -> List[str]:
-        return self._lines
+        return list(self._lines)
 
     def get_line(self: _Section) -> Optional[str]:
         if len(self._lines) > 0:
             return self._lines[0]
         return None
 
-    def __getstate__(self: _Section) -> Dict[str, Any]:
-        return vars(self)
+    def get(self: _Section, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Get the value of a key in the section.
 
-    def __setstate__(self: _Section, state: Dict[str, Any]) -> None:
-        vars(self).update(state)
+        Args:
+            key: The key to look up.
+            default: What to return if the section doesn't have the key.
 
-    def _set_init(self: _Section, value: bool) -> None:
-        # turn on/off "init" mode
-        super().__setattr__("init", value)
+        Returns:
+            The value of the key, or `default` if it isn't in the section.
+        """
+        return self._kv_pairs.get(key, default)
+
+    def __getitem__(self: _Section, key: str) -> str:
+        """
+        Get the value of a key in the section, using the syntax `section[key]`.
+
+        Args:
+            key: The key to look up.
+
+        Returns:
+            The value of the key.
+
+        Raises:
+            KeyError: if the section doesn't have the key.
+        """
+        return self._kv_pairs[key]
+
+    def __getstate__(self: _Section) -> Tuple[str, Tuple[str, ...], Dict[str, str]]:
+        # a mappingproxy can't be pickled
+        return self._name, self._lines, dict(self._kv_pairs)
+
+    def __setstate__(
+        self: _Section, state: Tuple[str, Tuple[str, ...], Dict[str, str]]
+    ) -> None:
+        name, lines, kv_pairs = state
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_lines", lines)
+        # the dict is wrapped, since the parse cache shares the section between
+        # callers
+        object.__setattr__(self, "_kv_pairs", MappingProxyType(kv_pairs))
 
     def __getattr__(self: _Section, name: str) -> str:
+        # kept for `section.key` lookups outside the CLI; use `get`/`[]` instead
+        if name in self.__slots__:
+            # e.g. while unpickling
+            raise AttributeError(name)
         try:
             return self._kv_pairs[name]
         except KeyError:
             raise AttributeError(name)
 
     def __setattr__(self: _Section, name: str, value: str) -> None:
-        if self.init or name in self.__dict__:
-            super().__setattr__(name, value)
-        else:
-            self._kv_pairs[name] = value
+        raise AttributeError(f"Config sections are read-only: {name}")
+
+
+# the parsed sections of each file, with the modification time and size they were
+# parsed at, so a file is only parsed again once it changes
+_PARSE_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, _Section]]] = {}
+
+
+def _parse(file_name: str) -> Dict[str, _Section]:
+    sections: Dict[str, _Section] = {}
+    section_name: Optional[str] = None
+    section_lines: List[str] = []
+    with open(file_name) as f:
+        for n, line in enumerate(f):
+            line = line.strip()
+            if line.startswith("#") or not line:
+                continue
+            header = _Section.section_header(line)
+            if header is not None:
+                if section_name is not None:
+                    sections[section_name] = _Section(section_name, section_lines)
+                section_name = header
+                section_lines = []
+                continue
+            if section_name is None:
+                raise ValueError(
+                    f"Error parsing config file: {file_name} "
+                    f"line_num: {n} line: {line}"
+                )
+            section_lines.append(line)
+
+    if section_name is not None:
+        sections[section_name] = _Section(section_name, section_lines)
+    return sections
+
+
+def _parse_cached(file_name: str) -> Dict[str, _Section]:
+    path = os.path.abspath(file_name)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _PARSE_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    sections = _parse(file_name)
+    _PARSE_CACHE[path] = (key, sections)
+    return sections
 
 
 class RippledConfig:
@@ -98,34 +184,8 @@ class RippledConfig:
         Raises:
             ValueError: If there is an error in parsing the config file.
         """
-        # parse the file
         self._file_name = file_name
-        self._sections: Dict[str, _Section] = {}
-
-        cur_section = None
-        with open(file_name) as f:
-            for n, line in enumerate(f):
-                line = line.strip()
-                if line.startswith("#") or not line:
-                    continue
-                section_name = _Section.section_header(line)
-                if section_name is not None:
-                    if cur_section:
-                        self._add_section(cur_section)
-                    cur_section = _Section(section_name)
-                    continue
-                if cur_section is None:
-                    raise ValueError(
-                        f"Error parsing config file: {file_name} "
-                        f"line_num: {n} line: {line}"
-                    )
-                cur_section.add_line(line)
-
-        if cur_section:
-            self._add_section(cur_section)
-
-    def _add_section(self: RippledConfig, s: _Section) -> None:
-        self._sections[s.get_name()] = s
+        self._sections = _parse_cached(file_name)
 
     def get_file_name(self: RippledConfig) -> str:
         """
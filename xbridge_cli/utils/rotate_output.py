@@ -0,0 +1,84 @@
+"""
+Copy a server's output into its output file, rotating the file once it gets too big.
+
+This is run as a script (`python rotate_output.py FILE MAX_BYTES BACKUPS`), with the
+server's output piped into it, so it doesn't import anything from the CLI.
+"""
+
+import os
+import signal
+import sys
+from typing import BinaryIO, List
+
+_CHUNK_SIZE = 64 * 1024  # bytes
+
+
+def rotate(output_file: str, backups: int) -> None:
+    """
+    Move `FILE` to `FILE.1`, `FILE.1` to `FILE.2`, and so on, dropping the oldest.
+
+    Args:
+        output_file: The output file to rotate.
+        backups: How many rotated files to keep.
+    """
+    if backups == 0:
+        os.remove(output_file)
+        return
+    for index in range(backups - 1, 0, -1):
+        backup = f"{output_file}.{index}"
+        if os.path.exists(backup):
+            os.replace(backup, f"{output_file}.{index + 1}")
+    os.replace(output_file, f"{output_file}.1")
+
+
+def copy_with_rotation(
+    source: BinaryIO, output_file: str, max_bytes: int, backups: int
+) -> None:
+    """
+    Append everything read from `source` to the output file, rotating it whenever the
+    next chunk would take it past `max_bytes`.
+
+    Args:
+        source: The stream to copy from.
+        output_file: The output file to write to.
+        max_bytes: The maximum size of the output file.
+        backups: How many rotated files to keep.
+    """
+    chunk_size = min(_CHUNK_SIZE, max_bytes)
+    out = open(output_file, "ab")
+    size = out.tell()
+    try:
+        while True:
+            # returns whatever is available, instead of waiting for a full chunk
+            chunk = source.read1(chunk_size)  # type: ignore[attr-defined]
+            if not chunk:
+                return
+            if size > 0 and size + len(chunk) > max_bytes:
+                out.close()
+                rotate(output_file, backups)
+                out = open(output_file, "ab")
+                size = 0
+            out.write(chunk)
+            out.flush()
+            size += len(chunk)
+    finally:
+        out.close()
+
+
+def main(argv: List[str]) -> None:
+    """
+    Run the rotator on stdin.
+
+    Args:
+        argv: The output file, maximum size, and number of backups.
+    """
+    # keep copying until the server closes its output, even if the terminal it was
+    # started from is interrupted or closed
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    output_file, max_bytes, backups = argv
+    copy_with_rotation(sys.stdin.buffer, output_file, int(max_bytes), int(backups))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])